@@ -8,6 +8,12 @@
 # -----------------------------------------------------------------------------
 
 from collections import deque
+from itertools import permutations
+import hashlib
+import mmap
+import os
+import time
+import tracemalloc
 
 N = 3
 GOAL = [
@@ -38,13 +44,19 @@ def print_board(board):
         print(" ".join(map(str, row)))
     print()
 
-# ---------- Chequeo de resolubilidad (3x3) ----------
+# ---------- Chequeo de resolubilidad (NxN) ----------
+def blank_row(m):
+    return next(i for i, r in enumerate(m) if 0 in r)
+
 def is_solvable(initial, goal):
     """
-    8‑puzzle 3x3: el estado inicial es resoluble hacia 'goal' si la paridad
-    de inversiones del inicial **relativa al orden del goal** es PAR.
-    - Ignoramos el 0.
-    - Reescribimos el inicial en el orden en que las fichas aparecen en 'goal'.
+    Puzzle NxN: se cuentan las inversiones del inicial **relativas al orden
+    del goal** (reescribiendo el inicial en el orden en que las fichas
+    aparecen en 'goal' e ignorando el 0).
+    - N impar (8‑puzzle): resoluble si esa paridad es PAR.
+    - N par (15‑puzzle): cada movimiento vertical cambia la paridad de
+      inversiones y la fila del vacío a la vez, así que lo que debe ser PAR es
+      inversiones + (fila del vacío en initial - fila del vacío en goal).
     """
     def flat_wo_zero(m):
         return [x for r in m for x in r if x != 0]
@@ -52,11 +64,361 @@ def is_solvable(initial, goal):
     goal_order = {v: i for i, v in enumerate(flat_wo_zero(goal))}
     seq = [goal_order[v] for v in flat_wo_zero(initial)]
     inv = sum(1 for i in range(len(seq)) for j in range(i+1, len(seq)) if seq[i] > seq[j])
-    return inv % 2 == 0
+    if len(initial) % 2 == 1:
+        return inv % 2 == 0
+    return (inv + blank_row(initial) - blank_row(goal)) % 2 == 0
+# ----------------------------------------------------
+
+# ---------- Motor empaquetado (tablero = un entero de 4 bits por ficha) ----------
+# La casilla k = i*N + j ocupa los bits 4k..4k+3. Mover el vacío es un
+# intercambio de nibbles: como el vacío vale 0, basta sumar y restar la ficha.
+# visited/parents se reemplazan por un bytearray indexado por el rango de la
+# permutación (código de Lehmer) que guarda el movimiento con el que se llegó.
+NN = N * N
+FACT = [1] * (NN + 1)
+for _k in range(1, NN + 1):
+    FACT[_k] = FACT[_k - 1] * _k
+
+SIN_VISITAR = 0xFF              # marca en el bytearray de movimientos
+RAIZ = len(MOVE_NAME)           # marca del estado inicial (no tiene padre)
+DELTA = [ROW[i] * N + COL[i] for i in range(4)]
+# MOVES_FROM[z] = [(indice_movimiento, nueva_pos_vacio), ...] en el orden de ROW/COL
+MOVES_FROM = [
+    [(i, (z // N + ROW[i]) * N + z % N + COL[i]) for i in range(4)
+     if is_valid(z // N + ROW[i], z % N + COL[i])]
+    for z in range(NN)
+]
+
+def _tabla_rango(posiciones):
+    """
+    Aporte al rango de Lehmer de un bloque de casillas, indexado por los bits
+    del bloque. El dígito de la casilla k es v[k] - #{j < k : v[j] < v[k]};
+    como el resto del tablero es el complemento del bloque, el aporte solo
+    depende de los valores del propio bloque.
+    """
+    base = posiciones[0]
+    tabla = {}
+    for vals in permutations(range(NN), len(posiciones)):
+        resto = set(range(NN)) - set(vals)
+        antes = resto if base else set()     # valores en casillas anteriores al bloque
+        clave, r = 0, 0
+        for off, (k, v) in enumerate(zip(posiciones, vals)):
+            clave |= v << (4 * off)
+            menores = sum(1 for u in antes if u < v)
+            r += (v - menores) * FACT[NN - 1 - k]
+            antes = antes | {v}
+        tabla[clave] = r
+    return tabla
+
+CORTE = NN // 2                 # casillas [0, CORTE) en la tabla baja, el resto en la alta
+MASCARA_BAJA = (1 << (4 * CORTE)) - 1
+RANGO_BAJO = _tabla_rango(list(range(CORTE)))
+RANGO_ALTO = _tabla_rango(list(range(CORTE, NN)))
+
+def pack_board(board):
+    """Tablero NxN -> entero (4 bits por ficha)."""
+    p = 0
+    for k, v in enumerate(x for r in board for x in r):
+        p |= v << (4 * k)
+    return p
+
+def unpack_board(p):
+    """Entero empaquetado -> tablero NxN (lista de listas)."""
+    flat = [(p >> (4 * k)) & 15 for k in range(NN)]
+    return [flat[i * N:(i + 1) * N] for i in range(N)]
+
+def perm_rank(p):
+    """Rango de la permutación empaquetada en [0, NN!) con dos consultas a tabla."""
+    return RANGO_BAJO[p & MASCARA_BAJA] + RANGO_ALTO[p >> (4 * CORTE)]
+
+def blank_pos(p):
+    return next(k for k in range(NN) if (p >> (4 * k)) & 15 == 0)
+
+def swap_blank(p, z, nz):
+    """Mueve el vacío de la casilla z a la nz (intercambio de nibbles)."""
+    t = (p >> (4 * nz)) & 15
+    return p + (t << (4 * z)) - (t << (4 * nz))
+
+def solve_puzzle_bfs_packed(start):
+    """
+    Mismo BFS que 'solve_puzzle_bfs' pero sobre enteros empaquetados.
+    Cada elemento de la cola es (tablero << 4) | pos_vacio; 'parents' es un
+    bytearray de NN! bytes con el movimiento de llegada, y el camino se
+    reconstruye deshaciendo esos movimientos desde la meta.
+    """
+    if not is_solvable(start, GOAL):
+        return None, None, {"expandidos": 0, "profundidad": None}
+
+    s, g = pack_board(start), pack_board(GOAL)
+    parents = bytearray([SIN_VISITAR]) * FACT[NN]
+    parents[perm_rank(s)] = RAIZ
+    q = deque([(s << 4) | blank_pos(s)])
+    expanded = 0
+
+    rb, ra, mb, sh_alto = RANGO_BAJO, RANGO_ALTO, MASCARA_BAJA, 4 * CORTE
+    while q:
+        e = q.popleft()
+        expanded += 1
+        b, z = e >> 4, e & 15
+
+        if b == g:
+            path_states, path_moves = [], []
+            while True:
+                path_states.append(unpack_board(b))
+                i = parents[perm_rank(b)]
+                if i == RAIZ:
+                    break
+                path_moves.append(MOVE_NAME[i])
+                pz = z - DELTA[i]
+                b, z = swap_blank(b, z, pz), pz
+            path_states.reverse()
+            path_moves.reverse()
+            return path_states, path_moves, {"expandidos": expanded, "profundidad": len(path_moves)}
+
+        for i, nz in MOVES_FROM[z]:
+            t = (b >> (4 * nz)) & 15
+            nb = b + (t << (4 * z)) - (t << (4 * nz))
+            r = rb[nb & mb] + ra[nb >> sh_alto]
+            if parents[r] == SIN_VISITAR:
+                parents[r] = i
+                q.append((nb << 4) | nz)
+
+    return None, None, {"expandidos": expanded, "profundidad": None}
+
+# ---------- Tabla precalculada de distancias hacia GOAL ----------
+# Un BFS hacia atrás desde GOAL llena, para cada rango de permutación, dos bytes:
+# [profundidad, mejor_movimiento]. El archivo se abre con mmap, así que resolver
+# es recorrer la tabla (O(profundidad)) sin volver a buscar.
+# El nombre del archivo y la cabecera dependen de GOAL: si GOAL cambia, se
+# genera una tabla nueva en lugar de reutilizar la anterior.
+TABLA_MAGIC = b"PZ8T"
+TABLA_VERSION = 1
+TABLA_CABECERA = 16             # magic(4) + versión(1) + N(1) + relleno(2) + GOAL empaquetado(8)
+INALCANZABLE = 0xFF
+_tablas_abiertas = {}           # GOAL empaquetado -> mmap abierto
+
+def _cabecera_tabla(goal_p):
+    return TABLA_MAGIC + bytes([TABLA_VERSION, N, 0, 0]) + goal_p.to_bytes(8, "little")
+
+def table_path(goal=None):
+    """Ruta por defecto de la tabla para 'goal' (junto a este archivo)."""
+    goal_p = pack_board(GOAL if goal is None else goal)
+    huella = hashlib.sha1(_cabecera_tabla(goal_p)).hexdigest()[:12]
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"tabla_8puzzle_{huella}.bin")
+
+def build_distance_table(path=None, goal=None):
+    """
+    BFS hacia atrás desde 'goal' sobre el motor empaquetado y escritura de la
+    tabla en disco. Si el vacío llega a c con el movimiento i, desde c el
+    mejor movimiento hacia la meta es el opuesto (i ^ 1 con el orden de MOVE_NAME).
+    Retorna la ruta escrita.
+    """
+    goal = GOAL if goal is None else goal
+    path = path or table_path(goal)
+    g = pack_board(goal)
+
+    datos = bytearray([INALCANZABLE]) * (2 * FACT[NN])
+    r0 = perm_rank(g)
+    datos[2 * r0], datos[2 * r0 + 1] = 0, RAIZ
+    q = deque([(g << 4) | blank_pos(g)])
+
+    rb, ra, mb, sh_alto = RANGO_BAJO, RANGO_ALTO, MASCARA_BAJA, 4 * CORTE
+    while q:
+        e = q.popleft()
+        b, z = e >> 4, e & 15
+        d = datos[2 * (rb[b & mb] + ra[b >> sh_alto])] + 1
+        for i, nz in MOVES_FROM[z]:
+            t = (b >> (4 * nz)) & 15
+            nb = b + (t << (4 * z)) - (t << (4 * nz))
+            r = rb[nb & mb] + ra[nb >> sh_alto]
+            if datos[2 * r] == INALCANZABLE:
+                datos[2 * r], datos[2 * r + 1] = d, i ^ 1
+                q.append((nb << 4) | nz)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_cabecera_tabla(g))
+        fh.write(datos)
+    os.replace(tmp, path)       # nunca queda una tabla a medio escribir
+    return path
+
+def load_distance_table(path=None, goal=None):
+    """
+    Abre (mmap de solo lectura) la tabla de 'goal'; la reconstruye si no existe
+    o si su cabecera no corresponde al GOAL actual.
+    """
+    goal = GOAL if goal is None else goal
+    g = pack_board(goal)
+    if path is None and g in _tablas_abiertas:
+        return _tablas_abiertas[g]
+
+    path = path or table_path(goal)
+    esperado = _cabecera_tabla(g)
+    for _ in range(2):
+        if os.path.exists(path) and os.path.getsize(path) == TABLA_CABECERA + 2 * FACT[NN]:
+            with open(path, "rb") as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            if mm[:TABLA_CABECERA] == esperado:
+                _tablas_abiertas[g] = mm
+                return mm
+            mm.close()
+        build_distance_table(path, goal)
+    raise RuntimeError(f"No se pudo construir una tabla válida en {path}")
+
+def solve_puzzle_table(start):
+    """Misma interfaz que 'solve_puzzle_bfs', siguiendo la tabla precalculada."""
+    mm = load_distance_table()
+    b = pack_board(start)
+    z = blank_pos(b)
+    off = TABLA_CABECERA + 2 * perm_rank(b)
+    if mm[off] == INALCANZABLE:
+        return None, None, {"expandidos": 0, "profundidad": None}
+
+    path_states, path_moves = [unpack_board(b)], []
+    while mm[off] != 0:
+        i = mm[off + 1]
+        nz = z + DELTA[i]
+        b, z = swap_blank(b, z, nz), nz
+        path_states.append(unpack_board(b))
+        path_moves.append(MOVE_NAME[i])
+        off = TABLA_CABECERA + 2 * perm_rank(b)
+    return path_states, path_moves, {"expandidos": 0, "profundidad": len(path_moves)}
 # ----------------------------------------------------
 
-def solve_puzzle_bfs(start):
-    """BFS con reconstrucción de ruta; retorna (lista_tableros, lista_movimientos)."""
+# ---------- BFS bidireccional ----------
+# Dos BFS por capas, uno desde start y otro desde GOAL; siempre se expande
+# completa la capa de la frontera más pequeña. Al terminar la primera capa en
+# la que las búsquedas se tocan, el mínimo d_adelante + 1 + d_atras entre
+# todos los encuentros de esa capa es la longitud óptima.
+def _hijos(key):
+    """(tablero_hijo, indice_movimiento) para cada movimiento válido del vacío."""
+    zx, zy = next((i, j) for i in range(N) for j in range(N) if key[i][j] == 0)
+    for i in range(4):
+        nx, ny = zx + ROW[i], zy + COL[i]
+        if is_valid(nx, ny):
+            b = [list(r) for r in key]
+            b[zx][zy], b[nx][ny] = b[nx][ny], 0
+            yield tuple(map(tuple, b)), i
+
+def _expandir_capa(frontera, dist, parents, dist_otro, hacia_meta):
+    """
+    Expande una capa completa. En el lado de GOAL (hacia_meta=True) 'parents'
+    guarda (siguiente_hacia_GOAL, movimiento_para_llegar): el opuesto (i ^ 1)
+    del movimiento con que se generó el hijo.
+    Retorna (nueva_frontera, mejor_encuentro) con mejor_encuentro = (largo, tablero) o None.
+    """
+    nueva, mejor = [], None
+    for key in frontera:
+        d = dist[key] + 1
+        for child, i in _hijos(key):
+            if child in dist:
+                continue
+            dist[child] = d
+            parents[child] = (key, MOVE_NAME[i ^ 1] if hacia_meta else MOVE_NAME[i])
+            nueva.append(child)
+            if child in dist_otro and (mejor is None or d + dist_otro[child] < mejor[0]):
+                mejor = (d + dist_otro[child], child)
+    return nueva, mejor
+
+def solve_puzzle_bfs_bidirectional(start):
+    """
+    BFS bidireccional (óptimo). stats añade 'expandidos_adelante' y
+    'expandidos_atras'; 'expandidos' es la suma, comparable con el BFS simple.
+    """
+    if not is_solvable(start, GOAL):
+        return None, None, {"expandidos": 0, "profundidad": None}
+
+    start_key = tuple(map(tuple, start))
+    goal_key  = tuple(map(tuple, GOAL))
+    if start_key == goal_key:
+        stats = {"expandidos": 0, "profundidad": 0, "expandidos_adelante": 0, "expandidos_atras": 0}
+        return [[list(r) for r in start_key]], [], stats
+
+    dist_f, parents_f, front_f = {start_key: 0}, {start_key: (None, None)}, [start_key]
+    dist_b, parents_b, front_b = {goal_key: 0}, {goal_key: (None, None)}, [goal_key]
+    exp_f = exp_b = 0
+    mejor = None
+
+    while front_f and front_b and mejor is None:
+        if len(front_f) <= len(front_b):
+            exp_f += len(front_f)
+            front_f, mejor = _expandir_capa(front_f, dist_f, parents_f, dist_b, False)
+        else:
+            exp_b += len(front_b)
+            front_b, mejor = _expandir_capa(front_b, dist_b, parents_b, dist_f, True)
+
+    if mejor is None:
+        return None, None, {"expandidos": exp_f + exp_b, "profundidad": None}
+
+    # empalme: start ... encuentro (parents_f al revés) + encuentro ... GOAL (parents_b)
+    meet = mejor[1]
+    izquierda, movs_izq = [], []
+    k = meet
+    while k is not None:
+        parent, move = parents_f[k]
+        izquierda.append(k)
+        if move is not None:
+            movs_izq.append(move)
+        k = parent
+    izquierda.reverse()
+    movs_izq.reverse()
+
+    derecha, movs_der = [], []
+    k, move = parents_b[meet]
+    while k is not None:
+        derecha.append(k)
+        movs_der.append(move)
+        k, move = parents_b[k]
+
+    path_states = [[list(r) for r in k] for k in izquierda + derecha]
+    path_moves = movs_izq + movs_der
+    stats = {"expandidos": exp_f + exp_b, "profundidad": len(path_moves),
+             "expandidos_adelante": exp_f, "expandidos_atras": exp_b}
+    return path_states, path_moves, stats
+# ----------------------------------------------------
+
+def comparar_motores(start):
+    """
+    Tiempo y pico de memoria de las variantes de BFS sobre 'start'.
+    El tiempo se mide sin tracemalloc (que ralentiza mucho la ejecución).
+    """
+    variantes = {
+        "listas": {"engine": "listas"},
+        "empaquetado": {"engine": "empaquetado"},
+        "bidireccional": {"engine": "listas", "bidirectional": True},
+    }
+    res = {}
+    for nombre, kwargs in variantes.items():
+        t0 = time.perf_counter()
+        _, _, stats = solve_puzzle_bfs(start, **kwargs)
+        dt = time.perf_counter() - t0
+
+        tracemalloc.start()
+        solve_puzzle_bfs(start, **kwargs)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        res[nombre] = {"segundos": dt, "pico_bytes": pico, **stats}
+    return res
+# ----------------------------------------------------
+
+def solve_puzzle_bfs(start, engine="listas", bidirectional=False):
+    """
+    BFS con reconstrucción de ruta; retorna (lista_tableros, lista_movimientos, stats).
+    engine="empaquetado" usa el motor de enteros empaquetados (mismo resultado);
+    engine="tabla" recorre la tabla precalculada de distancias hacia GOAL.
+    bidirectional=True busca desde start y desde GOAL a la vez (solo con "listas").
+    """
+    if bidirectional:
+        if engine != "listas":
+            raise ValueError("El modo bidireccional solo está disponible con engine='listas'")
+        return solve_puzzle_bfs_bidirectional(start)
+    if engine == "empaquetado":
+        return solve_puzzle_bfs_packed(start)
+    if engine == "tabla":
+        return solve_puzzle_table(start)
+    if engine != "listas":
+        raise ValueError(f"Motor desconocido: {engine!r}")
+
     # Comprobación previa: ¿vale la pena buscar?
     if not is_solvable(start, GOAL):
         return None, None, {"expandidos": 0, "profundidad": None}
@@ -123,3 +485,8 @@ if __name__ == "__main__":
         print("\nSecuencia de tableros:")
         for b in camino:
             print_board(b)
+
+        print("Comparación de variantes BFS:")
+        for nombre, r in comparar_motores(start).items():
+            print(f"  {nombre:<13} {r['segundos']:.3f} s | pico {r['pico_bytes'] / 1e6:.2f} MB "
+                  f"| {r['expandidos']} expandidos")
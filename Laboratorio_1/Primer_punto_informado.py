@@ -0,0 +1,389 @@
+# Primer_punto_informado.py — Búsqueda informada para el puzzle NxN
+# -----------------------------------------------------------------------------
+# Complementa a Primer_punto.py (BFS ciego, solo 3x3):
+# 1) A* con heurística intercambiable e IDA* (memoria acotada a la profundidad).
+# 2) Heurísticas: Manhattan, Manhattan + conflicto lineal y bases de datos de
+#    patrones (PDB) aditivas sobre grupos disjuntos de fichas.
+# 3) Funciona para cualquier N (8‑puzzle, 15‑puzzle, ...). La resolubilidad se
+#    comprueba con 'is_solvable', que ya contempla anchos pares.
+# 4) Métricas comparables con el dict de solve_puzzle_bfs: nodos expandidos,
+#    profundidad y pico de memoria (nodos guardados y, opcionalmente, bytes).
+# -----------------------------------------------------------------------------
+
+import heapq
+import itertools
+import time
+import tracemalloc
+from collections import deque
+
+from Primer_punto import GOAL, ROW, COL, MOVE_NAME, is_solvable, print_board, solve_puzzle_bfs
+
+INF = float("inf")
+ENCONTRADO = -1                 # valor de retorno de la DFS de IDA* al llegar a la meta
+
+# ---------- Utilidades NxN ----------
+def goal_estandar(n):
+    """Meta clásica: 1..n²-1 en orden y el vacío en la última casilla."""
+    vals = list(range(1, n * n)) + [0]
+    return [vals[i * n:(i + 1) * n] for i in range(n)]
+
+def default_goal(n):
+    """Para 3x3 se respeta el GOAL del laboratorio; para otros N, la meta clásica."""
+    return [r[:] for r in GOAL] if n == len(GOAL) else goal_estandar(n)
+
+def flatten(board):
+    return tuple(x for r in board for x in r)
+
+def unflatten(b, n):
+    return [list(b[i * n:(i + 1) * n]) for i in range(n)]
+
+_VECINOS = {}
+def vecinos_vacio(n):
+    """vecinos_vacio(n)[z] = [(indice_movimiento, nueva_pos_vacio), ...] en el orden de MOVE_NAME."""
+    if n not in _VECINOS:
+        _VECINOS[n] = [
+            [(i, (z // n + ROW[i]) * n + z % n + COL[i]) for i in range(4)
+             if 0 <= z // n + ROW[i] < n and 0 <= z % n + COL[i] < n]
+            for z in range(n * n)
+        ]
+    return _VECINOS[n]
+
+# ---------- Heurísticas ----------
+# Cada heurística es una función h(tablero_plano) -> int construida para un
+# (n, goal) concreto. Cualquier callable con esa firma sirve como heurística.
+def manhattan(n, goal):
+    """Suma de distancias Manhattan de cada ficha a su casilla en 'goal'."""
+    pos_meta = {t: k for k, t in enumerate(flatten(goal))}
+    dist = [[0] * (n * n) for _ in range(n * n)]   # dist[t][k]: ficha t en la casilla k
+    for t in range(1, n * n):
+        gk = pos_meta[t]
+        for k in range(n * n):
+            dist[t][k] = abs(k // n - gk // n) + abs(k % n - gk % n)
+
+    def h(b):
+        return sum(dist[t][k] for k, t in enumerate(b))
+    return h
+
+def _lis(seq):
+    """Longitud de la subsecuencia creciente más larga (seq tiene a lo sumo n elementos)."""
+    mejor = []
+    for i, v in enumerate(seq):
+        mejor.append(1 + max((mejor[j] for j in range(i) if seq[j] < v), default=0))
+    return max(mejor, default=0)
+
+def linear_conflict(n, goal):
+    """
+    Manhattan + conflicto lineal: en cada fila (y columna), las fichas que ya
+    están en su fila meta pero en orden invertido obligan a que alguna salga y
+    vuelva (+2 movimientos). Para seguir siendo admisible se cuenta el mínimo
+    de fichas a retirar: len(linea) - LIS(linea).
+    """
+    base = manhattan(n, goal)
+    pos_meta = {t: k for k, t in enumerate(flatten(goal))}
+    fila_meta = [0] * (n * n)
+    col_meta = [0] * (n * n)
+    for t in range(1, n * n):
+        fila_meta[t], col_meta[t] = divmod(pos_meta[t], n)
+
+    # el conflicto de una línea solo depende de su contenido: se memoiza por línea
+    cache_filas = [{} for _ in range(n)]
+    cache_cols = [{} for _ in range(n)]
+
+    def conflicto(linea, idx, es_fila):
+        if es_fila:
+            seq = [col_meta[t] for t in linea if t and fila_meta[t] == idx]
+        else:
+            seq = [fila_meta[t] for t in linea if t and col_meta[t] == idx]
+        return len(seq) - _lis(seq)
+
+    def h(b):
+        extra = 0
+        for r in range(n):
+            fila = b[r * n:(r + 1) * n]
+            c = cache_filas[r].get(fila)
+            if c is None:
+                c = cache_filas[r][fila] = conflicto(fila, r, True)
+            extra += c
+        for k in range(n):
+            col = b[k::n]
+            c = cache_cols[k].get(col)
+            if c is None:
+                c = cache_cols[k][col] = conflicto(col, k, False)
+            extra += c
+        return base(b) + 2 * extra
+    return h
+
+def grupos_por_defecto(n, goal, tam_grupo=4):
+    """Particiona las fichas (en el orden de 'goal') en grupos de 'tam_grupo'."""
+    fichas = [t for t in flatten(goal) if t]
+    return [tuple(fichas[i:i + tam_grupo]) for i in range(0, len(fichas), tam_grupo)]
+
+def pattern_database(n, goal, grupo):
+    """
+    PDB aditiva de un grupo de fichas: para cada colocación de las fichas del
+    grupo, el mínimo de movimientos *de esas fichas* para llevarlas a su meta.
+    Se calcula con un BFS 0‑1 hacia atrás desde 'goal' sobre estados
+    (posiciones del grupo, vacío): mover el vacío sobre una casilla libre cuesta
+    0 y sobre una ficha del grupo cuesta 1. Como cada movimiento real solo se
+    cobra en el grupo de la ficha movida, la suma entre grupos disjuntos es
+    admisible.
+    Retorna dict: clave de posiciones -> distancia.
+    """
+    nn = n * n
+    vec = vecinos_vacio(n)
+    gb = flatten(goal)
+    pos0 = tuple(gb.index(t) for t in grupo)
+    inicio = (pos0, gb.index(0))
+
+    dist = {inicio: 0}
+    tabla = {}
+    dq = deque([(0, inicio)])
+    while dq:
+        d, (pos, z) = dq.popleft()
+        if d > dist[(pos, z)]:
+            continue            # entrada obsoleta
+        clave = _clave_patron(pos, nn)
+        if clave not in tabla:  # el BFS 0‑1 saca los estados en orden de distancia
+            tabla[clave] = d
+        ocupadas = {p: j for j, p in enumerate(pos)}
+        for _, nz in vec[z]:
+            j = ocupadas.get(nz)
+            if j is None:
+                nuevo, nd = (pos, nz), d
+            else:
+                nuevo, nd = (pos[:j] + (z,) + pos[j + 1:], nz), d + 1
+            if nd < dist.get(nuevo, INF):
+                dist[nuevo] = nd
+                if nd == d:
+                    dq.appendleft((nd, nuevo))
+                else:
+                    dq.append((nd, nuevo))
+    return tabla
+
+def _clave_patron(pos, nn):
+    clave = 0
+    for p in pos:
+        clave = clave * nn + p
+    return clave
+
+_PDBS = {}
+def additive_pdb(n, goal, grupos=None):
+    """Heurística PDB aditiva; las tablas se guardan en memoria por (n, goal, grupos)."""
+    grupos = [tuple(g) for g in (grupos or grupos_por_defecto(n, goal))]
+    clave = (n, flatten(goal), tuple(grupos))
+    if clave not in _PDBS:
+        _PDBS[clave] = [pattern_database(n, goal, g) for g in grupos]
+    tablas = _PDBS[clave]
+    nn = n * n
+
+    def h(b):
+        pos = [0] * nn
+        for k, t in enumerate(b):
+            pos[t] = k
+        return sum(tabla[_clave_patron([pos[t] for t in g], nn)] for g, tabla in zip(grupos, tablas))
+    return h
+
+HEURISTICAS = {
+    "manhattan": manhattan,
+    "linear_conflict": linear_conflict,
+    "pdb": additive_pdb,
+}
+
+def make_heuristic(heuristic, n, goal):
+    """Acepta un nombre de HEURISTICAS o directamente un callable h(tablero_plano)."""
+    if callable(heuristic):
+        return heuristic
+    if heuristic not in HEURISTICAS:
+        raise ValueError(f"Heurística desconocida: {heuristic!r} (opciones: {', '.join(HEURISTICAS)})")
+    return HEURISTICAS[heuristic](n, goal)
+
+# ---------- Solvers ----------
+def _medir(fn, medir_memoria):
+    """Ejecuta fn(); si medir_memoria, añade 'pico_bytes' (tracemalloc) a las stats."""
+    if not medir_memoria:
+        return fn()
+    tracemalloc.start()
+    try:
+        path_states, path_moves, stats = fn()
+        stats["pico_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return path_states, path_moves, stats
+
+def _sin_solucion(**extra):
+    return None, None, {"expandidos": 0, "profundidad": None, "pico_nodos": 0, **extra}
+
+def solve_puzzle_astar(start, goal=None, heuristic="linear_conflict", medir_memoria=False):
+    """
+    A* sobre el puzzle NxN. Retorna (lista_tableros, lista_movimientos, stats)
+    igual que solve_puzzle_bfs; stats añade 'pico_nodos' (abiertos + g_cost).
+    """
+    n = len(start)
+    goal = default_goal(n) if goal is None else goal
+    if not is_solvable(start, goal):
+        return _sin_solucion()
+    h = make_heuristic(heuristic, n, goal)
+
+    def buscar():
+        vec = vecinos_vacio(n)
+        s, g_t = flatten(start), flatten(goal)
+        orden = itertools.count()
+        g_cost = {s: 0}
+        parents = {s: (None, None)}     # hijo -> (padre, movimiento)
+        # desempate por mayor g: entre iguales f conviene seguir la rama más profunda
+        open_heap = [(h(s), 0, next(orden), s, s.index(0))]
+        expanded, pico = 0, 1
+
+        while open_heap:
+            _, neg_g, _, b, z = heapq.heappop(open_heap)
+            g = -neg_g
+            if g > g_cost[b]:
+                continue                # entrada obsoleta
+            expanded += 1
+
+            if b == g_t:
+                path_states, path_moves = [], []
+                k = b
+                while k is not None:
+                    parent, move = parents[k]
+                    path_states.append(unflatten(k, n))
+                    if move is not None:
+                        path_moves.append(MOVE_NAME[move])
+                    k = parent
+                path_states.reverse()
+                path_moves.reverse()
+                return path_states, path_moves, {"expandidos": expanded, "profundidad": g, "pico_nodos": pico}
+
+            for i, nz in vec[z]:
+                nb = list(b)
+                nb[z], nb[nz] = nb[nz], 0
+                nb = tuple(nb)
+                ng = g + 1
+                if ng < g_cost.get(nb, INF):
+                    g_cost[nb] = ng
+                    parents[nb] = (b, i)
+                    heapq.heappush(open_heap, (ng + h(nb), -ng, next(orden), nb, nz))
+            pico = max(pico, len(open_heap) + len(g_cost))
+
+        return None, None, {"expandidos": expanded, "profundidad": None, "pico_nodos": pico}
+
+    return _medir(buscar, medir_memoria)
+
+def solve_puzzle_idastar(start, goal=None, heuristic="linear_conflict", medir_memoria=False):
+    """
+    IDA*: DFS con cota f = g + h que se sube al menor f que la superó. Solo
+    guarda el camino actual, así que la memoria es O(profundidad).
+    stats añade 'iteraciones' (cotas probadas) y 'pico_nodos' (camino más largo).
+    """
+    n = len(start)
+    goal = default_goal(n) if goal is None else goal
+    if not is_solvable(start, goal):
+        return _sin_solucion(iteraciones=0)
+    h = make_heuristic(heuristic, n, goal)
+
+    def buscar():
+        vec = vecinos_vacio(n)
+        s, g_t = flatten(start), flatten(goal)
+        board = list(s)
+        moves = []
+        expanded, pico = 0, 1
+
+        def dfs(z, prev, g, limite):
+            nonlocal expanded, pico
+            b = tuple(board)
+            f = g + h(b)
+            if f > limite:
+                return f
+            expanded += 1
+            pico = max(pico, g + 1)
+            if b == g_t:
+                return ENCONTRADO
+            minimo = INF
+            for i, nz in vec[z]:
+                if nz == prev:          # no deshacer el último movimiento
+                    continue
+                board[z], board[nz] = board[nz], 0
+                moves.append(i)
+                t = dfs(nz, z, g + 1, limite)
+                if t == ENCONTRADO:
+                    return t
+                moves.pop()
+                board[nz], board[z] = board[z], 0
+                minimo = min(minimo, t)
+            return minimo
+
+        limite, iteraciones = h(s), 0
+        while True:
+            iteraciones += 1
+            t = dfs(s.index(0), None, 0, limite)
+            if t == ENCONTRADO:
+                break
+            limite = t
+
+        # reconstrucción: se reaplican los movimientos desde el inicio
+        path_states = [unflatten(s, n)]
+        b, z = list(s), s.index(0)
+        for i in moves:
+            nz = z + ROW[i] * n + COL[i]
+            b[z], b[nz] = b[nz], 0
+            z = nz
+            path_states.append(unflatten(b, n))
+        stats = {"expandidos": expanded, "profundidad": len(moves), "pico_nodos": pico,
+                 "iteraciones": iteraciones}
+        return path_states, [MOVE_NAME[i] for i in moves], stats
+
+    return _medir(buscar, medir_memoria)
+
+# ---------- Comparación con el BFS ----------
+def comparar_solvers(start, heuristicas=("manhattan", "linear_conflict", "pdb")):
+    """
+    Corre BFS (solo 3x3), A* e IDA* con cada heurística y retorna
+    {nombre: stats + segundos}. 'pico_bytes' se mide en una segunda pasada
+    para no contaminar el tiempo con tracemalloc.
+    """
+    n = len(start)
+    casos = []
+    if n == len(GOAL):
+        casos.append(("BFS", lambda: solve_puzzle_bfs(start)))
+    for nombre in heuristicas:
+        make_heuristic(nombre, n, default_goal(n))     # construye las PDB antes de medir
+        casos.append((f"A* {nombre}", lambda nombre=nombre: solve_puzzle_astar(start, heuristic=nombre)))
+        casos.append((f"IDA* {nombre}", lambda nombre=nombre: solve_puzzle_idastar(start, heuristic=nombre)))
+
+    res = {}
+    for nombre, fn in casos:
+        t0 = time.perf_counter()
+        _, _, stats = fn()
+        stats = dict(stats, segundos=time.perf_counter() - t0)
+        stats["pico_bytes"] = _medir(fn, True)[2]["pico_bytes"]
+        res[nombre] = stats
+    return res
+
+def imprimir_comparacion(res):
+    print(f"{'solver':<22}{'pasos':>6}{'expandidos':>12}{'pico nodos':>12}{'pico MB':>9}{'seg':>9}")
+    for nombre, r in res.items():
+        print(f"{nombre:<22}{str(r['profundidad']):>6}{r['expandidos']:>12}"
+              f"{str(r.get('pico_nodos', '-')):>12}{r['pico_bytes'] / 1e6:>9.2f}{r['segundos']:>9.3f}")
+
+if __name__ == "__main__":
+    start3 = [
+        [5, 6, 7],
+        [4, 0, 8],
+        [3, 2, 1]
+    ]
+    print("=== 8‑puzzle (30 movimientos hasta GOAL) ===")
+    imprimir_comparacion(comparar_solvers(start3))
+
+    start4 = [
+        [0, 1, 7, 3],
+        [5, 9, 2, 8],
+        [10, 13, 11, 4],
+        [14, 6, 15, 12]
+    ]
+    print("\n=== 15‑puzzle (meta clásica) ===")
+    camino, movimientos, stats = solve_puzzle_idastar(start4)
+    print(f"Pasos (óptimos): {len(movimientos)}")
+    print("Movimientos:", " -> ".join(movimientos))
+    print("\nTablero inicial:")
+    print_board(start4)
+    imprimir_comparacion(comparar_solvers(start4, heuristicas=("manhattan", "linear_conflict")))
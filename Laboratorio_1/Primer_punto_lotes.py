@@ -0,0 +1,189 @@
+# Primer_punto_lotes.py — Resolución por lotes del 8‑puzzle
+# -----------------------------------------------------------------------------
+# Lee un archivo con un tablero por línea (9 números: "2 8 3 1 6 4 7 0 5",
+# "2,8,3,1,6,4,7,0,5" o "283164705"), descarta los irresolubles con un chequeo
+# de paridad vectorizado (NumPy) y reparte el resto en un pool de procesos.
+# Por defecto usa engine="tabla": la tabla de distancias se construye una sola
+# vez y todos los procesos la leen por mmap (mismas páginas del disco).
+# Salida: JSONL con movimientos y stats por tablero + throughput al final.
+# Ejecuta:  python Primer_punto_lotes.py --input tableros.txt --out soluciones.jsonl
+#           python Primer_punto_lotes.py --bench-paridad 1000000
+# -----------------------------------------------------------------------------
+
+import argparse, json, os, re, sys, time
+from itertools import islice
+from multiprocessing import Pool
+
+import numpy as np
+
+from Primer_punto import N, is_solvable, load_distance_table, solve_puzzle_bfs
+from Primer_punto_informado import default_goal
+
+NN = N * N
+
+# ---------- Lectura en streaming ----------
+def parse_board(linea):
+    """Línea de texto -> lista plana de NN enteros, o None si no es un tablero válido."""
+    nums = re.findall(r"\d+", linea)
+    if len(nums) == 1 and len(nums[0]) == NN:      # formato compacto "283164705"
+        nums = list(nums[0])
+    vals = [int(v) for v in nums]
+    if sorted(vals) != list(range(NN)):
+        return None
+    return vals
+
+def read_boards(path):
+    """Genera (numero_de_linea, tablero_plano | None) sin cargar todo el archivo."""
+    with open(path, encoding="utf-8") as fh:
+        for i, linea in enumerate(fh, start=1):
+            if linea.strip() and not linea.lstrip().startswith("#"):
+                yield i, parse_board(linea)
+
+# ---------- Resolubilidad vectorizada ----------
+def is_solvable_batch(boards, goal=None, bloque=65536):
+    """
+    Versión NumPy de 'is_solvable' para una matriz (M, n*n) de tableros NxN:
+    retorna una máscara booleana (M,). Mismo criterio que la escalar:
+    inversiones relativas al orden de 'goal' (por defecto GOAL si n == 3, si no
+    la meta clásica) y, para n par, + (fila del vacío - fila del vacío en goal).
+    Las inversiones se acumulan casilla por casilla (n² - 1 pasadas sobre M
+    filas) y por bloques de filas, para no materializar M x n⁴/2 pares.
+    """
+    boards = np.asarray(boards)
+    m, nn = boards.shape
+    n = int(round(nn ** 0.5))
+    if n * n != nn:
+        raise ValueError(f"Cada tablero debe tener n*n casillas (recibido {nn})")
+    goal = default_goal(n) if goal is None else goal
+
+    goal_flat = [v for r in goal for v in r]
+    dtype = np.int8 if nn <= 127 else np.int16
+    orden = np.full(nn, -1, dtype=dtype)            # el vacío queda en -1
+    orden[[v for v in goal_flat if v != 0]] = np.arange(nn - 1, dtype=dtype)
+    fila_vacio_goal = goal_flat.index(0) // n
+
+    out = np.empty(m, dtype=bool)
+    for ini in range(0, m, bloque):
+        seq = orden[boards[ini:ini + bloque]]
+        inv = np.zeros(len(seq), dtype=np.int32)
+        for k in range(nn - 1):
+            a = seq[:, k:k + 1]
+            resto = seq[:, k + 1:]
+            inv += ((a > resto) & (resto >= 0)).sum(axis=1)    # a > b >= 0 ya excluye al vacío
+        if n % 2 == 0:
+            inv += np.argmin(seq, axis=1) // n - fila_vacio_goal   # el vacío es el único -1
+        out[ini:ini + bloque] = inv % 2 == 0
+    return out
+
+def benchmark_solvable(m=1_000_000, tamanos=(3, 4), muestra_escalar=20_000, seed=0):
+    """
+    Throughput (tableros/s) de is_solvable (escalar, sobre una muestra) frente a
+    is_solvable_batch (sobre M tableros aleatorios) para cada tamaño, comprobando
+    que ambas coinciden en la muestra.
+    """
+    rng = np.random.default_rng(seed)
+    filas = []
+    for n in tamanos:
+        goal = default_goal(n)
+        boards = np.argsort(rng.random((m, n * n)), axis=1).astype(np.int8)
+
+        t0 = time.perf_counter()
+        mascara = is_solvable_batch(boards, goal)
+        t_vec = time.perf_counter() - t0
+
+        k = min(muestra_escalar, m)
+        t0 = time.perf_counter()
+        escalar = [is_solvable([b[i * n:(i + 1) * n] for i in range(n)], goal) for b in boards[:k].tolist()]
+        t_esc = time.perf_counter() - t0
+        if escalar != mascara[:k].tolist():
+            raise AssertionError(f"is_solvable_batch difiere de is_solvable para n={n}")
+
+        filas.append({"n": n, "tableros": m, "escalar_por_s": k / t_esc, "vectorizado_por_s": m / t_vec,
+                      "aceleracion": (m / t_vec) / (k / t_esc)})
+    return filas
+
+# ---------- Workers ----------
+_ENGINE = {"engine": "tabla"}
+
+def _init_worker(kwargs):
+    _ENGINE.clear()
+    _ENGINE.update(kwargs)
+    if kwargs.get("engine") == "tabla":
+        load_distance_table()                       # mmap una vez por proceso
+
+def _resolver(item):
+    linea, flat, resoluble = item
+    board = [flat[k * N:(k + 1) * N] for k in range(N)]
+    if not resoluble:
+        return {"linea": linea, "tablero": board, "resoluble": False, "movimientos": None,
+                "stats": {"expandidos": 0, "profundidad": None}}
+    _, movimientos, stats = solve_puzzle_bfs(board, **_ENGINE)
+    return {"linea": linea, "tablero": board, "resoluble": True, "movimientos": movimientos, "stats": stats}
+
+def _tareas(path, bloque):
+    """Lee por bloques, filtra con is_solvable_batch y genera tareas para el pool."""
+    lector = read_boards(path)
+    while True:
+        trozo = list(islice(lector, bloque))
+        if not trozo:
+            return
+        validos = [(i, b) for i, b in trozo if b is not None]
+        for i, b in trozo:
+            if b is None:
+                print(f"[WARN] Línea {i} omitida: no es un tablero {N}x{N} válido", file=sys.stderr)
+        if validos:
+            mascara = is_solvable_batch([b for _, b in validos], default_goal(N))
+            for (i, b), ok in zip(validos, mascara):
+                yield i, b, bool(ok)
+
+def solve_file(path, out, procesos=None, engine="tabla", bidirectional=False, bloque=4096):
+    """
+    Resuelve todos los tableros de 'path' y escribe un JSON por línea en 'out',
+    en el mismo orden de entrada. Retorna un resumen con el throughput.
+    """
+    kwargs = {"engine": engine}
+    if bidirectional:
+        kwargs["bidirectional"] = True
+    if engine == "tabla":
+        load_distance_table()                       # se construye antes de lanzar los procesos
+
+    t0 = time.perf_counter()
+    total = resolubles = 0
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh, \
+         Pool(procesos, initializer=_init_worker, initargs=(kwargs,)) as pool:
+        for res in pool.imap(_resolver, _tareas(path, bloque), chunksize=256):
+            fh.write(json.dumps(res, ensure_ascii=False) + "\n")
+            total += 1
+            resolubles += res["resoluble"]
+    dt = time.perf_counter() - t0
+    return {"tableros": total, "resolubles": resolubles, "segundos": dt,
+            "tableros_por_s": total / dt if dt > 0 else float("inf")}
+
+def main():
+    ap = argparse.ArgumentParser(description="Resolución por lotes del 8‑puzzle")
+    ap.add_argument("--input", "-i", help="Archivo con un tablero por línea")
+    ap.add_argument("--out", "-o", default="soluciones.jsonl", help="Salida JSONL")
+    ap.add_argument("--procesos", "-p", type=int, default=None, help="Procesos del pool (por defecto: CPUs)")
+    ap.add_argument("--motor", choices=["tabla", "empaquetado", "listas"], default="tabla")
+    ap.add_argument("--bidireccional", action="store_true", help="BFS bidireccional (solo --motor listas)")
+    ap.add_argument("--bench-paridad", type=int, metavar="M",
+                    help="Solo compara is_solvable escalar vs vectorizado con M tableros aleatorios")
+    args = ap.parse_args()
+
+    if args.bench_paridad:
+        for r in benchmark_solvable(args.bench_paridad):
+            print(f"n={r['n']} | {r['tableros']} tableros | escalar {r['escalar_por_s']:,.0f}/s | "
+                  f"vectorizado {r['vectorizado_por_s']:,.0f}/s | x{r['aceleracion']:.0f}")
+        return
+    if not args.input:
+        ap.error("--input es obligatorio (salvo con --bench-paridad)")
+    if args.bidireccional and args.motor != "listas":
+        ap.error("--bidireccional requiere --motor listas")
+
+    r = solve_file(args.input, args.out, args.procesos, args.motor, args.bidireccional)
+    print(f"[OK] {r['tableros']} tableros ({r['resolubles']} resolubles) -> {args.out} | "
+          f"{r['segundos']:.2f} s | {r['tableros_por_s']:.1f} tableros/s")
+
+if __name__ == "__main__":
+    main()
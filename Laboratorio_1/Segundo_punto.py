@@ -4,10 +4,14 @@
 # 1) LÁMPARA: estados y acciones, transición, simulación y verificación de meta.
 # 2) MASCOTA: igual que lámpara pero con otra semántica; añadimos "recompensa" simple.
 # 3) TESORO: BFS en cuadrícula 3x3 con reconstrucción de ruta, métricas y comentarios.
+# 4) TESORO con precómputo: campo de distancias por meta (caché LRU) o tabla de
+#    todos los pares; las consultas repetidas son un recorrido O(largo del camino).
 # Objetivo docente: visualizar "espacio de estados", "espacio de acciones" y "estado meta".
 # -----------------------------------------------------------------------------
 
+from array import array
 from collections import deque
+from functools import lru_cache
 
 # ===================== 1) LÁMPARA =====================
 def acciones_lampara(_estado):
@@ -134,8 +138,103 @@ def ejemplo_tesoro():
           f"longitud de camino = {stats['longitud_de_camino']}\n")
     print("¡Tesoro encontrado!\n")
 
+# ===================== 4) TESORO con precómputo =====================
+# Muchas consultas (inicio, meta) sobre el mismo mapa: en vez de un BFS por
+# consulta, un BFS *desde la meta* deja la distancia de cada celda a ella, y el
+# camino sale bajando por el campo (una celda vecina con distancia d-1 por paso).
+# El camino es igual de corto que el de bfs_camino, aunque entre empates puede
+# elegir otra ruta.
+SIN_CAMINO = 0xFFFF                  # distancias en enteros sin signo de 16 bits
+TOPE_TODOS_PARES = 64 * 64           # hasta este número de celdas se permite la tabla completa
+
+@lru_cache(maxsize=128)
+def campo_distancias(meta, n=None):
+    """
+    BFS desde 'meta'; retorna una vista de solo lectura (enteros de 16 bits)
+    con la distancia de cada celda (id = x*n + y), SIN_CAMINO si no se llega.
+    Se guarda en caché LRU por (meta, n). ValueError si alguna distancia no
+    cabe en 16 bits.
+    """
+    n = N if n is None else n
+    dist = array("H", [SIN_CAMINO]) * (n * n)
+    dist[meta[0] * n + meta[1]] = 0
+    q = deque([meta])
+    while q:
+        x, y = q.popleft()
+        d = dist[x * n + y] + 1
+        for dx, dy, _ in MOVES:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < n and 0 <= ny < n and dist[nx * n + ny] == SIN_CAMINO:
+                if d >= SIN_CAMINO:
+                    raise ValueError(f"Mapa de {n}x{n}: distancias mayores a {SIN_CAMINO - 1} pasos")
+                dist[nx * n + ny] = d
+                q.append((nx, ny))
+    return memoryview(dist).toreadonly()
+
+@lru_cache(maxsize=4)
+def tabla_todos_pares(n=None):
+    """
+    Todas las distancias en un solo bloque de n⁴ enteros de 16 bits: la fila
+    de la meta m empieza en m*n². Solo para mapas chicos (n² <= TOPE_TODOS_PARES).
+    """
+    n = N if n is None else n
+    if n * n > TOPE_TODOS_PARES:
+        raise ValueError(f"Mapa de {n * n} celdas: demasiado grande para la tabla de todos los pares")
+    tabla = array("H")
+    for i in range(n):
+        for j in range(n):
+            tabla.extend(campo_distancias((i, j), n))
+    return memoryview(tabla).toreadonly()
+
+def camino_por_campo(inicio, dist, n=None):
+    """
+    Baja por el campo 'dist' desde 'inicio'; mismo retorno que bfs_camino.
+    ValueError si en algún paso no hay vecina a distancia d-1 (campo inválido).
+    """
+    n = N if n is None else n
+    d = dist[inicio[0] * n + inicio[1]]
+    if d == SIN_CAMINO:
+        return None, None, {"nodos_expandidos": 0, "longitud_de_camino": None}
+    path, acts = [inicio], []
+    x, y = inicio
+    while d > 0:
+        for dx, dy, nombre in MOVES:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < n and 0 <= ny < n and dist[nx * n + ny] == d - 1:
+                x, y, d = nx, ny, d - 1
+                path.append((x, y))
+                acts.append(nombre)
+                break
+        else:
+            raise ValueError(f"Campo de distancias inválido: ninguna vecina de {(x, y)} está a distancia {d - 1}")
+    return path, acts, {"nodos_expandidos": 0, "longitud_de_camino": len(acts)}
+
+def bfs_camino_precalculado(inicio, meta, modo="campo"):
+    """
+    Igual que bfs_camino pero reutilizando trabajo entre consultas:
+    - modo="campo": campo de distancias de 'meta' (caché LRU por meta).
+    - modo="todos": tabla de todos los pares, calculada una vez por mapa.
+    """
+    if modo == "campo":
+        return camino_por_campo(inicio, campo_distancias(meta, N))
+    if modo == "todos":
+        m = meta[0] * N + meta[1]
+        fila = memoryview(tabla_todos_pares(N))[m * N * N:(m + 1) * N * N]
+        return camino_por_campo(inicio, fila)
+    raise ValueError(f"Modo desconocido: {modo!r}")
+
+def ejemplo_consultas_repetidas():
+    print("=== TESORO (consultas repetidas con precómputo) ===")
+    consultas = [((0, 0), (2, 2)), ((2, 0), (2, 2)), ((0, 2), (2, 2)), ((1, 1), (0, 0)), ((2, 2), (0, 0))]
+    for inicio, meta in consultas:
+        camino, acciones, stats = bfs_camino_precalculado(inicio, meta)
+        print(f"{inicio} -> {meta}: {' '.join(acciones) or '(ya está)'} | longitud = {stats['longitud_de_camino']}")
+    info = campo_distancias.cache_info()
+    print(f"Campos calculados: {info.misses} | reutilizados: {info.hits}\n")
+
 # -------------------- MAIN --------------------
 if __name__ == "__main__":
     ejemplo_lampara()
     ejemplo_mascota()
-    ejemplo_tesoro()
\ No newline at end of file
+    ejemplo_tesoro()
+    ejemplo_consultas_repetidas()
\ No newline at end of file
@@ -9,10 +9,17 @@
 #   * Obstáculos configurables.
 #   * BFS para encontrar camino mínimo.
 #   * Métricas: nodos expandidos y longitud de camino.
+#   * Versión compacta con NumPy para mundos grandes (1000x1000 o más):
+#     celdas como enteros, transiciones en formato CSR y recompensas en un
+#     arreglo denso; mapas cargables desde archivo (ver --mapa / --escala).
 # -----------------------------------------------------------------------------
 
+import argparse
+import time
 from collections import deque
 
+import numpy as np
+
 # ---------- Configuración del mundo ----------
 W, H = 3, 3                          # mundo 3x3
 ACCIONES = {                         # desplazamientos
@@ -100,6 +107,156 @@ def bfs(inicio, meta, T):
 
     return None, None, {"expandidos": expandidos, "long_camino": None}
 
+# ---------- Versión compacta (arreglos NumPy) ----------
+# Celda (x, y) -> id = x * H + y. Las transiciones se guardan como CSR:
+# las aristas que salen de s son indices[indptr[s]:indptr[s+1]], con la acción
+# en 'accion' (posición en ACCIONES) y la recompensa en 'recompensa', ambas
+# alineadas con 'indices'. Es la misma tabla T y el mismo mapa R de arriba,
+# sin diccionarios.
+NOMBRES_ACCION = list(ACCIONES)
+DESPLAZ = np.array(list(ACCIONES.values()), dtype=np.int64)   # (A, 2)
+
+class MundoCompacto:
+    def __init__(self, bloqueado, meta):
+        self.bloqueado = np.asarray(bloqueado, dtype=bool)      # (W, H)
+        self.W, self.H = self.bloqueado.shape
+        self.meta = meta
+        self.construir()
+
+    def construir(self):
+        """Arma el CSR de transiciones y las recompensas (-1 por paso, +10 al llegar)."""
+        W, H = self.W, self.H
+        n = W * H
+        xs, ys = np.divmod(np.arange(n, dtype=np.int64), H)
+        libre = ~self.bloqueado.ravel()
+
+        nx = xs[:, None] + DESPLAZ[None, :, 0]                   # (n, A)
+        ny = ys[:, None] + DESPLAZ[None, :, 1]
+        valido = (nx >= 0) & (nx < W) & (ny >= 0) & (ny < H) & libre[:, None]
+        destino = np.where(valido, nx * H + ny, 0)
+        valido &= libre[destino]
+
+        # recorrer 'valido' por filas agrupa las aristas por origen, en el orden de ACCIONES
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(valido.sum(axis=1), out=self.indptr[1:])
+        self.indices = destino[valido].astype(np.int32)
+        self.accion = np.nonzero(valido)[1].astype(np.int8)
+        meta_id = self.id(self.meta)
+        self.recompensa = np.where(self.indices == meta_id, 10.0, -1.0).astype(np.float32)
+
+    def id(self, s):
+        return s[0] * self.H + s[1]
+
+    def celda(self, i):
+        return divmod(int(i), self.H)
+
+    @property
+    def n_celdas(self):
+        return self.W * self.H
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.bloqueado, self.indptr, self.indices, self.accion, self.recompensa))
+
+def vecinos_compacto(s, mundo):
+    """Genera (nuevo_estado, acción) leyendo la fila s del CSR."""
+    i = mundo.id(s)
+    ini, fin = mundo.indptr[i], mundo.indptr[i + 1]
+    for v, a in zip(mundo.indices[ini:fin], mundo.accion[ini:fin]):
+        yield mundo.celda(v), NOMBRES_ACCION[a]
+
+def aristas_de(mundo, filas):
+    """(origen, índice_de_arista) de todas las aristas que salen de 'filas' (concatenación de rangos CSR)."""
+    ini = mundo.indptr[filas]
+    cuenta = mundo.indptr[filas + 1] - ini
+    base = np.repeat(ini - np.cumsum(cuenta) + cuenta, cuenta)
+    return np.repeat(filas, cuenta), base + np.arange(cuenta.sum())
+
+def bfs_compacto(inicio, meta, mundo):
+    """
+    BFS por niveles sobre el CSR: cada nivel se expande de una sola vez con
+    operaciones de arreglo. Mismo contrato que 'bfs'; 'expandidos' cuenta los
+    nodos de los niveles expandidos más la meta.
+    """
+    n = mundo.n_celdas
+    s, g = mundo.id(inicio), mundo.id(meta)
+    if mundo.bloqueado.ravel()[s] or mundo.bloqueado.ravel()[g]:
+        return None, None, {"expandidos": 0, "long_camino": None}
+
+    padre = np.full(n, -1, dtype=np.int64)
+    accion_padre = np.full(n, -1, dtype=np.int8)
+    visit = np.zeros(n, dtype=bool)
+    visit[s] = True
+    frontera = np.array([s], dtype=np.int64)
+    expandidos = 0
+
+    while frontera.size and not visit[g]:
+        expandidos += frontera.size
+        origen, aristas = aristas_de(mundo, frontera)
+        destino = mundo.indices[aristas].astype(np.int64)
+
+        nuevo = ~visit[destino]
+        destino, origen, aristas = destino[nuevo], origen[nuevo], aristas[nuevo]
+        destino, primero = np.unique(destino, return_index=True)   # primer padre, como en la cola FIFO
+        padre[destino] = origen[primero]
+        accion_padre[destino] = mundo.accion[aristas[primero]]
+        visit[destino] = True
+        frontera = destino[np.argsort(primero)]     # orden de descubrimiento (cola FIFO)
+
+    if not visit[g]:
+        return None, None, {"expandidos": expandidos, "long_camino": None}
+
+    path, acts = [], []
+    cur = g
+    while cur != -1:
+        path.append(mundo.celda(cur))
+        if cur != s:
+            acts.append(NOMBRES_ACCION[accion_padre[cur]])
+        cur = padre[cur]
+    path.reverse()
+    acts.reverse()
+    return path, acts, {"expandidos": expandidos + 1, "long_camino": len(acts)}
+
+def cargar_mundo(ruta):
+    """
+    Lee un mapa desde archivo y retorna (bloqueado, inicio, meta).
+    - .npy: matriz booleana (True = obstáculo); inicio y meta en esquinas opuestas.
+    - texto: una fila por línea con '.' libre, '#' obstáculo, 'S' inicio y 'G' meta.
+    """
+    if ruta.endswith(".npy"):
+        bloqueado = np.load(ruta).astype(bool)
+        return bloqueado, (0, 0), (bloqueado.shape[0] - 1, bloqueado.shape[1] - 1)
+
+    with open(ruta, encoding="utf-8") as fh:
+        filas = [l.rstrip("\n") for l in fh if l.strip()]
+    ancho = max(len(f) for f in filas)
+    mapa = np.array([list(f.ljust(ancho, "#")) for f in filas])
+    bloqueado = mapa == "#"
+    inicio = tuple(int(v) for v in np.argwhere(mapa == "S")[0]) if (mapa == "S").any() else (0, 0)
+    meta = tuple(int(v) for v in np.argwhere(mapa == "G")[0]) if (mapa == "G").any() else \
+        (bloqueado.shape[0] - 1, bloqueado.shape[1] - 1)
+    return bloqueado, inicio, meta
+
+def reporte_escala(lado, densidad=0.2, seed=0):
+    """Memoria y tiempo por millón de celdas en un mundo lado x lado con obstáculos aleatorios."""
+    rng = np.random.default_rng(seed)
+    bloqueado = rng.random((lado, lado)) < densidad
+    inicio, meta = (0, 0), (lado - 1, lado - 1)
+    bloqueado[inicio] = bloqueado[meta] = False
+
+    t0 = time.perf_counter()
+    mundo = MundoCompacto(bloqueado, meta)
+    t_construir = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    _, _, stats = bfs_compacto(inicio, meta, mundo)
+    t_bfs = time.perf_counter() - t0
+
+    millones = mundo.n_celdas / 1e6
+    return {"celdas": mundo.n_celdas, "aristas": int(mundo.indices.size), **stats,
+            "MB_por_millon": mundo.nbytes / 1e6 / millones,
+            "s_construir_por_millon": t_construir / millones,
+            "s_bfs_por_millon": t_bfs / millones}
+
 # ---------- Demo ----------
 def demo():
     print("=== LABERINTO 3x3 — versión final ===")
@@ -118,5 +275,31 @@ def demo():
     print(f"Métricas: {stats['expandidos']} nodos expandidos | longitud camino = {stats['long_camino']}")
     print(f"Ejemplo de recompensas (primeros 5): {list(R.items())[:5]}")
 
+def demo_mapa(ruta):
+    bloqueado, inicio, meta = cargar_mundo(ruta)
+    mundo = MundoCompacto(bloqueado, meta)
+    print(f"=== Mapa {ruta}: {mundo.W}x{mundo.H} | Inicio: {inicio} | Meta: {meta} ===")
+    path, acts, stats = bfs_compacto(inicio, meta, mundo)
+    if path is None:
+        print("No hay camino.")
+        return
+    print("Acciones:", " ".join(acts) if len(acts) <= 60 else f"{len(acts)} acciones")
+    print(f"Métricas: {stats['expandidos']} nodos expandidos | longitud camino = {stats['long_camino']}")
+
 if __name__ == "__main__":
-    demo()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mapa", help="Mapa en texto ('.', '#', 'S', 'G') o matriz booleana .npy")
+    ap.add_argument("--escala", type=int, nargs="*", metavar="LADO",
+                    help="Reporta memoria/tiempo por millón de celdas para mundos LADO x LADO")
+    args = ap.parse_args()
+
+    if args.mapa:
+        demo_mapa(args.mapa)
+    elif args.escala is not None:
+        for lado in args.escala or [1000]:
+            r = reporte_escala(lado)
+            print(f"{lado}x{lado}: {r['celdas']} celdas, {r['aristas']} aristas | "
+                  f"{r['MB_por_millon']:.1f} MB/M celdas | construir {r['s_construir_por_millon']:.3f} s/M | "
+                  f"BFS {r['s_bfs_por_millon']:.3f} s/M | camino {r['long_camino']}")
+    else:
+        demo()
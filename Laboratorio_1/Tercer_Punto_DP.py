@@ -0,0 +1,343 @@
+# Tercer_Punto_DP.py — Programación dinámica sobre el laberinto de Tercer_Punto
+# -----------------------------------------------------------------------------
+# Usa el modelo de recompensas de Tercer_Punto (-1 por paso, +10 al llegar a
+# la meta) que allí solo se imprimía:
+# 1) Iteración de valores con barridos vectorizados sobre el CSR de
+#    MundoCompacto, en modo Jacobi, Gauss-Seidel por bloques o priorizado.
+# 2) Iteración de políticas con evaluación exacta por "pointer jumping".
+# 3) Presupuesto de memoria: los barridos se hacen por bloques de filas para
+#    que los temporales no superen 'memoria_mb' (mundos de millones de celdas).
+# Ambos retornan (politica, V, stats): la política greedy (índice en ACCIONES,
+# -1 si no hay acción) y el mapa de valores, con forma (W, H). Las celdas que
+# no pueden llegar a la meta se detectan antes y quedan fuera de los barridos.
+# -----------------------------------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from Tercer_Punto import INICIO, META, OBSTACULOS, MundoCompacto, NOMBRES_ACCION, aristas_de
+
+BYTES_POR_ARISTA = 64           # ~8 temporales de 8 bytes por arista (índices int64, Q y V en float64)
+
+# ---------- Utilidades ----------
+def alcanzan_meta(mundo):
+    """
+    Celdas desde las que se puede llegar a la meta. Como los movimientos son
+    reversibles, son las que se alcanzan desde la meta (inundación por niveles).
+    """
+    alcanza = np.zeros(mundo.n_celdas, dtype=bool)
+    frontera = np.array([mundo.id(mundo.meta)], dtype=np.int64)
+    alcanza[frontera] = True
+    while frontera.size:
+        _, aristas = aristas_de(mundo, frontera)
+        destino = mundo.indices[aristas]
+        frontera = np.unique(destino[~alcanza[destino]]).astype(np.int64)
+        alcanza[frontera] = True
+    return alcanza
+
+def _actualizables(mundo, alcanza):
+    """Celdas con acciones que llegan a la meta; la meta es terminal (V = 0, sin acción)."""
+    act = (np.diff(mundo.indptr) > 0) & alcanza
+    act[mundo.id(mundo.meta)] = False
+    return act
+
+def _piso(gamma):
+    """
+    Valor de partida de las celdas que aún no "saben" llegar a la meta: el de
+    no llegar nunca, -1/(1-gamma), que es punto fijo del backup; sin descuento
+    es -inf. Así V solo sube y cada celda cambia recién cuando le llega la
+    información de la meta (el modo priorizado avanza como una ola).
+    """
+    return -1.0 / (1.0 - gamma) if gamma < 1 else -np.inf
+
+def _cambio(nuevo, viejo):
+    """|nuevo - viejo| tratando -inf -> -inf como cambio nulo."""
+    with np.errstate(invalid="ignore"):
+        d = np.abs(nuevo - viejo)
+    d[np.isnan(d)] = 0.0
+    return d
+
+def _valores_iniciales(mundo, gamma):
+    V = np.full(mundo.n_celdas, _piso(gamma))
+    V[mundo.id(mundo.meta)] = 0.0
+    return V
+
+def _mapa_valores(mundo, V, gamma, alcanza):
+    """V con forma (W, H): NaN en obstáculos y, sin descuento, -inf donde no se llega a la meta."""
+    V = V.copy()
+    if gamma >= 1:
+        V[~alcanza] = -np.inf
+    V[mundo.bloqueado.ravel()] = np.nan
+    return V.reshape(mundo.W, mundo.H)
+
+def _bloques(mundo, memoria_mb, max_celdas=None):
+    """
+    Rangos de filas [r0, r1) cuyas aristas caben en el presupuesto de
+    temporales (y, si se indica, de a lo sumo 'max_celdas' celdas).
+    """
+    max_aristas = max(1, int(memoria_mb * 1e6 / BYTES_POR_ARISTA))
+    if max_celdas is not None:
+        max_aristas = min(max_aristas, 4 * max_celdas)
+    n = mundo.n_celdas
+    r0 = 0
+    while r0 < n:
+        limite = mundo.indptr[r0] + max_aristas
+        r1 = int(np.searchsorted(mundo.indptr, limite, side="right")) - 1
+        r1 = min(max(r1, r0 + 1), n)
+        yield r0, r1
+        r0 = r1
+
+def _backup_filas(mundo, V, r0, r1, gamma, act):
+    """max_a [r + gamma V(s')] para las filas actualizables de [r0, r1) (posiciones relativas, valores)."""
+    filas = np.flatnonzero(act[r0:r1])
+    if filas.size == 0:
+        return filas, V[:0]
+    e0, e1 = mundo.indptr[r0], mundo.indptr[r1]
+    q = mundo.recompensa[e0:e1] + gamma * V[mundo.indices[e0:e1]]
+    # reduceat sobre los inicios de las filas no vacías da el máximo de cada una
+    tiene = np.diff(mundo.indptr[r0:r1 + 1]) > 0
+    inicios_todas = mundo.indptr[r0:r1][tiene] - e0
+    maximos = np.maximum.reduceat(q, inicios_todas)
+    inicios = mundo.indptr[r0:r1][filas] - e0
+    return filas, maximos[np.searchsorted(inicios_todas, inicios)]
+
+def _backup_celdas(mundo, V, celdas, gamma):
+    """max_a [r + gamma V(s')] para un subconjunto arbitrario de celdas (todas con aristas)."""
+    _, aristas = aristas_de(mundo, celdas)
+    q = mundo.recompensa[aristas] + gamma * V[mundo.indices[aristas]]
+    cuenta = mundo.indptr[celdas + 1] - mundo.indptr[celdas]
+    inicios = np.concatenate(([0], np.cumsum(cuenta)[:-1]))
+    return np.maximum.reduceat(q, inicios)
+
+def _celdas_por_bloque(mundo, mascara, memoria_mb):
+    """Celdas de 'mascara' agrupadas en bloques de filas que respetan el presupuesto."""
+    for r0, r1 in _bloques(mundo, memoria_mb):
+        celdas = r0 + np.flatnonzero(mascara[r0:r1])
+        if celdas.size:
+            yield celdas
+
+def politica_greedy(mundo, V, gamma, act, memoria_mb=256):
+    """Para cada celda de 'act', la primera acción (orden de ACCIONES) que alcanza el máximo de Q."""
+    politica = np.full(mundo.n_celdas, -1, dtype=np.int8)
+    for celdas in _celdas_por_bloque(mundo, act, memoria_mb):
+        _, aristas = aristas_de(mundo, celdas)
+        q = mundo.recompensa[aristas] + gamma * V[mundo.indices[aristas]]
+        cuenta = mundo.indptr[celdas + 1] - mundo.indptr[celdas]
+        inicios = np.concatenate(([0], np.cumsum(cuenta)[:-1]))
+        maximos = np.repeat(np.maximum.reduceat(q, inicios), cuenta)
+        pos = np.where(q >= maximos, np.arange(q.size), q.size)
+        mejor = np.minimum.reduceat(pos, inicios)
+        politica[celdas] = mundo.accion[aristas[mejor]]
+    return politica
+
+def siguiente_celda(mundo, politica, memoria_mb=256):
+    """Celda destino y recompensa al seguir 'politica' (la misma celda y 0 si no hay acción)."""
+    n = mundo.n_celdas
+    sig = np.arange(n, dtype=np.int64)
+    r = np.zeros(n)
+    for celdas in _celdas_por_bloque(mundo, politica >= 0, memoria_mb):
+        origen, aristas = aristas_de(mundo, celdas)
+        elegida = mundo.accion[aristas] == politica[origen]
+        sig[origen[elegida]] = mundo.indices[aristas[elegida]]
+        r[origen[elegida]] = mundo.recompensa[aristas[elegida]]
+    return sig, r
+
+# ---------- Iteración de valores ----------
+def value_iteration(mundo, gamma=1.0, tol=1e-6, modo="jacobi", max_iter=100_000,
+                    memoria_mb=256, lote=None):
+    """
+    Iteración de valores hasta que el mayor cambio de V sea < tol. Sin
+    descuento (gamma=1) V es exactamente 10 - (pasos - 1) hacia la meta.
+    - "jacobi": cada barrido usa solo el V del barrido anterior.
+    - "gauss_seidel": V se actualiza en sitio por bloques de filas del mapa,
+      alternando el sentido del barrido; los bloques siguientes del mismo
+      barrido ya ven los valores nuevos, así que la información cruza todo
+      el mapa (en vertical) en un solo barrido.
+    - "priorizado": solo se recalculan las celdas cuyo residuo de Bellman
+      supera tol, empezando por los 'lote' mayores residuos (todas si lote
+      es None); al cambiar una celda se reactivan sus vecinas. Como los
+      movimientos son reversibles, los predecesores de una celda son sus
+      propios vecinos en el CSR.
+    Las celdas que no llegan a la meta quedan fuera de los barridos.
+    """
+    if modo not in ("jacobi", "gauss_seidel", "priorizado"):
+        raise ValueError(f"Modo desconocido: {modo!r}")
+    t0 = time.perf_counter()
+    alcanza = alcanzan_meta(mundo)
+    act = _actualizables(mundo, alcanza)
+    V = _valores_iniciales(mundo, gamma)
+    barridos = actualizaciones = 0
+    delta = np.inf
+
+    if modo == "priorizado":
+        # con el piso como punto fijo, al principio solo pueden cambiar las vecinas de la meta
+        meta_id = mundo.id(mundo.meta)
+        vecinas = mundo.indices[mundo.indptr[meta_id]:mundo.indptr[meta_id + 1]].astype(np.int64)
+        activos = vecinas[act[vecinas]]
+        while activos.size and barridos < max_iter:
+            barridos += 1
+            nuevo = _backup_celdas(mundo, V, activos, gamma)
+            res = _cambio(nuevo, V[activos])
+            if lote is not None and activos.size > lote:
+                orden = np.argpartition(-res, lote - 1)
+                elegidos, resto = orden[:lote], orden[lote:]
+            else:
+                elegidos, resto = np.arange(activos.size), np.empty(0, dtype=np.int64)
+            cambia = elegidos[res[elegidos] > tol]
+            V[activos[cambia]] = nuevo[cambia]
+            actualizaciones += activos.size
+            delta = float(res.max())
+
+            _, aristas = aristas_de(mundo, activos[cambia])
+            pendientes = activos[resto[res[resto] > tol]]
+            activos = np.unique(np.concatenate((pendientes, mundo.indices[aristas])))
+            activos = activos[act[activos]]
+    else:
+        gs = modo == "gauss_seidel"
+        bloques = list(_bloques(mundo, memoria_mb, max_celdas=mundo.H if gs else None))
+        while delta >= tol and barridos < max_iter:
+            barridos += 1
+            fuente = V if gs else V.copy()
+            delta = 0.0
+            for r0, r1 in (bloques[::-1] if gs and barridos % 2 == 0 else bloques):
+                filas, nuevo = _backup_filas(mundo, fuente, r0, r1, gamma, act)
+                if filas.size:
+                    idx = r0 + filas
+                    delta = max(delta, float(_cambio(nuevo, V[idx]).max()))
+                    V[idx] = nuevo
+                    actualizaciones += filas.size
+
+    politica = politica_greedy(mundo, V, gamma, act, memoria_mb)
+    stats = {"barridos": barridos, "actualizaciones": actualizaciones, "delta": float(delta),
+             "segundos": time.perf_counter() - t0,
+             "MB_temporales": None if modo == "priorizado" else memoria_mb}
+    return politica.reshape(mundo.W, mundo.H), _mapa_valores(mundo, V, gamma, alcanza), stats
+
+# ---------- Iteración de políticas ----------
+def evaluar_politica(mundo, politica, gamma, V_fijo, memoria_mb=256):
+    """
+    V de una política determinista por duplicación de punteros:
+    V[s] = acc[s] + mult[s] * V[sig[s]]; en cada paso se salta a sig[sig[s]],
+    así que bastan ~log2(n) pasos aunque el camino sea largo. Las celdas sin
+    acción conservan V_fijo (0 en la meta, el piso en el resto). Los ciclos
+    de la política nunca llegan a la meta: se acotan con el piso (con
+    gamma=1 quedan como un valor muy negativo).
+    """
+    sig, r = siguiente_celda(mundo, politica, memoria_mb)
+    sin_accion = politica < 0
+    acc = np.where(sin_accion, V_fijo, r)
+    mult = np.where(sin_accion, 0.0, gamma)
+    for _ in range(int(np.ceil(np.log2(max(mundo.n_celdas, 2)))) + 1):
+        acc = acc + np.multiply(mult, acc[sig], out=np.zeros_like(acc), where=mult > 0)
+        mult = mult * mult[sig]
+        sig = sig[sig]
+    en_ciclo = mult > 0            # tras n saltos solo los ciclos conservan multiplicador
+    return np.where(en_ciclo, np.maximum(acc, _piso(gamma)), acc)
+
+def _q_de(mundo, V, politica, gamma, memoria_mb):
+    sig, r = siguiente_celda(mundo, politica, memoria_mb)
+    return np.where(politica >= 0, r + gamma * V[sig], -np.inf)
+
+def policy_iteration(mundo, gamma=1.0, max_iter=100_000, politica_inicial=None, memoria_mb=256):
+    """
+    Alterna evaluación exacta y mejora greedy hasta que la política no cambia.
+    Cada iteración es barata (~log2(n) pasos vectorizados), pero partiendo de
+    la política greedy del piso la mejora avanza unas pocas celdas
+    por iteración desde la meta: en mapas grandes conviene pasar
+    'politica_inicial' (por ejemplo, la de value_iteration en otro gamma).
+    """
+    t0 = time.perf_counter()
+    alcanza = alcanzan_meta(mundo)
+    act = _actualizables(mundo, alcanza)
+    V_fijo = _valores_iniciales(mundo, gamma)
+    if politica_inicial is None:
+        politica = politica_greedy(mundo, V_fijo, gamma, act, memoria_mb)
+    else:
+        politica = np.where(act, np.asarray(politica_inicial, dtype=np.int8).ravel(), -1).astype(np.int8)
+
+    iteraciones = 0
+    while iteraciones < max_iter:
+        iteraciones += 1
+        V = evaluar_politica(mundo, politica, gamma, V_fijo, memoria_mb)
+        nueva = politica_greedy(mundo, V, gamma, act, memoria_mb)
+        # solo se cambia de acción si mejora de verdad (evita oscilar entre empates)
+        with np.errstate(invalid="ignore"):
+            mejora = _q_de(mundo, V, nueva, gamma, memoria_mb) > _q_de(mundo, V, politica, gamma, memoria_mb) + 1e-9
+        cambia = (nueva != politica) & mejora
+        if not cambia.any():
+            break
+        politica = np.where(cambia, nueva, politica)
+    stats = {"iteraciones": iteraciones, "segundos": time.perf_counter() - t0}
+    return politica.reshape(mundo.W, mundo.H), _mapa_valores(mundo, V, gamma, alcanza), stats
+
+# ---------- Presentación ----------
+def mapa_politica(politica, mundo):
+    """Filas de texto con la flecha de cada celda ('#' obstáculo, 'G' meta)."""
+    bloqueado = mundo.bloqueado
+    filas = []
+    for x in range(mundo.W):
+        fila = ""
+        for y in range(mundo.H):
+            if (x, y) == tuple(mundo.meta):
+                fila += "G"
+            elif bloqueado[x, y]:
+                fila += "#"
+            else:
+                a = politica[x, y]
+                fila += NOMBRES_ACCION[a] if a >= 0 else "·"
+        filas.append(fila)
+    return filas
+
+def demo():
+    W, H = 3, 3
+    bloqueado = np.zeros((W, H), dtype=bool)
+    for o in OBSTACULOS:
+        bloqueado[o] = True
+    mundo = MundoCompacto(bloqueado, META)
+    print(f"=== Programación dinámica {W}x{H} | Inicio: {INICIO} | Meta: {META} ===")
+    for modo in ("jacobi", "gauss_seidel", "priorizado"):
+        pol, V, st = value_iteration(mundo, modo=modo)
+        print(f"Iteración de valores ({modo}): {st['barridos']} barridos")
+    print("V:\n", np.round(V, 2))
+    print("Política:\n" + "\n".join(mapa_politica(pol, mundo)))
+    pol, V, st = policy_iteration(mundo)
+    print(f"Iteración de políticas: {st['iteraciones']} iteraciones")
+    print("Política:\n" + "\n".join(mapa_politica(pol, mundo)))
+
+def comparar(lado, densidad=0.2, seed=0, gamma=1.0, memoria_mb=256):
+    """Corre todos los métodos en un mundo lado x lado aleatorio y reporta tiempo."""
+    rng = np.random.default_rng(seed)
+    bloqueado = rng.random((lado, lado)) < densidad
+    bloqueado[0, 0] = bloqueado[-1, -1] = False
+    mundo = MundoCompacto(bloqueado, (lado - 1, lado - 1))
+    print(f"=== {lado}x{lado} ({mundo.n_celdas} celdas, {mundo.indices.size} aristas, "
+          f"mundo {mundo.nbytes / 1e6:.1f} MB) ===")
+    ref = None
+    for modo in ("jacobi", "gauss_seidel", "priorizado"):
+        pol, V, st = value_iteration(mundo, gamma=gamma, modo=modo, memoria_mb=memoria_mb)
+        ref = V if ref is None else ref
+        print(f"VI {modo:<13} {st['segundos']:8.2f} s | {st['barridos']} barridos | "
+              f"{st['actualizaciones'] / 1e6:.1f} M backups | max|V - V_jacobi| = {_dif(V, ref):.2e}")
+    if lado > 300:
+        print("PI omitida: desde el piso necesita del orden de 'lado' iteraciones")
+        return
+    pol, V, st = policy_iteration(mundo, gamma=gamma)
+    print(f"PI {'':<13} {st['segundos']:8.2f} s | {st['iteraciones']} iteraciones | "
+          f"max|V - V_jacobi| = {_dif(V, ref):.2e}")
+
+def _dif(a, b):
+    finitos = np.isfinite(a) & np.isfinite(b)
+    return float(np.abs(a[finitos] - b[finitos]).max())
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--lado", type=int, help="Compara los métodos en un mundo aleatorio LADO x LADO")
+    ap.add_argument("--gamma", type=float, default=1.0, help="Factor de descuento")
+    ap.add_argument("--memoria-mb", type=float, default=256, help="Presupuesto de temporales por barrido")
+    args = ap.parse_args()
+    if args.lado:
+        comparar(args.lado, gamma=args.gamma, memoria_mb=args.memoria_mb)
+    else:
+        demo()
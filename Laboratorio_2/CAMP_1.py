@@ -1,37 +1,89 @@
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
-def calcular_potencial(posicion_agente, objetivo, obstaculos):
-    potencial_atractivo = 0.5 * K_atractivo * np.linalg.norm(objetivo - posicion_agente)**2
-    
-    potencial_repulsivo = 0
-    for obstaculo in obstaculos:
-        distancia = np.linalg.norm(posicion_agente - obstaculo)
-        if distancia < radio_repulsion:
-            potencial_repulsivo += 0.5 * K_repulsivo * (1/distancia - 1/radio_repulsion)**2
-    
+def calcular_potencial(posicion_agente, objetivo, obstaculos, bloque=1 << 20):
+    """
+    Potencial total en una posición (2,) o en un lote de posiciones (M, 2).
+    Las distancias a los K obstáculos se calculan por broadcasting, en bloques
+    de filas de a lo sumo 'bloque' pares posición-obstáculo para no crear una
+    matriz M x K gigante. Para una sola posición retorna un escalar.
+    """
+    posiciones = np.asarray(posicion_agente, dtype=np.float64)
+    escalar = posiciones.ndim == 1
+    posiciones = posiciones.reshape(-1, 2)
+    obstaculos = np.asarray(obstaculos, dtype=np.float64).reshape(-1, 2)
+
+    potencial_atractivo = 0.5 * K_atractivo * np.linalg.norm(objetivo - posiciones, axis=1)**2
+
+    potencial_repulsivo = np.zeros(len(posiciones))
+    filas = max(1, bloque // max(1, len(obstaculos)))
+    for ini in range(0, len(posiciones), filas):
+        p = posiciones[ini:ini + filas]
+        dx = p[:, 0:1] - obstaculos[:, 0]
+        dy = p[:, 1:2] - obstaculos[:, 1]
+        distancia = np.sqrt(dx * dx + dy * dy)                                  # (m, K)
+        with np.errstate(divide='ignore'):
+            termino = 0.5 * K_repulsivo * (1/distancia - 1/radio_repulsion)**2
+        potencial_repulsivo[ini:ini + filas] = np.where(distancia < radio_repulsion, termino, 0.0).sum(axis=1)
+
     potencial_total = potencial_atractivo + potencial_repulsivo
-    return potencial_total
+    return potencial_total[0] if escalar else potencial_total
+
+def calcular_gradiente_analitico(posicion_agente, objetivo, obstaculos):
+    """
+    Gradiente exacto del potencial para una posición (2,) o un lote (M, 2):
+    K_atractivo (p - objetivo) - K_repulsivo (1/d - 1/radio) (p - o) / d³ por
+    cada obstáculo con d < radio_repulsion.
+    """
+    posiciones = np.asarray(posicion_agente, dtype=np.float64)
+    escalar = posiciones.ndim == 1
+    posiciones = posiciones.reshape(-1, 2)
+    obstaculos = np.asarray(obstaculos, dtype=np.float64).reshape(-1, 2)
+
+    dx = posiciones[:, 0:1] - obstaculos[:, 0]
+    dy = posiciones[:, 1:2] - obstaculos[:, 1]
+    distancia = np.sqrt(dx * dx + dy * dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coef = -K_repulsivo * (1/distancia - 1/radio_repulsion) / distancia**3
+    coef = np.where(distancia < radio_repulsion, coef, 0.0)
+
+    gradiente = K_atractivo * (posiciones - objetivo)
+    gradiente[:, 0] += (coef * dx).sum(axis=1)
+    gradiente[:, 1] += (coef * dy).sum(axis=1)
+    return gradiente[0] if escalar else gradiente
+
+def calcular_direccion(posicion_agente, objetivo, obstaculos, delta=0.01, modo="diferencias"):
+    # modo="diferencias" (por defecto) es la diferencia central original; modo="analitico"
+    # usa calcular_gradiente_analitico, más barato, pero no promedia sobre delta y la
+    # trayectoria resultante no es idéntica
+    if modo == "analitico":
+        return calcular_gradiente_analitico(posicion_agente, objetivo, obstaculos)
+
+    # Los 4 puntos de la diferencia central se evalúan en un solo lote
+    x, y = posicion_agente
+    puntos = np.array([[x + delta, y], [x - delta, y], [x, y + delta], [x, y - delta]])
+    u = calcular_potencial(puntos, objetivo, obstaculos)
+    gradiente_x = (u[0] - u[1]) / (2 * delta)
+    gradiente_y = (u[2] - u[3]) / (2 * delta)
 
-def calcular_direccion(posicion_agente, objetivo, obstaculos, delta=0.01):
-    gradiente_x = (calcular_potencial([posicion_agente[0] + delta, posicion_agente[1]], objetivo, obstaculos) - 
-                    calcular_potencial([posicion_agente[0] - delta, posicion_agente[1]], objetivo, obstaculos)) / (2 * delta)
-    
-    gradiente_y = (calcular_potencial([posicion_agente[0], posicion_agente[1] + delta], objetivo, obstaculos) - 
-                    calcular_potencial([posicion_agente[0], posicion_agente[1] - delta], objetivo, obstaculos)) / (2 * delta)
-    
     return np.array([gradiente_x, gradiente_y], dtype=np.float64)
 
-def visualizar_campo_potencial(objetivo, obstaculos, trayectoria):
-    x_range = np.linspace(-2, 12, 100)
-    y_range = np.linspace(-2, 12, 100)
-    potencial_grid = np.zeros((len(x_range), len(y_range)))
+def calcular_campo(objetivo, obstaculos, resolucion=100, limites=(-2, 12)):
+    """Potencial sobre una rejilla resolucion x resolucion: campo[i, j] = U(x_i, y_j)."""
+    x_range = np.linspace(*limites, resolucion)
+    y_range = np.linspace(*limites, resolucion)
+    X, Y = np.meshgrid(x_range, y_range, indexing='ij')
+    posiciones = np.column_stack([X.ravel(), Y.ravel()])
+    potencial_grid = calcular_potencial(posiciones, objetivo, obstaculos).reshape(resolucion, resolucion)
+    return x_range, y_range, potencial_grid
 
-    for i, x in enumerate(x_range):
-        for j, y in enumerate(y_range):
-            posicion_agente = np.array([x, y])
-            potencial_grid[i, j] = calcular_potencial(posicion_agente, objetivo, obstaculos)
+def visualizar_campo_potencial(objetivo, obstaculos, trayectoria, resolucion=100):
+    t0 = time.perf_counter()
+    x_range, y_range, potencial_grid = calcular_campo(objetivo, obstaculos, resolucion)
+    print(f"Campo {resolucion}x{resolucion} calculado en {time.perf_counter() - t0:.3f} s")
 
     fig, ax = plt.subplots()
     contorno = ax.contourf(x_range, y_range, potencial_grid, cmap='viridis', levels=20)
@@ -8,34 +8,73 @@ K_repulsivo = 3.0
 radio_repulsion = 3.0
 
 # Función para calcular el campo de potencial
-def calcular_potencial(posicion_agente, objetivo, obstaculos, epsilon=0.25):
+def calcular_potencial(posicion_agente, objetivo, obstaculos, epsilon=0.25, bloque=1 << 20):
+    """
+    Potencial total en una posición (2,) o en un lote de posiciones (M, 2).
+    Las distancias a los K obstáculos se calculan por broadcasting, en bloques
+    de a lo sumo 'bloque' pares posición-obstáculo. Para una sola posición
+    retorna un escalar.
+    """
+    posiciones = np.asarray(posicion_agente, dtype=np.float64)
+    escalar = posiciones.ndim == 1
+    posiciones = posiciones.reshape(-1, 2)
+    obstaculos = np.asarray(obstaculos, dtype=np.float64).reshape(-1, 2)
+
     # Potencial de atracción hacia el objetivo
-    potencial_atractivo = 0.5 * K_atractivo * np.linalg.norm(objetivo - posicion_agente)**2
-    
-    # Potencial de repulsión de los obstáculos
-    potencial_repulsivo = 0
-    for obstaculo in obstaculos:
-        distancia = np.linalg.norm(posicion_agente - obstaculo)
-        if 1 <= distancia < radio_repulsion:
-            potencial_repulsivo += 0.5 * K_repulsivo * (1 / distancia - 1 / radio_repulsion)**2
-        elif epsilon < distancia < 1:
-            potencial_repulsivo += 0.5 * K_repulsivo * (1 / distancia - 1 / radio_repulsion)
-        else:
-            potencial_repulsivo += 0
+    potencial_atractivo = 0.5 * K_atractivo * np.linalg.norm(objetivo - posiciones, axis=1)**2
+
+    # Potencial de repulsión de los obstáculos: cuadrático en [1, radio), lineal en (epsilon, 1)
+    potencial_repulsivo = np.zeros(len(posiciones))
+    filas = max(1, bloque // max(1, len(obstaculos)))
+    for ini in range(0, len(posiciones), filas):
+        p = posiciones[ini:ini + filas]
+        dx = p[:, 0:1] - obstaculos[:, 0]
+        dy = p[:, 1:2] - obstaculos[:, 1]
+        distancia = np.sqrt(dx * dx + dy * dy)                                  # (m, K)
+        with np.errstate(divide='ignore'):
+            termino = 1 / distancia - 1 / radio_repulsion
+        termino = np.where((1 <= distancia) & (distancia < radio_repulsion), termino**2,
+                           np.where((epsilon < distancia) & (distancia < 1), termino, 0.0))
+        potencial_repulsivo[ini:ini + filas] = 0.5 * K_repulsivo * termino.sum(axis=1)
 
     # Potencial total como suma de los potenciales de atracción y repulsión
     potencial_total = potencial_atractivo + potencial_repulsivo
-    return potencial_total
+    return potencial_total[0] if escalar else potencial_total
+
+# Gradiente exacto del potencial (por tramos) para una posición (2,) o un lote (M, 2)
+def calcular_gradiente_analitico(posicion_agente, objetivo, obstaculos, epsilon=0.25):
+    posiciones = np.asarray(posicion_agente, dtype=np.float64)
+    escalar = posiciones.ndim == 1
+    posiciones = posiciones.reshape(-1, 2)
+    obstaculos = np.asarray(obstaculos, dtype=np.float64).reshape(-1, 2)
+
+    dx = posiciones[:, 0:1] - obstaculos[:, 0]
+    dy = posiciones[:, 1:2] - obstaculos[:, 1]
+    distancia = np.sqrt(dx * dx + dy * dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv3 = 1 / distancia**3
+        # d/dp de 0.5 K (1/d - 1/R)² y de 0.5 K (1/d - 1/R)
+        coef = np.where((1 <= distancia) & (distancia < radio_repulsion),
+                        -K_repulsivo * (1 / distancia - 1 / radio_repulsion) * inv3,
+                        np.where((epsilon < distancia) & (distancia < 1), -0.5 * K_repulsivo * inv3, 0.0))
+
+    gradiente = K_atractivo * (posiciones - objetivo)
+    gradiente[:, 0] += (coef * dx).sum(axis=1)
+    gradiente[:, 1] += (coef * dy).sum(axis=1)
+    return gradiente[0] if escalar else gradiente
 
 # Función para calcular el gradiente del campo de potencial en un punto dado
-def calcular_gradiente(posicion_agente, objetivo, obstaculos, epsilon=0.15):
-    gradiente = np.zeros(2)
-    for i in range(2):
-        delta_pos = np.zeros(2)
-        delta_pos[i] = epsilon
-        potencial_pos = calcular_potencial(posicion_agente + delta_pos, objetivo, obstaculos)
-        potencial_neg = calcular_potencial(posicion_agente - delta_pos, objetivo, obstaculos)
-        gradiente[i] = (potencial_pos - potencial_neg) / (2 * epsilon)
+# (modo="diferencias", por defecto, es la diferencia central original con paso epsilon;
+# modo="analitico" es más barato pero no suaviza los saltos del potencial en d=1 y
+# d=0.25, así que la trayectoria cambia: p. ej. con 20 obstáculos el agente se estanca)
+def calcular_gradiente(posicion_agente, objetivo, obstaculos, epsilon=0.15, modo="diferencias"):
+    if modo == "analitico":
+        return calcular_gradiente_analitico(posicion_agente, objetivo, obstaculos)
+
+    # Los 4 puntos de la diferencia central (+x, +y, -x, -y) se evalúan en un solo lote
+    desplazamientos = np.vstack([np.eye(2), -np.eye(2)]) * epsilon
+    potenciales = calcular_potencial(posicion_agente + desplazamientos, objetivo, obstaculos)
+    gradiente = (potenciales[:2] - potenciales[2:]) / (2 * epsilon)
     return gradiente
 
 # Función de actualización para la animación
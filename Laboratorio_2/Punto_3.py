@@ -1,12 +1,19 @@
 """
 03e_apf_bdi_astar_seguro_move.py
 APF + BDI + A* con movimiento seguro garantizado (sin atravesar obstáculos).
+
+Importar el módulo no crea figuras ni agentes: la animación se arma en
+animar() y el modo sin gráficos (simular / simular_lote) corre muchos
+escenarios en un pool de procesos:
+    python Punto_3.py                       # animación del escenario herradura
+    python Punto_3.py --lote 200 -p 4       # 200 escenarios aleatorios, sin gráficos
 """
 
+import json, time
+from multiprocessing import Pool
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from collections import deque
+from collections import OrderedDict, deque
 import heapq
 
 # ---------- Parámetros ----------
@@ -18,11 +25,14 @@ UMBRAL_GRAD = 0.05
 UMBRAL_MEJORA_DIST = 0.02
 UMBRAL_MOV = 0.03
 MAX_SIN_MEJORA = 60
+META_DIST = 0.5                  # distancia al objetivo real que cuenta como llegada
 
 WAYPOINT_DIST = 0.7
 CLEARANCE = 0.55                 # zona de seguridad alrededor de cada obstáculo
 MIN_STEP = 1e-5                  # ahora más pequeño para no “congelarse”
 LS_SHRINK = 0.5
+LAMBDAS = LS_SHRINK ** np.arange(64)
+LAMBDAS = LAMBDAS[LAMBDAS > MIN_STEP]   # pasos de la búsqueda lineal: 1, LS_SHRINK, LS_SHRINK², ...
 
 GRID_MIN, GRID_MAX = 0, 15
 MOVES_8 = [(1,0),(-1,0),(0,1),(0,-1),(1,1),(1,-1),(-1,1),(-1,-1)]
@@ -35,30 +45,211 @@ def dist_point_segment(q, a, b):
     proj = a + t * ab
     return np.linalg.norm(q - proj)
 
+class IndiceObstaculos:
+    """
+    Rejilla uniforme de obstáculos (celdas de lado 'celda', por defecto
+    RADIO_REP) construida una vez por escenario. Los obstáculos quedan
+    ordenados por celda (ix * ny + iy) con un arreglo de punteros estilo CSR,
+    de modo que las celdas de una misma columna ix son contiguas y una
+    consulta por caja devuelve a lo sumo una rebanada por columna.
+    """
+    def __init__(self, obs, celda=max(RADIO_REP, CLEARANCE)):
+        self.obs = np.asarray(obs, dtype=float).reshape(-1, 2)
+        self.celda = float(celda)
+        self.origen = self.obs.min(axis=0) if len(self.obs) else np.zeros(2)
+        extremo = self.obs.max(axis=0) if len(self.obs) else np.zeros(2)
+        self.nx, self.ny = (np.floor((extremo - self.origen) / self.celda).astype(int) + 1)
+        ix, iy = self._celdas(self.obs).T
+        ids = ix * self.ny + iy
+        orden = np.argsort(ids, kind="stable")
+        self.puntos = self.obs[orden]
+        self.inicio = np.searchsorted(ids[orden], np.arange(self.nx * self.ny + 1))
+
+    def __len__(self):
+        return len(self.obs)
+
+    def _celdas(self, q):
+        return np.floor((np.asarray(q, dtype=float) - self.origen) / self.celda).astype(int)
+
+    def en_caja(self, lo, hi):
+        """Obstáculos de las celdas que tocan la caja [lo, hi] (superconjunto de los que caen en ella)."""
+        (x0, y0), (x1, y1) = self._celdas(lo), self._celdas(hi)
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.nx - 1), min(y1, self.ny - 1)
+        if x0 > x1 or y0 > y1:
+            return self.puntos[:0]
+        trozos = [self.puntos[self.inicio[ix * self.ny + y0]:self.inicio[ix * self.ny + y1 + 1]]
+                  for ix in range(x0, x1 + 1)]
+        return trozos[0] if len(trozos) == 1 else np.concatenate(trozos)
+
+    def cercanos(self, p, radio):
+        """Candidatos a estar a distancia < radio de p."""
+        p = np.asarray(p, dtype=float)
+        return self.en_caja(p - radio, p + radio)
+
+def _candidatos(obs, lo, hi):
+    """Obstáculos que pueden influir en la caja [lo, hi]: consulta el índice si lo hay."""
+    if isinstance(obs, IndiceObstaculos):
+        return obs.en_caja(lo, hi)
+    return np.asarray(obs, dtype=float).reshape(-1, 2)
+
+def segmentos_seguros(a, B, obstaculos, clearance=CLEARANCE):
+    """
+    Versión en lote de segmento_seguro para L segmentos que parten de 'a' y
+    terminan en las filas de B (L, 2): la distancia de cada obstáculo cercano
+    a cada segmento se calcula de una vez en una matriz (L, K), con la misma
+    proyección acotada de dist_point_segment. Retorna una máscara (L,).
+    """
+    a = np.asarray(a, dtype=float)
+    B = np.asarray(B, dtype=float).reshape(-1, 2)
+    O = _candidatos(obstaculos, np.minimum(a, B.min(axis=0)) - clearance,
+                    np.maximum(a, B.max(axis=0)) + clearance)
+    if len(O) == 0:
+        return np.ones(len(B), dtype=bool)
+    AB = B - a                                                    # (L, 2)
+    den = AB[:, 0] * AB[:, 0] + AB[:, 1] * AB[:, 1]
+    QA = O - a                                                    # (K, 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (QA[None, :, 0] * AB[:, None, 0] + QA[None, :, 1] * AB[:, None, 1]) / den[:, None]
+    t = np.where(den[:, None] < 1e-12, 0.0, np.clip(t, 0, 1))      # (L, K)
+    dx = QA[None, :, 0] - t * AB[:, None, 0]
+    dy = QA[None, :, 1] - t * AB[:, None, 1]
+    return np.all(dx * dx + dy * dy >= clearance * clearance, axis=1)
+
 def segmento_seguro(a, b, obstaculos, clearance=CLEARANCE):
-    for o in obstaculos:
-        if dist_point_segment(o, a, b) < clearance:
-            return False
-    return True
+    return bool(segmentos_seguros(a, b, obstaculos, clearance)[0])
 
 # ---------- APF ----------
+# p puede ser una posición (2,) o un lote de agentes (M, 2); las distancias a
+# los K obstáculos se calculan por broadcasting en bloques de a lo sumo
+# BLOQUE_PARES pares agente-obstáculo. 'obs' puede ser un arreglo (K, 2) o un
+# IndiceObstaculos: en ese caso solo entran los obstáculos de las celdas que
+# tocan la caja del lote ampliada en RADIO_REP (más allá la repulsión es 0).
+BLOQUE_PARES = 1 << 18
+
+def _lotes(p, obs):
+    P = np.asarray(p, dtype=float)
+    Q = P.reshape(-1, 2)
+    O = _candidatos(obs, Q.min(axis=0) - RADIO_REP, Q.max(axis=0) + RADIO_REP)
+    filas = max(1, BLOQUE_PARES // max(1, len(O)))
+    return P.ndim == 1, Q, O, filas
+
 def potencial_total(p, g, obs, eps=0.25):
-    U_attr = 0.5 * K_ATR * np.linalg.norm(g - p) ** 2
-    U_rep = 0.0
-    for o in obs:
-        d = np.linalg.norm(p - o)
-        if 1 <= d < RADIO_REP:
-            U_rep += 0.5 * K_REP * (1/d - 1/RADIO_REP) ** 2
-        elif eps < d < 1:
-            U_rep += 0.5 * K_REP * (1/d - 1/RADIO_REP)
-    return U_attr + U_rep
-
-def gradiente(p, g, obs, h=0.12):
-    grad = np.zeros(2)
-    for i in range(2):
-        dp = np.zeros(2); dp[i] = h
-        grad[i] = (potencial_total(p+dp, g, obs) - potencial_total(p-dp, g, obs)) / (2*h)
-    return grad
+    escalar, P, O, filas = _lotes(p, obs)
+    U = 0.5 * K_ATR * np.linalg.norm(g - P, axis=1) ** 2
+    for ini in range(0, len(P), filas):
+        d = np.linalg.norm(P[ini:ini + filas, None, :] - O[None, :, :], axis=2)     # (m, K)
+        with np.errstate(divide="ignore"):
+            u = 1/d - 1/RADIO_REP
+        U_rep = np.where((1 <= d) & (d < RADIO_REP), u ** 2, np.where((eps < d) & (d < 1), u, 0.0))
+        U[ini:ini + filas] += 0.5 * K_REP * U_rep.sum(axis=1)
+    return U[0] if escalar else U
+
+def gradiente_analitico(p, g, obs, eps=0.25):
+    """
+    Gradiente exacto de potencial_total, término a término:
+      atractivo           K_ATR (p - g)
+      1 <= d < RADIO_REP  -K_REP (1/d - 1/RADIO_REP) (p - o) / d³
+      eps < d < 1         -K_REP/2 (p - o) / d³
+    """
+    escalar, P, O, filas = _lotes(p, obs)
+    grad = K_ATR * (P - g)
+    for ini in range(0, len(P), filas):
+        dx = P[ini:ini + filas, 0:1] - O[:, 0]                                         # (m, K)
+        dy = P[ini:ini + filas, 1:2] - O[:, 1]
+        d = np.sqrt(dx * dx + dy * dy)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv3 = 1 / d ** 3
+            coef = np.where((1 <= d) & (d < RADIO_REP), -K_REP * (1/d - 1/RADIO_REP) * inv3,
+                            np.where((eps < d) & (d < 1), -0.5 * K_REP * inv3, 0.0))
+        grad[ini:ini + filas, 0] += (coef * dx).sum(axis=1)
+        grad[ini:ini + filas, 1] += (coef * dy).sum(axis=1)
+    return grad[0] if escalar else grad
+
+def gradiente(p, g, obs, h=0.12, modo="diferencias"):
+    """
+    modo="diferencias" (por defecto): diferencias centrales con paso h, que
+    suavizan los saltos de potencial_total en d = eps y d = 1.
+    modo="analitico": gradiente_analitico, más barato pero ciego a esos saltos.
+    """
+    if modo == "analitico":
+        return gradiente_analitico(p, g, obs)
+    if modo != "diferencias":
+        raise ValueError(f"modo desconocido: {modo!r}")
+    escalar, P, _, _ = _lotes(p, obs)
+    desp = np.vstack([np.eye(2), -np.eye(2)]) * h                                  # +x, +y, -x, -y
+    U = potencial_total((P[:, None, :] + desp).reshape(-1, 2), g, obs).reshape(-1, 4)
+    grad = (U[:, :2] - U[:, 2:]) / (2*h)
+    return grad[0] if escalar else grad
+
+def verificar_gradiente(g, obs, muestras=2000, h=1e-6, seed=0):
+    """
+    Compara gradiente_analitico con diferencias centrales de paso h en puntos
+    aleatorios del mapa, descartando los que quedan cerca de un borde de tramo
+    (d = eps, 1, RADIO_REP). En d = eps y d = 1 el potencial es discontinuo:
+    ahí las diferencias con el paso h=0.12 de gradiente ven un salto que el
+    analítico ignora, así que este error solo mide el interior de los tramos.
+    Retorna el error relativo máximo.
+    """
+    rng = np.random.default_rng(seed)
+    P = rng.uniform(GRID_MIN, GRID_MAX, (muestras, 2))
+    d = np.linalg.norm(P[:, None, :] - _candidatos(obs, P.min(axis=0), P.max(axis=0))[None], axis=2)
+    lejos = np.all(np.min(np.abs(d[..., None] - np.array([0.25, 1.0, RADIO_REP])), axis=2) > 10*h, axis=1)
+    P = P[lejos]
+    ga = gradiente(P, g, obs, modo="analitico")
+    gd = gradiente(P, g, obs, h=h, modo="diferencias")
+    return float(np.max(np.linalg.norm(ga - gd, axis=1) / np.maximum(1.0, np.linalg.norm(ga, axis=1))))
+
+def costo_por_paso(g, cantidades=(10, 100, 1000, 10000), agentes=100, repeticiones=50, seed=0):
+    """
+    Tiempo por paso (µs) de gradiente en modo diferencias vs analítico para K
+    obstáculos aleatorios, y el costo por agente al evaluar 'agentes' a la vez.
+    """
+    rng = np.random.default_rng(seed)
+    filas = []
+    for k in cantidades:
+        obs = rng.uniform(GRID_MIN, GRID_MAX, (k, 2))
+        p = rng.uniform(GRID_MIN, GRID_MAX, 2)
+        P = rng.uniform(GRID_MIN, GRID_MAX, (agentes, 2))
+        fila = {"obstaculos": k}
+        for nombre, fn in (("diferencias_us", lambda: gradiente(p, g, obs, modo="diferencias")),
+                           ("analitico_us", lambda: gradiente(p, g, obs, modo="analitico")),
+                           ("lote_por_agente_us", lambda: gradiente(P, g, obs, modo="analitico"))):
+            t0 = time.perf_counter()
+            for _ in range(repeticiones):
+                fn()
+            fila[nombre] = (time.perf_counter() - t0) / repeticiones * 1e6
+        fila["lote_por_agente_us"] /= agentes
+        filas.append(fila)
+    return filas
+
+def costo_consultas(cantidades=(100, 1000, 10000, 50000), densidad=0.05, repeticiones=20, seed=0):
+    """
+    Costo (µs) de las consultas de un tick (potencial_total + gradiente +
+    segmento_seguro de un paso corto) sobre mapas que crecen con densidad de
+    obstáculos constante: barrido completo del arreglo vs IndiceObstaculos.
+    Incluye el tiempo de construir el índice.
+    """
+    rng = np.random.default_rng(seed)
+    filas = []
+    for k in cantidades:
+        lado = float(np.sqrt(k / densidad))
+        obs = rng.uniform(0, lado, (k, 2))
+        t0 = time.perf_counter()
+        indice = IndiceObstaculos(obs)
+        fila = {"obstaculos": k, "lado": lado, "construccion_ms": (time.perf_counter() - t0) * 1e3}
+        p = rng.uniform(0, lado, 2)
+        g = rng.uniform(0, lado, 2)
+        delta = 0.3 * (g - p) / np.linalg.norm(g - p)
+        for nombre, fuente in (("barrido_us", obs), ("indice_us", indice)):
+            t0 = time.perf_counter()
+            for _ in range(repeticiones):
+                potencial_total(p, g, fuente)
+                gradiente(p, g, fuente)
+                segmento_seguro(p, p + delta, fuente)
+            fila[nombre] = (time.perf_counter() - t0) / repeticiones * 1e6
+        filas.append(fila)
+    return filas
 
 # ---------- A* ----------
 def a_star(start_xy, goal_xy, obst_set):
@@ -91,6 +282,132 @@ def a_star(start_xy, goal_xy, obst_set):
         cur = came[cur]; path.append(cur)
     return list(reversed(path))
 
+class PlanificadorA:
+    """
+    A* sobre una rejilla de ocupación en arreglos: nodo = (x - GRID_MIN) * W + (y - GRID_MIN)
+    (mismo orden que las tuplas (x, y), así que los desempates del heap coinciden
+    con a_star), tabla de vecinos por nodo con su costo ya filtrada por bordes,
+    obstáculos y esquinas, y heurística calculada de una vez con NumPy por meta.
+    Los planes se guardan en una caché LRU con clave (inicio redondeado, meta,
+    versión); marcar() cambia obstáculos, sube la versión y vacía la caché.
+    """
+    def __init__(self, obst_set, tam_cache=256):
+        self.W = GRID_MAX - GRID_MIN + 1
+        self.libre = np.ones((self.W, self.W), dtype=bool)
+        self.obst_set = set()
+        self.version = 0
+        self.tam_cache = tam_cache
+        self._cache = OrderedDict()
+        self.aciertos = self.fallos = 0
+        xs, ys = np.meshgrid(np.arange(GRID_MIN, GRID_MAX + 1), np.arange(GRID_MIN, GRID_MAX + 1), indexing="ij")
+        self.X, self.Y = xs.ravel(), ys.ravel()
+        self.marcar(obst_set)
+
+    def marcar(self, celdas, ocupado=True):
+        """Agrega (o quita, con ocupado=False) celdas ocupadas y reconstruye la tabla de vecinos."""
+        for c in celdas:
+            c = tuple(map(int, c))
+            (self.obst_set.add if ocupado else self.obst_set.discard)(c)
+            if self._dentro(c):
+                self.libre[c[0] - GRID_MIN, c[1] - GRID_MIN] = not ocupado
+        self.version += 1
+        self._cache.clear()
+        self._vecinos = self._tabla_vecinos()
+
+    def _dentro(self, c):
+        return GRID_MIN <= c[0] <= GRID_MAX and GRID_MIN <= c[1] <= GRID_MAX
+
+    def _tabla_vecinos(self):
+        W, libre = self.W, np.pad(self.libre, 1, constant_values=False)   # borde = fuera de la rejilla
+        ix, iy = self.X - GRID_MIN + 1, self.Y - GRID_MIN + 1
+        tabla = [[] for _ in range(W * W)]
+        for dx, dy in MOVES_8:
+            ok = libre[ix + dx, iy + dy]
+            if dx != 0 and dy != 0:                                      # no cortar esquinas
+                ok &= libre[ix + dx, iy] & libre[ix, iy + dy]
+            costo = float(np.hypot(dx, dy))
+            for u in np.flatnonzero(ok).tolist():
+                tabla[u].append((u + dx * W + dy, costo))
+        return tabla
+
+    def plan(self, start_xy, goal_xy):
+        start = tuple(map(int, map(round, start_xy)))
+        goal  = tuple(map(int, map(round, goal_xy)))
+        clave = (start, goal, self.version)
+        if clave in self._cache:
+            self.aciertos += 1
+            self._cache.move_to_end(clave)
+            return list(self._cache[clave])
+        self.fallos += 1
+        if not self._dentro(start):
+            path = a_star(start, goal, self.obst_set)                 # caso raro: se sale de la rejilla
+        elif not self._dentro(goal):
+            path = []
+        else:
+            path = self._buscar(start, goal)
+        self._cache[clave] = path
+        if len(self._cache) > self.tam_cache:
+            self._cache.popitem(last=False)
+        return list(path)
+
+    def _buscar(self, start, goal):
+        W = self.W
+        s = (start[0] - GRID_MIN) * W + (start[1] - GRID_MIN)
+        t = (goal[0] - GRID_MIN) * W + (goal[1] - GRID_MIN)
+        h = np.hypot(self.X - goal[0], self.Y - goal[1]).tolist()
+        g = [np.inf] * (W * W)
+        padre = [-1] * (W * W)
+        cerrado = bytearray(W * W)
+        vecinos = self._vecinos
+        g[s] = 0.0
+        open_heap = [(h[s], 0.0, s, -1)]
+        while open_heap:
+            f, gu, u, par = heapq.heappop(open_heap)
+            if cerrado[u]: continue
+            cerrado[u] = 1
+            padre[u] = par
+            if u == t: break
+            for v, c in vecinos[u]:
+                ng = gu + c
+                if ng < g[v]:
+                    g[v] = ng
+                    heapq.heappush(open_heap, (ng + h[v], ng, v, u))
+        if not cerrado[t]: return []
+        path, cur = [], t
+        while cur != -1:
+            path.append((cur // W + GRID_MIN, cur % W + GRID_MIN))
+            cur = padre[cur]
+        return list(reversed(path))
+
+def costo_astar(escenarios, repeticiones=3):
+    """
+    Tiempo medio por plan (µs) de a_star (tuplas y conjuntos) vs PlanificadorA
+    sin caché y con caché, sobre los (p0, g, obs) dados; verifica que las rutas
+    coincidan.
+    """
+    fila = {"planes": len(escenarios), "tuplas_us": 0.0, "arreglos_us": 0.0, "cache_us": 0.0}
+    for p0, g, obs in escenarios:
+        obst_set = {tuple(map(int, o)) for o in obs}
+        planificador = PlanificadorA(obst_set)
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            ref = a_star(p0, g, obst_set)
+        fila["tuplas_us"] += (time.perf_counter() - t0) / repeticiones
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            planificador._cache.clear()
+            ruta = planificador.plan(p0, g)
+        fila["arreglos_us"] += (time.perf_counter() - t0) / repeticiones
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            planificador.plan(p0, g)
+        fila["cache_us"] += (time.perf_counter() - t0) / repeticiones
+        if ruta != ref:
+            raise AssertionError(f"PlanificadorA difiere de a_star desde {p0} hacia {g}")
+    for k in ("tuplas_us", "arreglos_us", "cache_us"):
+        fila[k] *= 1e6 / max(1, len(escenarios))
+    return fila
+
 def waypoint_seguro(path, p_actual, obst_set):
     if not path: return None
     pa = tuple(map(int, map(round, p_actual)))
@@ -113,19 +430,22 @@ class AgenteBDI:
         self.G_ACTUAL = g.astype(float)
         self.obs = obs.astype(float)
         self.obs_set = {tuple(map(int, o)) for o in obs}
+        self.indice = IndiceObstaculos(self.obs)
+        self.planificador = PlanificadorA(self.obs_set)
         self.histU, self.histDist, self.histPos = [], deque(maxlen=WINDOW), deque(maxlen=WINDOW)
         self.intencion = "seguir_gradiente"
         self.waypoint, self.path = None, []
         self.sin_mejora = 0
         self.first_tick = True
+        self.replanes = 0
 
     def actualizar_creencias(self):
-        U = potencial_total(self.p, self.G_ACTUAL, self.obs)
+        U = potencial_total(self.p, self.G_ACTUAL, self.indice)
         self.histU.append(U)
         self.histPos.append(self.p.copy())
         self.dist_obj = np.linalg.norm(self.G_REAL - self.p)
         self.histDist.append(self.dist_obj)
-        self.grad = gradiente(self.p, self.G_ACTUAL, self.obs)
+        self.grad = gradiente(self.p, self.G_ACTUAL, self.indice)
 
     def estancado(self):
         if len(self.histDist) < WINDOW: 
@@ -138,10 +458,11 @@ class AgenteBDI:
         return cond_grad or (mejora_media < UMBRAL_MEJORA_DIST) or (mov_media < UMBRAL_MOV)
 
     def plan_escape(self):
-        self.path = a_star(self.p, self.G_REAL, self.obs_set)
+        self.replanes += 1
+        self.path = self.planificador.plan(self.p, self.G_REAL)
         if not self.path:
             fallback = (int(GRID_MAX-1), int(GRID_MAX-1))
-            self.path = a_star(self.p, fallback, self.obs_set)
+            self.path = self.planificador.plan(self.p, fallback)
         wp = waypoint_seguro(self.path, self.p, self.obs_set)
         if wp is not None:
             self.waypoint = wp
@@ -155,14 +476,11 @@ class AgenteBDI:
             self.intencion = "seguir_gradiente"
 
     def paso_seguro(self, delta):
-        lam = 1.0
-        a = self.p
-        while lam > MIN_STEP:
-            b = self.p + lam * delta
-            if segmento_seguro(a, b, self.obs, CLEARANCE):
-                return lam * delta
-            lam *= LS_SHRINK
-        return None
+        # todas las longitudes de la búsqueda lineal (1, LS_SHRINK, LS_SHRINK², ... > MIN_STEP)
+        # se prueban en una sola evaluación; se toma la mayor que resulte segura
+        seguros = segmentos_seguros(self.p, self.p + LAMBDAS[:, None] * delta, self.indice, CLEARANCE)
+        k = np.argmax(seguros)
+        return LAMBDAS[k] * delta if seguros[k] else None
 
     def follow_path_step(self):
         """Paso corto hacia el siguiente nodo de A* (con seguridad)."""
@@ -238,34 +556,138 @@ OBS = np.array([
     [10,2],[10,3],[10,4],[10,5],[10,6],[10,7],[10,8],[10,9],[10,10]
 ])
 
-agent = AgenteBDI(P0, G, OBS)
+# ---------- Simulación sin gráficos ----------
+def simular(p0, g, obs, max_ticks=600):
+    """Corre un AgenteBDI hasta llegar a META_DIST del objetivo o agotar max_ticks."""
+    t0 = time.perf_counter()
+    agente = AgenteBDI(np.asarray(p0, dtype=float), np.asarray(g, dtype=float), np.asarray(obs, dtype=float))
+    exito, ticks = False, 0
+    while ticks < max_ticks and not exito:
+        agente.tick()
+        ticks += 1
+        exito = np.linalg.norm(agente.G_REAL - agente.p) < META_DIST
+    return {"exito": bool(exito), "ticks": ticks, "replanes": agente.replanes,
+            "aciertos_cache": agente.planificador.aciertos,
+            "dist_final": float(np.linalg.norm(agente.G_REAL - agente.p)),
+            "segundos": time.perf_counter() - t0}
+
+def generar_escenarios(n, obstaculos=40, seed=0, incluir_herradura=True):
+    """
+    n escenarios (p0, g, obs) en la rejilla [GRID_MIN, GRID_MAX]: obstáculos en
+    celdas enteras al azar, inicio y meta en celdas libres a más de CLEARANCE de
+    todo obstáculo y separadas al menos la mitad del mapa. El primero es la
+    herradura del módulo si incluir_herradura.
+    """
+    rng = np.random.default_rng(seed)
+    escenarios = [(P0, G, OBS)] if incluir_herradura and n > 0 else []
+    celdas = np.array([(x, y) for x in range(GRID_MIN + 1, GRID_MAX) for y in range(GRID_MIN + 1, GRID_MAX)])
+    while len(escenarios) < n:
+        obs = celdas[rng.choice(len(celdas), obstaculos, replace=False)]
+        libres = celdas[np.min(np.linalg.norm(celdas[:, None, :] - obs[None], axis=2), axis=1) > CLEARANCE + 0.5]
+        if len(libres) < 2:
+            continue
+        p0, g = libres[rng.choice(len(libres), 2, replace=False)]
+        if np.linalg.norm(g - p0) >= (GRID_MAX - GRID_MIN) / 2:
+            escenarios.append((p0.astype(float), g.astype(float), obs))
+    return escenarios
+
+def _simular_escenario(item):
+    i, (p0, g, obs), max_ticks = item
+    return {"escenario": i, **simular(p0, g, obs, max_ticks)}
+
+def simular_lote(escenarios, procesos=None, max_ticks=600):
+    """Reparte los escenarios en un pool de procesos; resultados en el orden de entrada."""
+    tareas = [(i, esc, max_ticks) for i, esc in enumerate(escenarios)]
+    with Pool(procesos) as pool:
+        return list(pool.imap(_simular_escenario, tareas, chunksize=4))
+
+def resumen(resultados):
+    exitos = [r for r in resultados if r["exito"]]
+    return {"escenarios": len(resultados),
+            "tasa_exito": len(exitos) / len(resultados) if resultados else 0.0,
+            "ticks_medio_exito": float(np.mean([r["ticks"] for r in exitos])) if exitos else None,
+            "replanes_medio": float(np.mean([r["replanes"] for r in resultados])) if resultados else 0.0,
+            "segundos_medio": float(np.mean([r["segundos"] for r in resultados])) if resultados else 0.0}
 
 # ---------- Visual ----------
-fig, (ax, ax2) = plt.subplots(1, 2, figsize=(12,5))
-def update(_):
-    agent.tick()
-    ax.clear()
-    for o in OBS:
-        ax.scatter(o[0], o[1], c='black', marker='x', s=80)
-    ax.scatter(agent.p[0], agent.p[1], c='red', s=200, label="Agente")
-    ax.scatter(agent.G_REAL[0], agent.G_REAL[1], c='green', marker='x', s=120, label="Objetivo real")
-    if agent.waypoint is not None:
-        ax.scatter(agent.waypoint[0], agent.waypoint[1], c='orange', marker='*', s=160, label="Waypoint A*")
-        if agent.path:
-            xs, ys = zip(*agent.path)
-            ax.plot(xs, ys, linestyle='--', linewidth=1, color='tab:blue', alpha=0.6)
-    ax.set_xlim(0, 15); ax.set_ylim(0, 15)
-    ax.set_title(f"APF + BDI + A* (modo: {agent.intencion})")
-    ax.legend(loc="upper left", fontsize=8)
-    ax.set_xlabel("x"); ax.set_ylabel("y")
-
-    ax2.clear()
-    ax2.plot(agent.histU, label="Energía Potencial")
-    ax2.set_title("Evolución de la Energía Potencial")
-    ax2.set_xlabel("Iteración"); ax2.set_ylabel("Energía Potencial")
-    ax2.legend()
-
-ani = FuncAnimation(fig, update, frames=320, interval=120)
-plt.tight_layout()
+def animar(p0=P0, g=G, obs=OBS, frames=320):
+    # matplotlib solo hace falta para la animación: simular/simular_lote corren sin él
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FuncAnimation
+
+    agent = AgenteBDI(p0, g, obs)
+    fig, (ax, ax2) = plt.subplots(1, 2, figsize=(12,5))
+    def update(_):
+        agent.tick()
+        ax.clear()
+        for o in obs:
+            ax.scatter(o[0], o[1], c='black', marker='x', s=80)
+        ax.scatter(agent.p[0], agent.p[1], c='red', s=200, label="Agente")
+        ax.scatter(agent.G_REAL[0], agent.G_REAL[1], c='green', marker='x', s=120, label="Objetivo real")
+        if agent.waypoint is not None:
+            ax.scatter(agent.waypoint[0], agent.waypoint[1], c='orange', marker='*', s=160, label="Waypoint A*")
+            if agent.path:
+                xs, ys = zip(*agent.path)
+                ax.plot(xs, ys, linestyle='--', linewidth=1, color='tab:blue', alpha=0.6)
+        ax.set_xlim(0, 15); ax.set_ylim(0, 15)
+        ax.set_title(f"APF + BDI + A* (modo: {agent.intencion})")
+        ax.legend(loc="upper left", fontsize=8)
+        ax.set_xlabel("x"); ax.set_ylabel("y")
+
+        ax2.clear()
+        ax2.plot(agent.histU, label="Energía Potencial")
+        ax2.set_title("Evolución de la Energía Potencial")
+        ax2.set_xlabel("Iteración"); ax2.set_ylabel("Energía Potencial")
+        ax2.legend()
+
+    ani = FuncAnimation(fig, update, frames=frames, interval=120)
+    plt.tight_layout()
+    return ani
+
 if __name__ == "__main__":
-    plt.show()
+    import argparse
+    ap = argparse.ArgumentParser(description="APF + BDI + A*")
+    ap.add_argument("--bench-gradiente", action="store_true",
+                    help="Costo por paso del gradiente (diferencias vs analítico) según la cantidad de obstáculos")
+    ap.add_argument("--bench-indice", action="store_true",
+                    help="Costo por tick de las consultas de obstáculos: barrido completo vs índice espacial")
+    ap.add_argument("--lote", type=int, metavar="N", help="Simula N escenarios aleatorios sin gráficos")
+    ap.add_argument("--procesos", "-p", type=int, default=None, help="Procesos del pool (por defecto: CPUs)")
+    ap.add_argument("--obstaculos", type=int, default=40, help="Obstáculos por escenario aleatorio")
+    ap.add_argument("--max-ticks", type=int, default=600)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", "-o", help="Guarda un JSON por escenario (JSONL)")
+    ap.add_argument("--bench-astar", action="store_true",
+                    help="Costo por plan de a_star (tuplas) vs PlanificadorA (arreglos, con y sin caché)")
+    args = ap.parse_args()
+    if args.bench_astar:
+        r = costo_astar(generar_escenarios(200, seed=args.seed))
+        print(f"{r['planes']} planes | tuplas {r['tuplas_us']:.0f} µs | arreglos {r['arreglos_us']:.0f} µs | "
+              f"caché {r['cache_us']:.1f} µs")
+    elif args.lote:
+        escenarios = generar_escenarios(args.lote, args.obstaculos, args.seed)
+        t0 = time.perf_counter()
+        resultados = simular_lote(escenarios, args.procesos, args.max_ticks)
+        dt = time.perf_counter() - t0
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as fh:
+                for r in resultados:
+                    fh.write(json.dumps(r) + "\n")
+        r = resumen(resultados)
+        ticks = "-" if r["ticks_medio_exito"] is None else f"{r['ticks_medio_exito']:.1f}"
+        print(f"[OK] {r['escenarios']} escenarios | éxito {r['tasa_exito']:.1%} | ticks medio (éxitos) {ticks} | "
+              f"replanes medio {r['replanes_medio']:.2f} | {r['segundos_medio'] * 1e3:.1f} ms/escenario | "
+              f"total {dt:.2f} s")
+    elif args.bench_indice:
+        for r in costo_consultas():
+            print(f"K={r['obstaculos']:>6} (lado {r['lado']:6.0f}) | barrido {r['barrido_us']:10.1f} µs | "
+                  f"índice {r['indice_us']:7.1f} µs | construir {r['construccion_ms']:6.1f} ms")
+    elif args.bench_gradiente:
+        print(f"Error relativo máx. analítico vs diferencias (h=1e-6): {verificar_gradiente(G, OBS):.2e}")
+        for r in costo_por_paso(G):
+            print(f"K={r['obstaculos']:>6} | diferencias {r['diferencias_us']:8.1f} µs | "
+                  f"analítico {r['analitico_us']:8.1f} µs | lote {r['lote_por_agente_us']:8.1f} µs/agente")
+    else:
+        import matplotlib.pyplot as plt
+        ani = animar()
+        plt.show()
@@ -10,16 +10,28 @@ Incluye:
 - Evaluación de máximo/mínimo en un intervalo DOMINIO_ACOTADO
 - Gráfico de la función con el vértice (mínimo) marcado en la figura
   y mostrado en pantalla.
+- Analizador reutilizable (analizar): para cualquier expresión en una
+  variable calcula f', f'' y puntos críticos una sola vez, compila f, f' y
+  f'' a NumPy con lambdify y memoiza el resultado por expresión, de modo que
+  analizar cientos de funciones o evaluar 10^7 puntos no repite trabajo
+  simbólico.
 
 Requisitos: sympy, numpy, matplotlib
 Ejecutar: python punto1_derivada.py
+          python punto1_derivada.py --expr "x**3 - 6*x**2 + 9*x"
+          python punto1_derivada.py --bench
 """
 from __future__ import annotations
 
+import argparse
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
 import numpy as np
 import sympy as sp
 import matplotlib.pyplot as plt
-from typing import Tuple
 
 # =================== CONFIGURACION ===================
 DOMINIO_ACOTADO: Tuple[float, float] | None = (-5.0, 5.0)
@@ -29,83 +41,174 @@ DOMINIO_ACOTADO: Tuple[float, float] | None = (-5.0, 5.0)
 x = sp.symbols('x', real=True)
 f = x**2 - 3*x + 4
 
-def main():
+# =================== ANALIZADOR ===================
+@dataclass(frozen=True)
+class Analisis:
+    """Resultado de analizar una expresión: derivadas, críticos y versiones NumPy."""
+    expr: sp.Expr
+    var: sp.Symbol
+    f1: sp.Expr
+    f2: sp.Expr
+    criticos: Tuple[sp.Expr, ...]        # soluciones reales de f'(x)=0 (simbólicas)
+    criticos_num: np.ndarray             # las mismas, en float
+    segunda_en_criticos: np.ndarray      # f''(x*) en cada crítico
+    fn: Callable
+    f1n: Callable
+    f2n: Callable
+
+    def evaluar(self, xs, orden: int = 0) -> np.ndarray:
+        """f, f' o f'' (orden 0, 1, 2) sobre un arreglo; las constantes se expanden a la forma de xs."""
+        xs = np.asarray(xs, dtype=float)
+        res = (self.fn, self.f1n, self.f2n)[orden](xs)
+        return np.broadcast_to(np.asarray(res, dtype=float), xs.shape)
+
+    def clasificacion(self) -> List[str]:
+        return ["mínimo local" if v > 0 else "máximo local" if v < 0 else "indeterminado (f''=0)"
+                for v in self.segunda_en_criticos]
+
+    def extremos_en(self, a: float, b: float) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """((xmin, fmin), (xmax, fmax)) en [a, b] entre extremos del intervalo y críticos interiores."""
+        xs = np.array([a, b] + [c for c in self.criticos_num if a <= c <= b])
+        ys = self.evaluar(xs)
+        return (float(xs[np.argmin(ys)]), float(ys.min())), (float(xs[np.argmax(ys)]), float(ys.max()))
+
+def _criticos_reales(f1: sp.Expr, var: sp.Symbol, tol: float = 1e-12) -> Tuple[sp.Expr, ...]:
+    """
+    Raíces reales de f'. En polinomios se usa Poly.real_roots (exactas, sin
+    radicales complejos); en el resto, solve y se aceptan las soluciones cuya
+    parte imaginaria numérica es despreciable (casus irreducibilis), tomando
+    su parte real.
+    """
+    if f1.is_polynomial(var):
+        if f1.free_symbols - {var} or sp.Poly(f1, var).is_zero:
+            return ()
+        return tuple(dict.fromkeys(sp.Poly(f1, var).real_roots()))
+    try:
+        sols = sp.solve(sp.Eq(f1, 0), var)
+    except NotImplementedError:          # ecuaciones trascendentes sin solución cerrada
+        return ()
+    reales = []
+    for c in sols:
+        v = complex(sp.N(c))
+        if c.is_real is not False and abs(v.imag) <= tol * max(1.0, abs(v.real)):
+            reales.append(c if sp.N(c).is_real else sp.re(c))
+    return tuple(reales)
+
+@lru_cache(maxsize=None)
+def _analizar(expr: sp.Expr, var: sp.Symbol) -> Analisis:
+    f1 = sp.diff(expr, var)
+    f2 = sp.diff(f1, var)
+    criticos = _criticos_reales(f1, var)
+    criticos_num = np.array([float(sp.N(c)) for c in criticos], dtype=float)
+    f2n = sp.lambdify(var, f2, "numpy")
+    segunda = np.broadcast_to(np.asarray(f2n(criticos_num), dtype=float), criticos_num.shape)
+    return Analisis(expr, var, f1, f2, criticos, criticos_num, segunda,
+                    sp.lambdify(var, expr, "numpy"), sp.lambdify(var, f1, "numpy"), f2n)
+
+def analizar(expr, var: sp.Symbol = x) -> Analisis:
+    """
+    Analiza una expresión univariada (SymPy o texto). Los resultados se
+    memoizan por expresión: expresiones iguales (mismo hash de SymPy)
+    comparten derivadas, críticos y funciones compiladas.
+    """
+    if isinstance(expr, str):
+        expr = sp.sympify(expr, locals={var.name: var})
+    return _analizar(sp.sympify(expr), var)
+
+def analizar_lote(expresiones) -> List[Analisis]:
+    return [analizar(e) for e in expresiones]
+
+def benchmark(n_funciones: int = 300, n_puntos: int = 10**7, seed: int = 0) -> None:
+    """Tiempo de analizar un lote de polinomios aleatorios (frío y memoizado) y de evaluar n_puntos."""
+    rng = np.random.default_rng(seed)
+    exprs = [sum(int(c) * x**k for k, c in enumerate(rng.integers(-5, 6, size=rng.integers(2, 5))))
+             for _ in range(n_funciones)]
+    _analizar.cache_clear()
+    t0 = time.perf_counter(); analizar_lote(exprs); t_frio = time.perf_counter() - t0
+    t0 = time.perf_counter(); analizar_lote(exprs); t_cache = time.perf_counter() - t0
+    print(f"{n_funciones} funciones: {t_frio:.2f} s en frío, {t_cache * 1e3:.2f} ms memoizado "
+          f"({_analizar.cache_info().currsize} expresiones distintas)")
+
+    an = analizar(f)
+    xs = np.linspace(-10, 10, n_puntos)
+    t0 = time.perf_counter(); an.evaluar(xs); an.evaluar(xs, 1); t_num = time.perf_counter() - t0
+    k = 2000
+    t0 = time.perf_counter(); [sp.N(f.subs(x, v)) for v in xs[:k]]; t_subs = (time.perf_counter() - t0) / k
+    print(f"f y f' en {n_puntos:,} puntos: {t_num:.3f} s con lambdify "
+          f"(sp.N(f.subs) estimado: {t_subs * n_puntos / 3600:.1f} h)")
+
+def main(expr=f):
+    an = analizar(expr)
+    texto = sp.sstr(an.expr)
     print("="*70)
-    print("PUNTO 1 – f(x) = x^2 - 3x + 4 (derivada y análisis desde cero)")
+    print(f"PUNTO 1 – f(x) = {texto} (derivada y análisis desde cero)")
     print("="*70)
 
     # Derivadas
-    f1 = sp.diff(f, x)
-    f2 = sp.diff(f1, x)
-    print(f"f(x)   = {sp.simplify(f)}")
-    print(f"f'(x)  = {sp.simplify(f1)}")
-    print(f"f''(x) = {sp.simplify(f2)}")
+    print(f"f(x)   = {sp.simplify(an.expr)}")
+    print(f"f'(x)  = {sp.simplify(an.f1)}")
+    print(f"f''(x) = {sp.simplify(an.f2)}")
 
     # Puntos críticos: f'(x)=0
-    criticos = sp.solve(sp.Eq(f1, 0), x)  # soluciones simbólicas
+    fc_todos = an.evaluar(an.criticos_num)
     print("\nPuntos críticos (f'(x)=0):")
-    for c in criticos:
-        fc = sp.N(f.subs(x, c))
+    for c, fc in zip(an.criticos, fc_todos):
         print(f"  x* = {sp.N(c)}  ->  f(x*) = {fc}")
 
     # Clasificación (segunda derivada)
+    parabola_arriba = (an.expr.is_polynomial(an.var) and sp.degree(an.expr, an.var) == 2
+                       and sp.Poly(an.expr, an.var).LC() > 0)
     print("\nClasificación por f''(x):")
-    for c in criticos:
-        valor_segunda = sp.N(f2.subs(x, c))
-        if valor_segunda > 0:
-            desc = "mínimo local (y global, parábola abre hacia arriba)"
-        elif valor_segunda < 0:
-            desc = "máximo local"
-        else:
-            desc = "indeterminado (f''=0)"
+    for c, valor_segunda, desc in zip(an.criticos, an.segunda_en_criticos, an.clasificacion()):
+        if parabola_arriba:
+            desc += " (y global, parábola abre hacia arriba)"
         print(f"  En x = {sp.N(c)}: f''(x) = {valor_segunda} -> {desc}")
 
     # Observación general
-    print("\nComo el coeficiente de x^2 es positivo, la parábola abre hacia arriba:")
-    print("=> NO existe máximo global en R. Sí existe mínimo global en el vértice.\n")
+    if parabola_arriba:
+        print("\nComo el coeficiente de x^2 es positivo, la parábola abre hacia arriba:")
+        print("=> NO existe máximo global en R. Sí existe mínimo global en el vértice.\n")
 
     # (Opcional) máximo/mínimo en intervalo acotado
     if DOMINIO_ACOTADO is not None:
         a, b = map(float, DOMINIO_ACOTADO)
-        fa = float(sp.N(f.subs(x, a)))
-        fb = float(sp.N(f.subs(x, b)))
-        candidatos = [(a, fa), (b, fb)]
-        for c in criticos:
-            c_f = float(sp.N(c))
-            if a <= c_f <= b:
-                candidatos.append((c_f, float(sp.N(f.subs(x, c_f)))))
-        xmin, fmin = min(candidatos, key=lambda t: t[1])
-        xmax, fmax = max(candidatos, key=lambda t: t[1])
+        (xmin, fmin), (xmax, fmax) = an.extremos_en(a, b)
         print(f"En el intervalo [{a}, {b}]:")
         print(f"  f mínimo = {fmin:.6f} en x = {xmin:.6f}")
         print(f"  f máximo = {fmax:.6f} en x = {xmax:.6f}\n")
 
     # Gráfico con el vértice
-    xc = float(sp.N(criticos[0])) if criticos else 0.0
+    xc = float(an.criticos_num[0]) if len(an.criticos_num) else 0.0
     xs = np.linspace(xc-6, xc+6, 400)
-    ys = xs**2 - 3*xs + 4
+    ys = an.evaluar(xs)
 
     plt.figure(figsize=(7,5))
     plt.plot(xs, ys, linewidth=2)
-    if criticos:
-        c = float(sp.N(criticos[0]))
-        fc = float(sp.N(f.subs(x, c)))
-        # Punto mínimo marcado
+    for c, fc, desc in zip(an.criticos_num, fc_todos, an.clasificacion()):
+        etiqueta = desc.split()[0]
+        # Punto crítico marcado
         plt.scatter([c], [fc], s=80, zorder=5)
-        plt.annotate("mínimo\n"
+        plt.annotate(f"{etiqueta}\n"
                      f"x={c:.2f}, f(x)={fc:.2f}",
                      (c, fc), xytext=(15, 18),
                      textcoords="offset points",
                      arrowprops=dict(arrowstyle="->", lw=1.5))
         plt.axvline(c, linestyle="--", linewidth=1)
         plt.axhline(fc, linestyle="--", linewidth=1)
-        print(f"\nMínimo global en x = {c:.6f} con f(x) = {fc:.6f}")
+        print(f"\n{etiqueta.capitalize()} en x = {c:.6f} con f(x) = {fc:.6f}")
 
     plt.grid(True)
     plt.xlabel("x"); plt.ylabel("f(x)")
-    plt.title("f(x)=x^2-3x+4 con mínimo marcado")
+    plt.title(f"f(x)={texto} con puntos críticos marcados")
     plt.tight_layout()
     plt.show()
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="Análisis de una función de una variable")
+    ap.add_argument("--expr", default=None, help="Expresión en x (por defecto x**2 - 3*x + 4)")
+    ap.add_argument("--bench", action="store_true", help="Mide el análisis por lotes y la evaluación densa")
+    args = ap.parse_args()
+    if args.bench:
+        benchmark()
+    else:
+        main(f if args.expr is None else args.expr)
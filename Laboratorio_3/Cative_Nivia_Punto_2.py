@@ -1,4 +1,10 @@
 # tsp_ga.py
+import argparse
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+from multiprocessing import shared_memory
 import numpy as np
 import random
 import matplotlib.pyplot as plt
@@ -13,6 +19,27 @@ def route_length(route, cities):
     return sum(euclidean(cities[route[i]], cities[route[(i+1) % len(route)]])
                for i in range(len(route)))
 
+def distance_matrix(cities):
+    """Matriz n×n de distancias (misma fórmula que euclidean), calculada una sola vez."""
+    c = np.asarray(cities, dtype=float)
+    return np.hypot(c[:, None, 0] - c[None, :, 0], c[:, None, 1] - c[None, :, 1])
+
+def tour_lengths(pop, D, block=1 << 22):
+    """
+    Longitud de cada ruta de una población (P, n) de enteros: un único gather
+    D[pop, siguiente] y una suma por fila, por bloques de a lo sumo 'block'
+    aristas. Con una sola ruta (n,) retorna un escalar.
+    """
+    pop = np.asarray(pop)
+    if pop.ndim == 1:
+        return float(D[pop, np.roll(pop, -1)].sum())
+    out = np.empty(len(pop))
+    rows = max(1, block // max(1, pop.shape[1]))
+    for i in range(0, len(pop), rows):
+        chunk = pop[i:i + rows]
+        out[i:i + rows] = D[chunk, np.roll(chunk, -1, axis=1)].sum(axis=1)
+    return out
+
 # ==========================
 # Operadores Genéticos
 # ==========================
@@ -22,22 +49,55 @@ def tournament_selection(pop, fitness, k=3):
     best = min(idxs, key=lambda i: fitness[i])
     return pop[best].copy()
 
+def tournament_selection_batch(fitness, m, k=3):
+    """
+    Índices de m ganadores de torneo a la vez: cada torneo toma k individuos
+    distintos al azar (las filas con repetidos se vuelven a sortear, lo que deja
+    la misma distribución que choice(..., replace=False)) y gana el de menor distancia.
+    """
+    fitness = np.asarray(fitness)
+    idxs = np.random.randint(0, len(fitness), size=(m, k))
+    while True:
+        s = np.sort(idxs, axis=1)
+        rep = np.any(s[:, 1:] == s[:, :-1], axis=1)
+        if not rep.any():
+            break
+        idxs[rep] = np.random.randint(0, len(fitness), size=(rep.sum(), k))
+    return idxs[np.arange(m), np.argmin(fitness[idxs], axis=1)]
+
 def ordered_crossover_OX(parent1, parent2):
     """OX: mantiene segmento de p1 y completa en orden relativo de p2."""
     n = len(parent1)
     a, b = sorted(random.sample(range(n), 2))
-    child = [-1]*n
-    # Copia segmento de p1
-    child[a:b+1] = parent1[a:b+1]
-    # Rellena con el orden de p2
-    p2_idx = 0
-    for i in range(n):
-        if child[i] == -1:
-            while parent2[p2_idx] in child:
-                p2_idx += 1
-            child[i] = parent2[p2_idx]
+    return ordered_crossover_OX_batch(np.asarray(parent1)[None], np.asarray(parent2)[None],
+                                      np.array([a]), np.array([b]))[0]
+
+def ordered_crossover_OX_batch(P1, P2, a, b):
+    """
+    OX sobre B pares a la vez, en O(n) por hijo: P1, P2 son (B, n) y el hijo r
+    copia P1[r, a[r]:b[r]+1] y rellena el resto, de izquierda a derecha, con los
+    genes de P2[r] que no están en ese segmento (máscara 'usado' por ciudad en
+    vez de buscar en la lista).
+    """
+    P1, P2 = np.asarray(P1), np.asarray(P2)
+    B, n = P1.shape
+    pos = np.arange(n)
+    seg = (pos >= np.asarray(a)[:, None]) & (pos <= np.asarray(b)[:, None])      # (B, n) en segmento
+    used = np.zeros((B, n), dtype=bool)
+    np.put_along_axis(used, P1, seg, axis=1)                                    # ciudad ya copiada de p1
+    keep = ~np.take_along_axis(used, P2, axis=1)                                # genes de p2 que faltan
+    child = np.empty_like(P1)
+    child[seg] = P1[seg]
+    child[~seg] = P2[keep]          # mismo conteo por fila y ambos en orden fila a fila
     return child
 
+def random_cut_points(B, n):
+    """B pares a < b uniformes entre las posiciones 0..n-1 (como sorted(random.sample(range(n), 2)))."""
+    i = np.random.randint(0, n, size=B)
+    j = np.random.randint(0, n - 1, size=B)
+    j += j >= i
+    return np.minimum(i, j), np.maximum(i, j)
+
 def swap_mutation(route, p=0.2):
     """Con probabilidad p, intercambia dos posiciones."""
     r = route.copy()
@@ -46,21 +106,184 @@ def swap_mutation(route, p=0.2):
         r[i], r[j] = r[j], r[i]
     return r
 
+def swap_mutation_batch(pop, p=0.2):
+    """swap_mutation sobre cada fila de una población (P, n), en el lugar."""
+    P, n = pop.shape
+    rows = np.flatnonzero(np.random.random(P) < p)
+    i, j = random_cut_points(len(rows), n)
+    pop[rows, i], pop[rows, j] = pop[rows, j], pop[rows, i]
+    return pop
+
+# ==========================
+# Búsqueda local (modo memético)
+# ==========================
+def neighbor_lists(D, k=16):
+    """Para cada ciudad, sus k vecinas más cercanas ordenadas por distancia (n, k)."""
+    n = len(D)
+    k = min(k, n - 1)
+    Dm = D + np.diag(np.full(n, np.inf))
+    near = np.argpartition(Dm, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(Dm, near, axis=1), axis=1)
+    return np.take_along_axis(near, order, axis=1)
+
+def local_search(route, D, neigh, active=None, or_opt=True, eps=1e-10):
+    """
+    Pule una ruta con 2-opt y Or-opt (segmentos de 1 a 3 ciudades) hasta que no
+    haya mejora. Cada movimiento se evalúa con la diferencia O(1) de las aristas
+    que cambian, leída de D; los candidatos se limitan a las listas de vecinos
+    'neigh' (se corta al llegar a un vecino más lejano que la arista que se
+    quitaría) y se usan don't-look bits: solo se revisan las ciudades de la cola
+    'active' (por defecto todas) y las extremas de cada movimiento aplicado.
+    Retorna (ruta como arreglo, ganancia total).
+    """
+    t = np.array(route, dtype=np.int64)
+    n = len(t)
+    if n < 5:
+        return t, 0.0
+    pos = np.empty(n, dtype=np.int64)
+    pos[t] = np.arange(n)
+    tv, pv, Dv = memoryview(t), memoryview(pos), memoryview(np.ascontiguousarray(D, dtype=np.float64))
+    nb = neigh.tolist()
+    pendientes = deque(range(n) if active is None else active)
+    queued = bytearray(n)
+    for c in pendientes:
+        queued[c] = 1
+    gain_total = 0.0
+
+    def push(*cities):
+        for c in cities:
+            if not queued[c]:
+                queued[c] = 1
+                pendientes.append(c)
+
+    def reverse(i, j):
+        """Invierte t[i..j] (i <= j, sin dar la vuelta) y actualiza pos."""
+        seg = t[i:j + 1][::-1].copy()
+        t[i:j + 1] = seg
+        pos[seg] = np.arange(i, j + 1)
+
+    def two_opt(a):
+        i = pv[a]
+        for forward in (True, False):
+            b = tv[(i + 1) % n] if forward else tv[i - 1]
+            d_ab = Dv[a, b]
+            for c in nb[a]:
+                g1 = d_ab - Dv[a, c]
+                if g1 <= eps:
+                    break
+                j = pv[c]
+                d = tv[(j + 1) % n] if forward else tv[j - 1]
+                if c == b or d == a:
+                    continue
+                g = g1 + Dv[c, d] - Dv[b, d]
+                if g > eps:
+                    # aristas nuevas (a, c) y (b, d): se invierte el tramo b..c (o d..a)
+                    if forward:
+                        lo, hi = (i + 1, j) if i < j else (j + 1, i)
+                    else:
+                        lo, hi = (j, i - 1) if j < i else (i, j - 1)
+                    reverse(lo, hi)
+                    push(a, b, c, d)
+                    return g
+        return 0.0
+
+    def move_segment(a, L):
+        i = pv[a]
+        seg = [tv[(i + k) % n] for k in range(L)]
+        p, nx = tv[i - 1], tv[(i + L) % n]
+        if p in seg or nx in seg:
+            return 0.0
+        s1, sL = seg[0], seg[-1]
+        g_rem = Dv[p, s1] + Dv[sL, nx] - Dv[p, nx]
+        if g_rem <= eps:
+            return 0.0
+        for c in nb[s1]:
+            if Dv[c, s1] >= g_rem:
+                break
+            if c in seg:
+                continue
+            j = pv[c]
+            for after in (True, False):
+                e = tv[(j + 1) % n] if after else tv[j - 1]
+                if e in seg:
+                    continue
+                # after: c - s1..sL - e ; si no: e - sL..s1 - c
+                g = g_rem + Dv[c, e] - Dv[c, s1] - Dv[sL, e]
+                if g > eps:
+                    rest = np.roll(t, -(i + L))[:n - L]            # empieza en nx y termina en p
+                    k = (j - i - L) % n
+                    block = np.array(seg if after else seg[::-1], dtype=np.int64)
+                    cut = k + 1 if after else k
+                    t[:] = np.concatenate([rest[:cut], block, rest[cut:]])
+                    pos[t] = np.arange(n)
+                    push(p, nx, c, e, s1, sL)
+                    return g
+        return 0.0
+
+    while pendientes:
+        a = pendientes.popleft()
+        queued[a] = 0
+        g = two_opt(a)
+        if g <= 0 and or_opt:
+            for L in (1, 2, 3):
+                g = move_segment(a, L)
+                if g > 0:
+                    break
+        if g > 0:
+            gain_total += g
+            push(a)
+    return t, gain_total
+
+def broken_edges(children, P1, P2):
+    """
+    Ciudades de cada hijo con alguna arista que no viene de ninguno de sus
+    padres: son las únicas que necesitan revisarse tras el cruce (el resto
+    hereda don't-look bits de padres ya pulidos).
+    """
+    B, n = children.shape
+    nxt = np.roll(children, -1, axis=1)
+    rows = np.arange(B)[:, None]
+    inherited = np.zeros((B, n), dtype=bool)
+    for P in (P1, P2):
+        pos = np.empty_like(P)
+        pos[rows, P] = np.arange(n)
+        gap = np.abs(pos[rows, children] - pos[rows, nxt])
+        inherited |= (gap == 1) | (gap == n - 1)
+    bad = ~inherited
+    return [np.unique(np.concatenate([c[m], nx[m]])).tolist() for c, nx, m in zip(children, nxt, bad)]
+
 # ==========================
 # Algoritmo Genético TSP
 # ==========================
 def genetic_tsp(cities, pop_size=120, generations=600,
                 tournament_k=3, crossover_rate=0.95, mutation_rate=0.25,
-                elitism=2, seed=42):
+                elitism=2, seed=42, memetic=False, ls_rate=0.1, ls_k=16,
+                time_limit=None, timeline=None, D=None, on_generation=None):
+    """
+    memetic=True pule con local_search una fracción ls_rate de la población
+    inicial y de los hijos de cada generación (en los hijos solo se revisan las
+    ciudades con aristas rotas por el cruce). time_limit (s) corta antes de
+    'generations'; si se pasa una lista en timeline, se le agrega
+    (segundos, mejor distancia) en cada generación. D permite reutilizar una
+    matriz de distancias ya calculada. on_generation(gen, pop, fitness) se
+    llama al final de cada generación: si retorna una población la reemplaza
+    (migración entre islas) y si retorna False detiene el GA.
+    """
+    t0 = time.perf_counter()
     random.seed(seed); np.random.seed(seed)
 
     n = len(cities)
-    # Población inicial: permutaciones aleatorias
-    pop = [random.sample(range(n), n) for _ in range(pop_size)]
+    D = distance_matrix(cities) if D is None else D
+    # Población inicial: permutaciones aleatorias, una por fila de un arreglo (P, n)
+    pop = np.array([random.sample(range(n), n) for _ in range(pop_size)], dtype=np.intp)
 
     def eval_pop(pop):
-        fit = np.array([route_length(ind, cities) for ind in pop])
-        return fit
+        return tour_lengths(pop, D)
+
+    if memetic:
+        neigh = neighbor_lists(D, ls_k)
+        for r in np.random.choice(pop_size, max(1, int(np.ceil(ls_rate * pop_size))), replace=False):
+            pop[r] = local_search(pop[r], D, neigh)[0]
 
     fitness = eval_pop(pop)
     best_idx = np.argmin(fitness)
@@ -69,28 +292,29 @@ def genetic_tsp(cities, pop_size=120, generations=600,
 
     history = [best_fit]
 
+    n_pairs = (pop_size - elitism + 1) // 2
     for gen in range(generations):
         # Elitismo
         elites_idx = np.argsort(fitness)[:elitism]
-        new_pop = [pop[i].copy() for i in elites_idx]
-
-        # Resto por reproducción
-        while len(new_pop) < pop_size:
-            p1 = tournament_selection(pop, fitness, k=tournament_k)
-            p2 = tournament_selection(pop, fitness, k=tournament_k)
-
-            if random.random() < crossover_rate:
-                c1 = ordered_crossover_OX(p1, p2)
-                c2 = ordered_crossover_OX(p2, p1)
-            else:
-                c1, c2 = p1.copy(), p2.copy()
-
-            c1 = swap_mutation(c1, mutation_rate)
-            c2 = swap_mutation(c2, mutation_rate)
 
-            new_pop.extend([c1, c2])
+        # Resto por reproducción, todos los pares de la generación a la vez
+        P1 = pop[tournament_selection_batch(fitness, n_pairs, tournament_k)]
+        P2 = pop[tournament_selection_batch(fitness, n_pairs, tournament_k)]
+        cross = np.flatnonzero(np.random.random(n_pairs) < crossover_rate)
+        C1, C2 = P1.copy(), P2.copy()
+        if len(cross):
+            C1[cross] = ordered_crossover_OX_batch(P1[cross], P2[cross], *random_cut_points(len(cross), n))
+            C2[cross] = ordered_crossover_OX_batch(P2[cross], P1[cross], *random_cut_points(len(cross), n))
+        children = swap_mutation_batch(np.stack([C1, C2], axis=1).reshape(-1, n), mutation_rate)
+        if memetic:
+            sel = np.random.choice(len(children), max(1, int(np.ceil(ls_rate * len(children)))), replace=False)
+            parents1 = np.repeat(P1, 2, axis=0)[sel]            # hijo 2r viene de (P1, P2), 2r+1 de (P2, P1)
+            parents2 = np.repeat(P2, 2, axis=0)[sel]
+            for r, active in zip(sel, broken_edges(children[sel], parents1, parents2)):
+                if active:
+                    children[r] = local_search(children[r], D, neigh, active=active)[0]
 
-        pop = new_pop[:pop_size]
+        pop = np.concatenate([pop[elites_idx], children])[:pop_size]
         fitness = eval_pop(pop)
 
         # Actualiza mejor
@@ -102,27 +326,242 @@ def genetic_tsp(cities, pop_size=120, generations=600,
             best = cur_best.copy()
 
         history.append(best_fit)
+        if timeline is not None:
+            timeline.append((time.perf_counter() - t0, best_fit))
+        if time_limit is not None and time.perf_counter() - t0 > time_limit:
+            break
+        if on_generation is not None:
+            res = on_generation(gen, pop, fitness)
+            if res is False:
+                break
+            if res is not None:
+                pop = res
+                fitness = eval_pop(pop)
+
+    return best.tolist(), best_fit, history
+
+# ==========================
+# Modelo de islas (multiproceso)
+# ==========================
+def _attach(spec):
+    """Vista NumPy sobre un bloque de memoria compartida (nombre, forma, dtype)."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
 
-    return best, best_fit, history
+def _island_worker(i, specs, inbox, outbox, results, target_hit, done, sender_done,
+                   migrate_every, n_migrants, target, ga_kwargs):
+    """
+    Isla i: recibe migrantes en inbox desde la isla anterior del anillo
+    (sender_done marca que esa isla terminó) y envía su élite por outbox.
+    Al salir marca done, que solo afecta a la isla siguiente: las demás siguen
+    hasta su propio límite, salvo que alguna alcance 'target' (target_hit).
+    """
+    shm_c, cities = _attach(specs["cities"])
+    shm_d, D = _attach(specs["D"])
+    try:
+        def migrate(gen, pop, fitness):
+            if target_hit.is_set():
+                return False
+            if target is not None and fitness.min() <= target:
+                target_hit.set()
+                return False
+            if (gen + 1) % migrate_every:
+                return None
+            # anillo: la élite sale hacia la isla siguiente y la de la anterior
+            # reemplaza a los peores individuos de esta
+            order = np.argsort(fitness)
+            outbox.put(pop[order[:n_migrants]].copy())
+            while True:
+                try:
+                    incoming = inbox.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    if sender_done.is_set():
+                        return None         # la vecina ya terminó: se sigue sin migrantes
+            pop = pop.copy()
+            pop[order[-len(incoming):]] = incoming
+            return pop
+
+        timeline = []
+        best, best_fit, history = genetic_tsp(cities, D=D, timeline=timeline, on_generation=migrate, **ga_kwargs)
+        results.put((i, best, best_fit, history, timeline))
+    finally:
+        done.set()
+        # Si la isla siguiente ya terminó nadie leerá outbox: sin esto el
+        # proceso se quedaría esperando a vaciar la cola al salir
+        outbox.cancel_join_thread()
+        del cities, D
+        shm_c.close(); shm_d.close()
+
+def island_tsp(cities, islands=4, migrate_every=20, n_migrants=2, target=None, seed=42, **ga_kwargs):
+    """
+    Modelo de islas: 'islands' poblaciones de genetic_tsp en procesos separados
+    que leen ciudades y matriz de distancias desde memoria compartida (una sola
+    copia de D para todas). Cada migrate_every generaciones cada isla envía sus
+    n_migrants mejores a la siguiente del anillo. Cada isla se detiene por su
+    propio límite (generations, time_limit); con 'target' todas se detienen en
+    cuanto una alcanza esa distancia.
+    Retorna (mejor_ruta, mejor_distancia, history, info): history es la mejor
+    distancia global por generación (mínimo entre islas) e info trae el detalle
+    por isla y los segundos de pared.
+    """
+    t0 = time.perf_counter()
+    cities = np.ascontiguousarray(cities, dtype=np.float64)
+    D = distance_matrix(cities)
+    blocks, specs, procs = [], {}, []
+    try:
+        for key, arr in (("cities", cities), ("D", D)):
+            shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+            blocks.append(shm)
+            specs[key] = (shm.name, arr.shape, arr.dtype.str)
+
+        ctx = mp.get_context()
+        inboxes = [ctx.Queue() for _ in range(islands)]
+        done = [ctx.Event() for _ in range(islands)]
+        results, target_hit = ctx.Queue(), ctx.Event()
+        procs = [ctx.Process(target=_island_worker,
+                             args=(i, specs, inboxes[i], inboxes[(i + 1) % islands], results, target_hit,
+                                   done[i], done[i - 1], migrate_every, n_migrants, target,
+                                   dict(ga_kwargs, seed=seed + i)))
+                 for i in range(islands)]
+        for p in procs:
+            p.start()
+        # Primero todos los resultados, luego vaciar las colas de migración y
+        # recién ahí join (un proceso no termina mientras su cola tenga datos)
+        out = []
+        while len(out) < islands:
+            try:
+                out.append(results.get(timeout=0.5))
+            except queue.Empty:
+                if any(p.exitcode not in (None, 0) for p in procs):
+                    raise RuntimeError("Una isla terminó con error")
+        out.sort(key=lambda r: r[0])
+        for q in inboxes:
+            try:
+                while True:
+                    q.get_nowait()
+            except queue.Empty:
+                pass
+        for p in procs:
+            p.join()
+    finally:
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        for shm in blocks:
+            shm.close(); shm.unlink()
+
+    _, best, best_fit, _, _ = min(out, key=lambda r: r[2])
+    gens = max(len(r[3]) for r in out)
+    history = np.min([r[3] + [r[3][-1]] * (gens - len(r[3])) for r in out], axis=0).tolist()
+    info = {"seconds": time.perf_counter() - t0,
+            "islands": [{"best": r[2], "generations": len(r[3]) - 1, "timeline": r[4]} for r in out]}
+    return best, best_fit, history, info
+
+def benchmark_fitness(n=1000, pop_size=3000, sample=20, seed=0):
+    """Evaluación de toda la población con tour_lengths vs route_length (estimado con una muestra)."""
+    rng = np.random.default_rng(seed)
+    cities = rng.random((n, 2))
+    pop = np.argsort(rng.random((pop_size, n)), axis=1)
+    t0 = time.perf_counter()
+    D = distance_matrix(cities)
+    t_D = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fit = tour_lengths(pop, D)
+    t_vec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ref = [route_length(r, cities) for r in pop[:sample]]
+    t_py = (time.perf_counter() - t0) / sample * pop_size
+    assert np.allclose(fit[:sample], ref)
+    print(f"n={n}, P={pop_size}: matriz {t_D:.3f} s | tour_lengths {t_vec:.3f} s | "
+          f"route_length (estimado) {t_py:.1f} s | x{t_py / t_vec:.0f}")
+
+def benchmark_memetic(sizes=(100, 500, 1000, 2000, 5000), budget=10.0, pop_size=60, seed=0):
+    """
+    Convergencia contra tiempo: GA simple vs memético con el mismo presupuesto
+    de segundos por instancia aleatoria en [0,1]². Imprime la mejor distancia
+    alcanzada al 10 %, 50 % y 100 % del presupuesto, relativa a 0.7124·sqrt(n)
+    (aproximación de Beardwood-Halton-Hammersley para el óptimo).
+    """
+    rng = np.random.default_rng(seed)
+    marks = (0.1, 0.5, 1.0)
+    for n in sizes:
+        cities = rng.random((n, 2))
+        ref = 0.7124 * np.sqrt(n)
+        for memetic in (False, True):
+            tl = []
+            genetic_tsp(cities, pop_size=pop_size, generations=10**9, seed=seed,
+                        memetic=memetic, time_limit=budget, timeline=tl)
+            at = [min((f for t, f in tl if t <= m * budget), default=float("nan")) for m in marks]
+            cols = " | ".join(f"{int(m * 100):3d}%: " + ("     -" if np.isnan(v) else f"{v / ref:6.3f}")
+                              for m, v in zip(marks, at))
+            print(f"n={n:5d} {'memético' if memetic else 'simple  '} | {cols} | {len(tl)} generaciones")
+
+def benchmark_islands(n=1000, island_counts=(1, 2, 4), target_ratio=1.06, pop_size=60, max_time=120.0,
+                      memetic=True, seed=0):
+    """
+    Segundos de pared hasta alcanzar target_ratio·0.7124·sqrt(n) con 1, 2, 4...
+    islas (cada una con pop_size individuos, en modo memético por defecto) y la
+    aceleración respecto a 1 isla.
+    """
+    rng = np.random.default_rng(seed)
+    cities = rng.random((n, 2))
+    target = target_ratio * 0.7124 * np.sqrt(n)
+    base = None
+    for k in island_counts:
+        _, best_len, _, info = island_tsp(cities, islands=k, target=target, pop_size=pop_size, memetic=memetic,
+                                          generations=10**9, time_limit=max_time, seed=seed)
+        base = base or info["seconds"]
+        print(f"{k} islas ({mp.cpu_count()} CPUs) | mejor {best_len:.3f} (objetivo {target:.3f}) | "
+              f"{info['seconds']:.2f} s | aceleración x{base / info['seconds']:.2f}")
 
 # ==========================
 # Ejecución y visualización
 # ==========================
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="TSP con algoritmo genético")
+    ap.add_argument("--bench", action="store_true", help="Solo mide la evaluación de la población")
+    ap.add_argument("--bench-memetic", type=int, nargs="*", metavar="N",
+                    help="Convergencia vs tiempo, GA simple vs memético (tamaños por defecto: 100 ... 5000)")
+    ap.add_argument("--budget", type=float, default=10.0, help="Segundos por corrida en --bench-memetic")
+    ap.add_argument("--memetic", action="store_true", help="Activa 2-opt/Or-opt sobre los hijos")
+    ap.add_argument("--islas", type=int, default=1, help="Número de islas (procesos) del GA")
+    ap.add_argument("--migrar", type=int, default=20, help="Generaciones entre migraciones")
+    ap.add_argument("--bench-islas", type=int, nargs="*", metavar="K",
+                    help="Tiempo hasta una distancia objetivo con K islas (por defecto 1 2 4)")
+    args = ap.parse_args()
+    if args.bench_islas is not None:
+        benchmark_islands(island_counts=tuple(args.bench_islas) or (1, 2, 4))
+        raise SystemExit
+    if args.bench:
+        benchmark_fitness()
+        raise SystemExit
+    if args.bench_memetic is not None:
+        benchmark_memetic(tuple(args.bench_memetic) or (100, 500, 1000, 2000, 5000), args.budget)
+        raise SystemExit
+
     # Genera 10 ciudades en [0,1]x[0,1]
     np.random.seed(1)
     cities = np.random.rand(10, 2)
 
-    best_route, best_len, history = genetic_tsp(
-        cities,
+    params = dict(
         pop_size=150,
         generations=800,
         tournament_k=4,
         crossover_rate=0.95,
         mutation_rate=0.25,
         elitism=2,
-        seed=7
+        seed=7,
+        memetic=args.memetic
     )
+    if args.islas > 1:
+        best_route, best_len, history, info = island_tsp(cities, islands=args.islas,
+                                                         migrate_every=args.migrar, **params)
+        print(f"{args.islas} islas en {info['seconds']:.2f} s")
+    else:
+        best_route, best_len, history = genetic_tsp(cities, **params)
 
     print("Mejor longitud encontrada:", round(best_len, 4))
     print("Ruta (orden de visita, 0-index):", best_route)
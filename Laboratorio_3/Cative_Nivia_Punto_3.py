@@ -8,6 +8,10 @@ Requisitos:
 Qué hace:
 - Define grupos, materias, franjas horarias, profesores y su disponibilidad.
 - Preferencias suaves de materias por franja (bonus si se cumplen).
+- Cromosomas como arreglos de enteros (índices de profesor y materia) y
+  disponibilidad/preferencias como matrices booleanas: el fitness de toda la
+  población se calcula en una pasada vectorizada, y las mutaciones de un solo
+  gen se evalúan por delta revisando solo su franja.
 - Restricciones duras (como penalización grande):
     * Un profesor NO puede estar en dos grupos a la misma hora.
     * Un profesor sólo puede dictar en horarios donde está disponible.
@@ -15,17 +19,32 @@ Qué hace:
     * Selección por torneo
     * Cruce uniforme por genes
     * Mutación (reasignación aleatoria de profesor y/o materia)
+    * Reparación (repair): solo profes disponibles y libres en la franja,
+      usando un mapa de ocupación por franja, y salones con cupo
     * Elitismo
 - Corre 100 generaciones y muestra la convergencia del fitness.
 - Imprime el mejor horario en formato legible.
 
 Ajusta MUTATION_RATES para experimentar con distintas tasas de mutación.
+Benchmark en instancias sintéticas (hasta 200 grupos x 60 franjas x 300 profes):
+    python Cative_Nivia_Punto_3.py --bench [pequeno mediano colegio] --tasas 0.005 0.02
+Barrido en paralelo (tasas de mutación x semillas), retomable:
+    python Cative_Nivia_Punto_3.py --barrido resultados/barrido.csv --semillas 0 1 2 3 4 -p 4
 """
 
 from __future__ import annotations
+import argparse
+import csv
+import itertools
+import json
+import os
 import random
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field, fields, replace
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -60,29 +79,118 @@ SUBJECT_PREFS: Dict[str, List[str]] = {
 }
 
 # ============================================
-# Representación: cromosoma = lista de genes
-# Un gen corresponde a (time_slot, group) -> (teacher, subject)
+# Instancia en forma de índices
+# Profesores, materias y franjas se numeran según su posición en las listas;
+# disponibilidad y preferencias quedan como matrices booleanas de consulta.
+# ============================================
+@dataclass
+class Problem:
+    groups: List[str]
+    subjects: List[str]
+    time_slots: List[str]
+    teachers: List[str]
+    avail: np.ndarray    # (T, S) bool: el profesor t puede dictar en la franja s
+    prefs: np.ndarray    # (M, S) bool: la materia m prefiere la franja s
+    # Salones (opcional): cada materia requiere un tipo de salón y de cada tipo
+    # hay room_capacity[r] salones por franja
+    room_types: List[str] = field(default_factory=list)
+    subject_room: Optional[np.ndarray] = None    # (M,) int: tipo de salón de cada materia
+    room_capacity: Optional[np.ndarray] = None   # (R,) int: salones de cada tipo por franja
+
+    @classmethod
+    def from_dicts(cls, groups, subjects, time_slots, teachers,
+                   teacher_avail: Dict[str, List[str]], subject_prefs: Dict[str, List[str]]) -> "Problem":
+        slot_idx = {ts: i for i, ts in enumerate(time_slots)}
+        avail = np.zeros((len(teachers), len(time_slots)), dtype=bool)
+        for t_i, t in enumerate(teachers):
+            avail[t_i, [slot_idx[ts] for ts in teacher_avail.get(t, [])]] = True
+        prefs = np.zeros((len(subjects), len(time_slots)), dtype=bool)
+        for s_i, subj in enumerate(subjects):
+            prefs[s_i, [slot_idx[ts] for ts in subject_prefs.get(subj, [])]] = True
+        return cls(list(groups), list(subjects), list(time_slots), list(teachers), avail, prefs)
+
+    @property
+    def n_genes(self) -> int:
+        return len(self.time_slots) * len(self.groups)
+
+PROBLEM = Problem.from_dicts(GROUPS, SUBJECTS, TIME_SLOTS, TEACHERS, TEACHER_AVAIL, SUBJECT_PREFS)
+
+def generate_problem(n_groups: int = 200, n_slots: int = 60, n_teachers: int = 300, n_subjects: int = 12,
+                     avail_rate: float = 0.6, pref_rate: float = 0.2,
+                     room_types: Tuple[str, ...] = ("Aula", "Laboratorio", "Sala de arte"),
+                     room_slack: float = 1.2, seed: int = 0) -> Problem:
+    """
+    Instancia sintética de tamaño colegio: cada profesor está disponible en
+    cada franja con probabilidad avail_rate (garantizando al menos n_groups
+    profesores disponibles por franja, para que exista un horario sin choques),
+    cada materia prefiere una fracción pref_rate de las franjas y requiere un
+    tipo de salón al azar. De cada tipo hay, por franja, room_slack veces la
+    parte proporcional de grupos (redondeado hacia arriba). Las materias se
+    reparten entre los tipos de salón de forma que cada tipo tenga alguna.
+    ValueError si n_teachers < n_groups (no existiría horario sin choques).
+    """
+    if n_teachers < n_groups:
+        raise ValueError(f"Se necesitan al menos tantos profesores como grupos para un horario sin choques "
+                         f"({n_teachers} profesores < {n_groups} grupos)")
+    if min(n_groups, n_slots, n_subjects) < 1 or not room_types:
+        raise ValueError("n_groups, n_slots y n_subjects deben ser >= 1 y debe haber algún tipo de salón")
+    rng = np.random.default_rng(seed)
+    days = ["Lun", "Mar", "Mie", "Jue", "Vie"]
+    per_day = -(-n_slots // len(days))
+    slots = [f"{days[i // per_day]}-{7 + i % per_day}:00" for i in range(n_slots)]
+
+    avail = rng.random((n_teachers, n_slots)) < avail_rate
+    for ts in range(n_slots):
+        missing = n_groups - int(avail[:, ts].sum())
+        if missing > 0:
+            avail[rng.choice(np.flatnonzero(~avail[:, ts]), missing, replace=False), ts] = True
+    prefs = rng.random((n_subjects, n_slots)) < pref_rate
+
+    subject_room = rng.permutation(np.arange(n_subjects) % len(room_types))   # todo tipo tiene materias
+    cap = int(np.ceil(room_slack * n_groups / len(room_types)))
+    return Problem(groups=[f"Grupo{i + 1}" for i in range(n_groups)],
+                   subjects=[f"Materia{i + 1}" for i in range(n_subjects)],
+                   time_slots=slots,
+                   teachers=[f"Prof{i + 1}" for i in range(n_teachers)],
+                   avail=avail, prefs=prefs, room_types=list(room_types),
+                   subject_room=subject_room, room_capacity=np.full(len(room_types), cap))
+
+# ============================================
+# Representación: cromosoma = arreglo (S*G, 2) de enteros
+# Un gen corresponde a (time_slot, group) -> (teacher, subject), guardado como
+# (índice de profesor, índice de materia); -1 significa sin asignar.
 # Orden de genes: para cada time_slot, para cada group.
+# Una población es un arreglo (P, S*G, 2).
 # ============================================
 Gene = Tuple[str, str]   # (teacher, subject)
+UNASSIGNED = -1
+
+def gene_index(ts_idx: int, g_idx: int, prob: Problem = PROBLEM) -> int:
+    return ts_idx * len(prob.groups) + g_idx
+
+def empty_schedule(prob: Problem = PROBLEM) -> np.ndarray:
+    return np.full((prob.n_genes, 2), UNASSIGNED, dtype=np.int32)
 
-def gene_index(ts_idx: int, g_idx: int) -> int:
-    return ts_idx * len(GROUPS) + g_idx
+def random_population(n: int, prob: Problem = PROBLEM) -> np.ndarray:
+    pop = np.empty((n, prob.n_genes, 2), dtype=np.int32)
+    pop[..., 0] = np.random.randint(len(prob.teachers), size=(n, prob.n_genes))
+    pop[..., 1] = np.random.randint(len(prob.subjects), size=(n, prob.n_genes))
+    return pop
 
-def empty_schedule() -> List[Gene]:
-    return [(None, None) for _ in range(len(TIME_SLOTS) * len(GROUPS))]
+def random_schedule(prob: Problem = PROBLEM) -> np.ndarray:
+    return random_population(1, prob)[0]
 
-def random_gene(ts: str) -> Gene:
-    teacher = random.choice(TEACHERS)
-    subject = random.choice(SUBJECTS)
-    return (teacher, subject)
+def encode(schedule: List[Gene], prob: Problem = PROBLEM) -> np.ndarray:
+    """Lista de tuplas (teacher, subject) con nombres -> cromosoma de índices."""
+    t_idx = {t: i for i, t in enumerate(prob.teachers)}
+    s_idx = {m: i for i, m in enumerate(prob.subjects)}
+    return np.array([(t_idx.get(t, UNASSIGNED), s_idx.get(m, UNASSIGNED)) for t, m in schedule],
+                    dtype=np.int32).reshape(-1, 2)
 
-def random_schedule() -> List[Gene]:
-    sched = []
-    for ts in TIME_SLOTS:
-        for _ in GROUPS:
-            sched.append(random_gene(ts))
-    return sched
+def decode(chrom: np.ndarray, prob: Problem = PROBLEM) -> List[Gene]:
+    """Cromosoma de índices -> lista de tuplas (teacher, subject) (None si está sin asignar)."""
+    return [(prob.teachers[t] if t >= 0 else None, prob.subjects[m] if m >= 0 else None)
+            for t, m in np.asarray(chrom).tolist()]
 
 # ============================================
 # Fitness
@@ -92,71 +200,235 @@ class Weights:
     # Penalizaciones (negativas) grandes para violaciones
     w_unavailable: float = -10.0     # profe no disponible en esa franja
     w_double_book: float = -12.0     # profe repetido mismo horario (dos grupos a la vez)
+    w_room: float = -8.0             # clase sin salón del tipo requerido libre en esa franja
     # Recompensas/penalizaciones suaves
     w_subject_pref: float = +1.5     # materia en franja preferida
     w_subject_nonpref: float = -0.5  # materia en franja no preferida (suave)
 
-def evaluate(schedule: List[Gene], w: Weights = Weights()) -> float:
-    score = 0.0
-    # Revisa cada franja
-    for ts_i, ts in enumerate(TIME_SLOTS):
-        teachers_in_slot = []
-        for g_i, _ in enumerate(GROUPS):
-            t, s = schedule[gene_index(ts_i, g_i)]
-            if t is None or s is None:
-                score += w.w_subject_nonpref   # preferimos tener algo asignado
-                continue
-            # Disponibilidad del profe
-            if ts not in TEACHER_AVAIL.get(t, []):
-                score += w.w_unavailable
-            teachers_in_slot.append(t)
-            # Preferencias de materia
-            prefs = SUBJECT_PREFS.get(s, [])
-            score += w.w_subject_pref if ts in prefs else w.w_subject_nonpref
-        # Chequeo de doble asignación del mismo profe en mismo horario
-        if len(teachers_in_slot) != len(set(teachers_in_slot)):
-            # hay al menos un profe repetido en este slot
-            # (podría haber más de un choque; penalizamos por cada repetición)
-            rep = len(teachers_in_slot) - len(set(teachers_in_slot))
-            score += rep * w.w_double_book
-    return score
+def constraint_counts(pop: np.ndarray, prob: Problem = PROBLEM) -> Tuple[np.ndarray, ...]:
+    """
+    Conteos por individuo de una población (P, S*G, 2), en una sola pasada:
+    (genes con profe no disponible, repeticiones de profe en una misma franja,
+    clases que exceden los salones de su tipo en la franja, genes con materia
+    en franja preferida). Los genes sin asignar no cuentan en ninguno.
+    """
+    pop = np.asarray(pop)
+    P, S, G = len(pop), len(prob.time_slots), len(prob.groups)
+    t = pop[..., 0].reshape(P, S, G)
+    m = pop[..., 1].reshape(P, S, G)
+    assigned = (t >= 0) & (m >= 0)
+    slot = np.arange(S)[None, :, None]
+    unavailable = assigned & ~prob.avail[t, slot]      # t = -1 cae en la última fila, pero lo anula 'assigned'
+    pref = assigned & prob.prefs[m, slot]
+    # Repeticiones por franja = asignados - profes distintos: tras ordenar cada
+    # franja, cada par de vecinos iguales es una repetición. Los sin asignar se
+    # marcan con negativos distintos para que nunca coincidan.
+    tt = np.where(assigned, t, -1 - np.arange(G))
+    tt.sort(axis=2)
+    double = (tt[..., 1:] == tt[..., :-1]).sum(axis=(1, 2))
+    room = np.zeros(P, dtype=np.int64)
+    if prob.room_capacity is not None:
+        rt = np.where(assigned, prob.subject_room[m], -1)
+        for r, cap in enumerate(prob.room_capacity):
+            room += np.maximum((rt == r).sum(axis=2) - cap, 0).sum(axis=1)
+    return unavailable.sum(axis=(1, 2)), double, room, pref.sum(axis=(1, 2))
+
+def hard_violations(pop: np.ndarray, prob: Problem = PROBLEM) -> np.ndarray:
+    """Violaciones de restricciones duras (disponibilidad, choques y salones) por individuo."""
+    unavailable, double, room, _ = constraint_counts(pop, prob)
+    return unavailable + double + room
+
+def evaluate_pop(pop: np.ndarray, prob: Problem = PROBLEM, w: Weights = Weights()) -> np.ndarray:
+    """Fitness (P,) de toda la población con los mismos términos que evaluate."""
+    unavailable, double, room, pref = constraint_counts(pop, prob)
+    return (w.w_unavailable * unavailable + w.w_double_book * double + w.w_room * room
+            + w.w_subject_pref * pref + w.w_subject_nonpref * (prob.n_genes - pref))
+
+def evaluate(schedule, w: Weights = Weights(), prob: Problem = PROBLEM) -> float:
+    """Fitness de un horario (cromosoma de índices o lista de tuplas con nombres)."""
+    if not isinstance(schedule, np.ndarray):
+        schedule = encode(schedule, prob)
+    return float(evaluate_pop(schedule[None], prob, w)[0])
+
+def delta_evaluate(pop: np.ndarray, idx: np.ndarray, genes: np.ndarray,
+                   prob: Problem = PROBLEM, w: Weights = Weights()) -> np.ndarray:
+    """
+    Cambio de fitness de cada pop[i] si su gen idx[i] pasa a genes[i] =
+    (profesor, materia), sin reevaluar el horario completo: solo se revisa la
+    franja del gen (O(G) por individuo en vez de O(S*G)).
+    """
+    pop = np.asarray(pop)
+    rows = np.arange(len(pop))
+    G = len(prob.groups)
+    idx = np.asarray(idx)
+    slot = idx // G
+    old, new = pop[rows, idx], np.asarray(genes)
+
+    def gene_score(g):
+        assigned = (g[:, 0] >= 0) & (g[:, 1] >= 0)
+        score = np.where(assigned & prob.prefs[g[:, 1], slot], w.w_subject_pref, w.w_subject_nonpref)
+        return assigned, score + w.w_unavailable * (assigned & ~prob.avail[g[:, 0], slot])
+
+    a_old, v_old = gene_score(old)
+    a_new, v_new = gene_score(new)
+
+    # Doble asignación: quitar al profe viejo elimina una repetición si estaba
+    # al menos dos veces en la franja; poner al nuevo agrega una si ya estaba.
+    cols = (slot * G)[:, None] + np.arange(G)
+    row = pop[rows[:, None], cols]
+    row_assigned = (row[..., 0] >= 0) & (row[..., 1] >= 0)
+    c_old = (row_assigned & (row[..., 0] == old[:, :1])).sum(axis=1)          # incluye al propio gen
+    c_new = (row_assigned & (row[..., 0] == new[:, :1])).sum(axis=1) - (a_old & (old[:, 0] == new[:, 0]))
+    lost = a_old & (c_old >= 2)
+    gained = a_new & (c_new >= 1)
+    delta = v_new - v_old + w.w_double_book * (gained.astype(float) - lost)
+    if prob.room_capacity is not None:
+        # Igual con los salones: sale un exceso si el tipo viejo estaba por
+        # encima de su capacidad y entra uno si el nuevo ya estaba lleno.
+        rt = np.where(row_assigned, prob.subject_room[row[..., 1]], -1)
+        r_old = np.where(a_old, prob.subject_room[old[:, 1]], -1)
+        r_new = np.where(a_new, prob.subject_room[new[:, 1]], -1)
+        n_old = (rt == r_old[:, None]).sum(axis=1)
+        n_new = (rt == r_new[:, None]).sum(axis=1) - (a_old & (r_old == r_new))
+        lost = a_old & (n_old > prob.room_capacity[r_old])
+        gained = a_new & (n_new >= prob.room_capacity[r_new])
+        delta += w.w_room * (gained.astype(float) - lost)
+    return delta
 
 # ============================================
 # Operadores genéticos
 # ============================================
-def tournament_selection(pop: List[List[Gene]], fits: np.ndarray, k: int = 3) -> List[Gene]:
-    idxs = np.random.choice(len(pop), size=k, replace=False)
-    best = max(idxs, key=lambda i: fits[i])  # maximizar fitness
-    return pop[best].copy()
-
-def uniform_crossover(p1: List[Gene], p2: List[Gene], px: float = 0.5) -> Tuple[List[Gene], List[Gene]]:
-    n = len(p1)
-    c1, c2 = p1.copy(), p2.copy()
-    for i in range(n):
-        if random.random() < px:
-            c1[i], c2[i] = c2[i], c1[i]
-    return c1, c2
-
-def mutate(schedule: List[Gene], mr: float = 0.15) -> List[Gene]:
+def tournament_selection_batch(fits: np.ndarray, m: int, k: int = 3) -> np.ndarray:
+    """
+    Índices de m ganadores de torneo a la vez: cada torneo toma k individuos
+    distintos al azar (las filas con repetidos se vuelven a sortear) y gana el
+    de mayor fitness.
+    """
+    fits = np.asarray(fits)
+    idxs = np.random.randint(0, len(fits), size=(m, k))
+    while True:
+        s = np.sort(idxs, axis=1)
+        rep = np.any(s[:, 1:] == s[:, :-1], axis=1)
+        if not rep.any():
+            break
+        idxs[rep] = np.random.randint(0, len(fits), size=(rep.sum(), k))
+    return idxs[np.arange(m), np.argmax(fits[idxs], axis=1)]
+
+def tournament_selection(pop: np.ndarray, fits: np.ndarray, k: int = 3) -> np.ndarray:
+    return pop[tournament_selection_batch(fits, 1, k)[0]].copy()
+
+def uniform_crossover_batch(P1: np.ndarray, P2: np.ndarray, px: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """Cruce uniforme de B pares a la vez: cada gen se intercambia con probabilidad px."""
+    swap = np.random.random(P1.shape[:2]) < px
+    C1, C2 = P1.copy(), P2.copy()
+    C1[swap], C2[swap] = P2[swap], P1[swap]
+    return C1, C2
+
+def uniform_crossover(p1: np.ndarray, p2: np.ndarray, px: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    c1, c2 = uniform_crossover_batch(p1[None], p2[None], px)
+    return c1[0], c2[0]
+
+def mutate_batch(pop: np.ndarray, mr: float = 0.15, prob: Problem = PROBLEM) -> np.ndarray:
+    """
+    Mutación en el lugar de una población (B, S*G, 2): cada gen muta con
+    probabilidad mr y, si muta, cambia ambos (25%), solo el profesor (37.5%)
+    o solo la materia (37.5%). Retorna la máscara (B, S*G) de genes mutados.
+    """
+    mutated = np.random.random(pop.shape[:2]) < mr
+    r = np.random.random(pop.shape[:2])
+    new_t = mutated & (r < 0.625)
+    new_s = mutated & ((r < 0.25) | (r >= 0.625))
+    pop[..., 0][new_t] = np.random.randint(len(prob.teachers), size=int(new_t.sum()))
+    pop[..., 1][new_s] = np.random.randint(len(prob.subjects), size=int(new_s.sum()))
+    return mutated
+
+def mutate(schedule: np.ndarray, mr: float = 0.15, prob: Problem = PROBLEM) -> np.ndarray:
     s = schedule.copy()
-    for ts_i, ts in enumerate(TIME_SLOTS):
-        for g_i, _ in enumerate(GROUPS):
-            idx = gene_index(ts_i, g_i)
-            if random.random() < mr:
-                # Reasignamos profesor y/o materia aleatoriamente
-                t, subj = s[idx]
-                # 50% cambiar profe, 50% cambiar materia, 25% ambos
-                r = random.random()
-                if r < 0.25:
-                    t = random.choice(TEACHERS)
-                    subj = random.choice(SUBJECTS)
-                elif r < 0.625:
-                    t = random.choice(TEACHERS)
-                else:
-                    subj = random.choice(SUBJECTS)
-                s[idx] = (t, subj)
+    mutate_batch(s[None], mr, prob)
     return s
 
+def repair(pop: np.ndarray, prob: Problem = PROBLEM) -> np.ndarray:
+    """
+    Reparación en el lugar de una población (B, S*G, 2), franja por franja y
+    para todos los individuos a la vez:
+    - Salones: las clases que exceden la capacidad de su tipo de salón pasan a
+      una materia al azar de un tipo con cupo libre en esa franja.
+    - Profesores: se arma el mapa de ocupación (B, S, T) con los profes que ya
+      son válidos (disponibles y primera aparición en la franja); así saber si
+      un profe está libre es una consulta O(1). Cada gen con profe no
+      disponible o repetido recibe un profe disponible y libre distinto, en
+      orden aleatorio.
+    Si en una franja no alcanzan los profes (o salones) libres, los genes
+    sobrantes se dejan como estaban. Los genes sin asignar no se tocan.
+    Retorna pop.
+    """
+    P, S, G = len(pop), len(prob.time_slots), len(prob.groups)
+    T = len(prob.teachers)
+    t = pop[..., 0].reshape(P, S, G).copy()
+    m = pop[..., 1].reshape(P, S, G).copy()
+    assigned = (t >= 0) & (m >= 0)
+
+    if prob.room_capacity is not None:
+        R = len(prob.room_capacity)
+        by_type = [np.flatnonzero(prob.subject_room == r) for r in range(R)]
+        n_by_type = np.array([len(b) for b in by_type])
+        table = np.zeros((R, max(n_by_type.max(), 1)), dtype=np.int32)
+        for r, b in enumerate(by_type):
+            table[r, :len(b)] = b
+        rt = np.where(assigned, prob.subject_room[m], -1)
+        excess = np.zeros((P, S, G), dtype=bool)
+        spare = np.zeros((P, S, R), dtype=np.int64)
+        for r, cap in enumerate(prob.room_capacity):
+            in_r = rt == r
+            excess |= in_r & (np.cumsum(in_r, axis=2) > cap)
+            spare[..., r] = np.maximum(cap - in_r.sum(axis=2), 0) if n_by_type[r] else 0
+        # El k-ésimo sobrante de la franja toma el k-ésimo cupo libre (cupos ordenados por tipo)
+        bi, si, gi = np.nonzero(excess)
+        k = (np.cumsum(excess, axis=2) - 1)[bi, si, gi]
+        ty = (np.cumsum(spare, axis=2)[bi, si] <= k[:, None]).sum(axis=1)
+        ok = ty < R
+        bi, si, gi, ty = bi[ok], si[ok], gi[ok], ty[ok]
+        m[bi, si, gi] = table[ty, (np.random.random(len(ty)) * n_by_type[ty]).astype(int)]
+
+    slot = np.arange(S)[None, :, None]
+    usable = assigned & prob.avail[t, slot]
+    # Primera aparición de cada profe en la franja (orden estable por profe)
+    key = np.where(usable, t, -1 - np.arange(G))
+    order = np.argsort(key, axis=2, kind="stable")
+    sk = np.take_along_axis(key, order, axis=2)
+    dup = np.zeros((P, S, G), dtype=bool)
+    dup_sorted = np.zeros((P, S, G), dtype=bool)
+    dup_sorted[..., 1:] = sk[..., 1:] == sk[..., :-1]
+    np.put_along_axis(dup, order, dup_sorted, axis=2)
+    keep = usable & ~dup
+    conflict = assigned & ~keep
+
+    occupied = np.zeros((P, S, T), dtype=bool)
+    bi, si, gi = np.nonzero(keep)
+    occupied[bi, si, t[bi, si, gi]] = True
+
+    rows = np.flatnonzero(conflict.reshape(P * S, G).any(axis=1))
+    if len(rows):
+        free = (prob.avail.T[None] & ~occupied).reshape(P * S, T)[rows]
+        c = conflict.reshape(P * S, G)[rows]
+        rank = np.cumsum(c, axis=1) - 1
+        # Los k = máx. conflictos por franja profes de menor clave aleatoria, con
+        # los libres primero (argpartition + orden solo de esas k columnas)
+        k = min(int(rank[:, -1].max()) + 1, T)
+        keys = np.random.random(free.shape)
+        keys[~free] = 2.0
+        candidates = np.argpartition(keys, k - 1, axis=1)[:, :k] if k < T else np.argsort(keys, axis=1)
+        candidates = np.take_along_axis(candidates, np.argsort(np.take_along_axis(keys, candidates, axis=1),
+                                                               axis=1), axis=1)
+        n_free = free.sum(axis=1)
+        ok = c & (rank < n_free[:, None])
+        ri, gi = np.nonzero(ok)
+        t.reshape(P * S, G)[rows[ri], gi] = candidates[ri, rank[ri, gi]]
+
+    pop[..., 0] = t.reshape(P, -1)
+    pop[..., 1] = m.reshape(P, -1)
+    return pop
+
 # ============================================
 # GA principal
 # ============================================
@@ -169,67 +441,221 @@ class GAConfig:
     mutation_rate: float = 0.15
     elitism: int = 2
     seed: int = 7
-
-def run_ga(cfg: GAConfig) -> Tuple[List[Gene], float, List[float]]:
+    repair: bool = True      # reparar población inicial e hijos (ver repair)
+
+def run_ga(cfg: GAConfig, prob: Problem = PROBLEM, w: Weights = Weights(),
+           timeline: Optional[list] = None) -> Tuple[List[Gene], float, List[float]]:
+    """
+    GA sobre la población (P, S*G, 2). Los hijos que no pasan por cruce y
+    reciben a lo sumo una mutación heredan el fitness del padre más
+    delta_evaluate; el resto se evalúa en bloque con evaluate_pop. Con
+    cfg.repair la población inicial y cada hijo pasan por repair antes de
+    evaluarse. Si se pasa una lista en timeline, se le agrega (segundos, mejor fitness,
+    violaciones duras del mejor, individuos evaluados completos con
+    evaluate_pop hasta ahora) al inicio y en cada generación.
+    """
+    t0 = time.perf_counter()
     random.seed(cfg.seed); np.random.seed(cfg.seed)
-    pop = [random_schedule() for _ in range(cfg.pop_size)]
+    pop = random_population(cfg.pop_size, prob)
+    if cfg.repair:
+        repair(pop, prob)
 
-    def eval_pop(P):
-        return np.array([evaluate(ind) for ind in P], dtype=float)
-
-    fits = eval_pop(pop)
+    fits = evaluate_pop(pop, prob, w)
+    n_full = len(pop)
     best_idx = int(np.argmax(fits))
     best, best_fit = pop[best_idx].copy(), float(fits[best_idx])
     history = [best_fit]
+    best_hard = int(hard_violations(best[None], prob)[0])
+    if timeline is not None:
+        timeline.append((time.perf_counter() - t0, best_fit, best_hard, n_full))
 
+    n_pairs = (cfg.pop_size - cfg.elitism + 1) // 2
     for _ in range(cfg.generations):
         # Elitismo
-        elites_idx = np.argsort(fits)[-cfg.elitism:]
-        new_pop = [pop[i].copy() for i in elites_idx]
-
-        # Resto por reproducción
-        while len(new_pop) < cfg.pop_size:
-            p1 = tournament_selection(pop, fits, cfg.tournament_k)
-            p2 = tournament_selection(pop, fits, cfg.tournament_k)
-            # Crossover
-            if random.random() < cfg.crossover_rate:
-                c1, c2 = uniform_crossover(p1, p2, px=0.5)
-            else:
-                c1, c2 = p1.copy(), p2.copy()
-            # Mutación
-            c1 = mutate(c1, cfg.mutation_rate)
-            c2 = mutate(c2, cfg.mutation_rate)
-            new_pop.extend([c1, c2])
-
-        pop = new_pop[:cfg.pop_size]
-        fits = eval_pop(pop)
+        elites_idx = np.argsort(fits)[-cfg.elitism:] if cfg.elitism > 0 else np.array([], dtype=int)
+
+        # Resto por reproducción, todos los pares de la generación a la vez
+        i1 = tournament_selection_batch(fits, n_pairs, cfg.tournament_k)
+        i2 = tournament_selection_batch(fits, n_pairs, cfg.tournament_k)
+        cross = np.random.random(n_pairs) < cfg.crossover_rate
+        C1, C2 = pop[i1], pop[i2]
+        if cross.any():
+            C1[cross], C2[cross] = uniform_crossover_batch(C1[cross], C2[cross], px=0.5)
+        children = np.stack([C1, C2], axis=1).reshape(-1, prob.n_genes, 2)
+        parents = np.stack([i1, i2], axis=1).ravel()
+        crossed = np.repeat(cross, 2)
+
+        # Mutación (y reparación); los hijos sin cruce con un solo gen cambiado se evalúan por delta
+        before = children.copy()
+        mutate_batch(children, cfg.mutation_rate, prob)
+        if cfg.repair:
+            repair(children, prob)
+        changed = (children != before).any(axis=2)
+        n_mut = changed.sum(axis=1)
+        child_fits = np.empty(len(children))
+        same = ~crossed & (n_mut == 0)
+        child_fits[same] = fits[parents[same]]
+        single = np.flatnonzero(~crossed & (n_mut == 1))
+        if len(single):
+            idx = np.argmax(changed[single], axis=1)
+            child_fits[single] = fits[parents[single]] + delta_evaluate(
+                before[single], idx, children[single, idx], prob, w)
+        full = crossed | (n_mut > 1)
+        if full.any():
+            child_fits[full] = evaluate_pop(children[full], prob, w)
+            n_full += int(full.sum())
+
+        pop = np.concatenate([pop[elites_idx], children])[:cfg.pop_size]
+        fits = np.concatenate([fits[elites_idx], child_fits])[:cfg.pop_size]
 
         cur_idx = int(np.argmax(fits))
-        cur_best = pop[cur_idx].copy()
         cur_fit = float(fits[cur_idx])
         if cur_fit > best_fit:
-            best, best_fit = cur_best, cur_fit
+            best, best_fit = pop[cur_idx].copy(), cur_fit
+            if timeline is not None:
+                best_hard = int(hard_violations(best[None], prob)[0])
 
         history.append(best_fit)
+        if timeline is not None:
+            timeline.append((time.perf_counter() - t0, best_fit, best_hard, n_full))
 
-    return best, best_fit, history
+    return decode(best, prob), best_fit, history
+
+# ============================================
+# Benchmark sobre instancias sintéticas
+# ============================================
+BENCH_SIZES = {            # (grupos, franjas, profesores)
+    "pequeno": (3, 6, 4),
+    "mediano": (40, 30, 60),
+    "colegio": (200, 60, 300),
+}
+
+def benchmark_ga(sizes=("pequeno", "mediano", "colegio"), mutation_rates=(0.005, 0.02, 0.05),
+                 generations: int = 100, pop_size: int = 120, repairs=(True,), seed: int = 0) -> List[dict]:
+    """
+    Corre run_ga sobre instancias de generate_problem para cada tamaño, tasa
+    de mutación y valor de GAConfig.repair. Por corrida reporta individuos
+    producidos por segundo (con fitness completo, heredado o por delta),
+    evaluaciones completas (filas de evaluate_pop) por segundo, pico de memoria (tracemalloc, incluye los arreglos
+    de NumPy), generación y segundos hasta el primer mejor sin violaciones
+    duras (None si no se alcanza) y el resultado final.
+    """
+    rows = []
+    for name in sizes:
+        n_groups, n_slots, n_teachers = BENCH_SIZES[name]
+        prob = generate_problem(n_groups, n_slots, n_teachers, seed=seed)
+        for mr, rp in [(mr, rp) for mr in mutation_rates for rp in repairs]:
+            cfg = GAConfig(pop_size=pop_size, generations=generations, mutation_rate=mr, seed=seed, repair=rp)
+            timeline = []
+            tracemalloc.start()
+            _, best_fit, _ = run_ga(cfg, prob, timeline=timeline)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            seconds = timeline[-1][0]
+            individuals = cfg.pop_size + (cfg.pop_size - cfg.elitism) * (len(timeline) - 1)
+            gen = next((g for g, (_, _, hard, _) in enumerate(timeline) if hard == 0), None)
+            feasible = timeline[gen][0] if gen is not None else None
+            rows.append({"tamano": name, "genes": prob.n_genes, "mutacion": mr, "reparar": rp,
+                         "gen_factible": gen, "segundos": seconds,
+                         "individuos_por_s": individuals / seconds, "evals_por_s": timeline[-1][3] / seconds,
+                         "pico_mb": peak / 2**20,
+                         "t_factible": feasible, "violaciones": timeline[-1][2], "fitness": best_fit})
+    return rows
+
+# ============================================
+# Barrido de configuraciones en paralelo
+# ============================================
+SWEEP_KEYS = ["instancia"] + [f.name for f in fields(GAConfig)]
+
+def config_grid(base: GAConfig = GAConfig(), seeds=(0,), **values) -> List[GAConfig]:
+    """
+    Producto cartesiano de valores de GAConfig por semillas, p. ej.
+    config_grid(seeds=range(5), mutation_rate=[0.05, 0.15], repair=[False, True]).
+    """
+    names = list(values) + ["seed"]
+    return [replace(base, **dict(zip(names, combo)))
+            for combo in itertools.product(*values.values(), seeds)]
+
+@lru_cache(maxsize=None)
+def _sweep_problem(instance: str) -> Problem:
+    """Instancia por nombre: 'base' es PROBLEM, el resto viene de BENCH_SIZES (una vez por proceso)."""
+    return PROBLEM if instance == "base" else generate_problem(*BENCH_SIZES[instance])
+
+def _sweep_key(row: dict) -> Tuple[str, ...]:
+    return tuple(str(row[k]) for k in SWEEP_KEYS)
+
+def _run_sweep_config(item):
+    instance, cfg = item
+    t0 = time.perf_counter()
+    _, best_fit, history = run_ga(cfg, _sweep_problem(instance))
+    return dict(instancia=instance, **asdict(cfg), best_fit=best_fit,
+                segundos=time.perf_counter() - t0, history=json.dumps(history))
+
+def load_sweep(path: str) -> List[dict]:
+    """Filas completas de un barrido (history ya decodificada); ignora una última línea truncada."""
+    rows = []
+    if not os.path.exists(path):
+        return rows
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            try:
+                row["history"] = json.loads(row["history"])
+                row["best_fit"], row["segundos"] = float(row["best_fit"]), float(row["segundos"])
+            except (TypeError, KeyError, ValueError):
+                continue
+            rows.append(row)
+    return rows
+
+def sweep(configs: List[GAConfig], out: str, instance: str = "base", processes: Optional[int] = None) -> int:
+    """
+    Corre run_ga para cada configuración en un pool de procesos y agrega una
+    fila CSV a 'out' apenas termina cada corrida (configuración, best_fit,
+    segundos y history en JSON). Si 'out' ya existe, se saltan las
+    configuraciones que ya están, así que un barrido interrumpido se retoma
+    relanzando el mismo comando. Retorna cuántas corridas nuevas se hicieron.
+    """
+    done = {_sweep_key(r) for r in load_sweep(out)}
+    pending = [(instance, cfg) for cfg in configs
+               if _sweep_key(dict(instancia=instance, **asdict(cfg))) not in done]
+    if not pending:
+        return 0
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    if os.path.exists(out):
+        # Corta una última fila a medio escribir (proceso interrumpido) antes de agregar
+        with open(out, "rb+") as fh:
+            data = fh.read()
+            if data and not data.endswith(b"\n"):
+                fh.truncate(data.rfind(b"\n") + 1)
+    new_file = not os.path.exists(out) or os.path.getsize(out) == 0
+    with open(out, "a", newline="", encoding="utf-8") as fh, Pool(processes) as pool:
+        writer = csv.DictWriter(fh, fieldnames=SWEEP_KEYS + ["best_fit", "segundos", "history"])
+        if new_file:
+            writer.writeheader()
+        for n, row in enumerate(pool.imap_unordered(_run_sweep_config, pending), start=1):
+            writer.writerow(row)
+            fh.flush()
+            print(f"[{n}/{len(pending)}] mut={row['mutation_rate']} seed={row['seed']} "
+                  f"fitness={row['best_fit']:.3f} ({row['segundos']:.2f} s)")
+    return len(pending)
 
 # ============================================
 # Utilidades de impresión y visualización
 # ============================================
-def print_schedule(schedule: List[Gene]) -> None:
+def print_schedule(schedule, prob: Problem = PROBLEM) -> None:
+    if isinstance(schedule, np.ndarray):
+        schedule = decode(schedule, prob)
     print("\n=== Mejor horario encontrado ===")
     # Cabecera
-    header = ["Hora"] + GROUPS
+    header = ["Hora"] + prob.groups
     widths = [max(len(h), 10) for h in header]
     fmt = "  ".join("{:<" + str(w) + "}" for w in widths)
     print(fmt.format(*header))
     print("-" * (sum(widths) + 2*(len(widths)-1)))
     # Filas por franja
-    for ts_i, ts in enumerate(TIME_SLOTS):
+    for ts_i, ts in enumerate(prob.time_slots):
         row = [ts]
-        for g_i, g in enumerate(GROUPS):
-            t, s = schedule[gene_index(ts_i, g_i)]
+        for g_i, g in enumerate(prob.groups):
+            t, s = schedule[gene_index(ts_i, g_i, prob)]
             cell = f"{s or '-'} / {t or '-'}"
             row.append(cell)
         print(fmt.format(*row))
@@ -249,7 +675,49 @@ def plot_histories(histories: Dict[float, List[float]]) -> None:
 # MAIN
 # ============================================
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="GA de horarios")
+    ap.add_argument("--bench", nargs="*", choices=list(BENCH_SIZES), metavar="TAMANO",
+                    help=f"Benchmark de run_ga en instancias sintéticas ({', '.join(BENCH_SIZES)})")
+    ap.add_argument("--tasas", type=float, nargs="+", default=[0.005, 0.02, 0.05],
+                    help="Tasas de mutación del benchmark")
+    ap.add_argument("--generaciones", type=int, default=100)
+    ap.add_argument("--comparar-reparacion", action="store_true",
+                    help="En el benchmark corre también sin repair (GAConfig.repair=False)")
+    ap.add_argument("--barrido", metavar="CSV",
+                    help="Barrido en paralelo de tasas de mutación x semillas; retoma si el CSV existe")
+    ap.add_argument("--semillas", type=int, nargs="+", default=[0, 1, 2, 3, 4])
+    ap.add_argument("--instancia", choices=["base"] + list(BENCH_SIZES), default="base")
+    ap.add_argument("--procesos", "-p", type=int, default=None, help="Procesos del pool (por defecto: CPUs)")
+    args = ap.parse_args()
+    if args.bench is not None:
+        repairs = (False, True) if args.comparar_reparacion else (True,)
+        for r in benchmark_ga(tuple(args.bench) or tuple(BENCH_SIZES), args.tasas, args.generaciones,
+                              repairs=repairs):
+            factible = (f"gen {r['gen_factible']} / {r['t_factible']:.2f} s" if r["t_factible"] is not None
+                        else "-")
+            print(f"{r['tamano']:<8} ({r['genes']} genes) | mut={r['mutacion']:<6} | "
+                  f"{'reparado' if r['reparar'] else 'sin reparar'} | "
+                  f"{r['individuos_por_s']:,.0f} individuos/s ({r['evals_por_s']:,.0f} evals completas/s) | "
+                  f"pico {r['pico_mb']:.1f} MB | "
+                  f"factible en {factible} | violaciones {r['violaciones']} | "
+                  f"fitness {r['fitness']:.1f} | {r['segundos']:.2f} s")
+        raise SystemExit
+
     MUTATION_RATES = [0.05, 0.15, 0.30]   # experimenta aquí
+    if args.barrido:
+        grid = config_grid(GAConfig(generations=args.generaciones), seeds=args.semillas,
+                           mutation_rate=MUTATION_RATES)
+        nuevas = sweep(grid, args.barrido, args.instancia, args.procesos)
+        rows = [r for r in load_sweep(args.barrido) if r["instancia"] == args.instancia]
+        print(f"[OK] {nuevas} corridas nuevas, {len(rows)} en {args.barrido}")
+        # Convergencia promedio entre semillas por tasa de mutación
+        histories = {}
+        for mr in sorted({float(r["mutation_rate"]) for r in rows}):
+            hists = [r["history"] for r in rows if float(r["mutation_rate"]) == mr]
+            histories[mr] = np.mean([h for h in hists if len(h) == len(hists[0])], axis=0).tolist()
+        plot_histories(histories)
+        raise SystemExit
+
     histories = {}
     best_global_sched, best_global_fit = None, -1e9
 
@@ -1,3 +1,6 @@
+import argparse
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
@@ -20,23 +23,76 @@ OBSTACLES = [(0, 0, 2)]  # ejemplo: obstáculo circular en el centro
 # Clases
 # ------------------------------
 class Drone:
-    def __init__(self, idx, position):
+    """
+    Vista de un dron: lee y escribe la fila idx de los arreglos del enjambre
+    (position y velocity son vistas (2,), así que modificarlas en el lugar
+    modifica el enjambre). Sin swarm, el dron guarda sus propios arreglos.
+    """
+    def __init__(self, idx, position=None, swarm=None):
         self.idx = idx
-        self.position = np.array(position, dtype=float)
-        self.velocity = np.random.rand(2) * 0.5
-        self.alive = True
+        if swarm is None:
+            self._row = 0
+            self._pos = np.array(position, dtype=float).reshape(1, 2)
+            self._vel = np.random.rand(1, 2) * 0.5
+            self._alive = np.ones(1, dtype=bool)
+        else:
+            self._row = idx
+            self._pos, self._vel, self._alive = swarm.positions, swarm.velocities, swarm.alive
+
+    @property
+    def position(self):
+        return self._pos[self._row]
+
+    @position.setter
+    def position(self, value):
+        self._pos[self._row] = value
+
+    @property
+    def velocity(self):
+        return self._vel[self._row]
+
+    @velocity.setter
+    def velocity(self, value):
+        self._vel[self._row] = value
+
+    @property
+    def alive(self):
+        return bool(self._alive[self._row])
+
+    @alive.setter
+    def alive(self, value):
+        self._alive[self._row] = value
 
     def move(self):
         if self.alive:
             self.position += self.velocity * 0.1
 
 class Swarm:
+    """
+    Enjambre como estructura de arreglos: positions, velocities, pbest (N, 2),
+    alive (N,) y targets (N, 2); step actualiza a todos los drones con
+    operaciones NumPy sobre el enjambre completo. 'drones' entrega vistas
+    Drone por compatibilidad (se crean al primer acceso).
+    """
     def __init__(self, n, formation="estrella"):
-        self.drones = [Drone(i, np.random.rand(2) * 15 - 7.5) for i in range(n)]
+        self.n = n
+        # Mismo orden de números aleatorios que creando los drones uno a uno:
+        # posición (2) y luego velocidad (2) de cada dron
+        r = np.random.rand(n, 4)
+        self.positions = r[:, :2] * 15 - 7.5
+        self.velocities = r[:, 2:] * 0.5
+        self.alive = np.ones(n, dtype=bool)
+        self._drones = None
         self.formation = formation
         self.targets = self.generate_targets(formation)
-        self.pbest = [d.position.copy() for d in self.drones]
-        self.gbest = np.mean([d.position for d in self.drones], axis=0)
+        self.pbest = self.positions.copy()
+        self.gbest = self.positions.mean(axis=0)
+
+    @property
+    def drones(self):
+        if self._drones is None:
+            self._drones = [Drone(i, swarm=self) for i in range(self.n)]
+        return self._drones
 
     def generate_targets(self, formation):
         if formation == "estrella":
@@ -57,8 +113,8 @@ class Swarm:
                 line_y = np.linspace(start[1], end[1], 4)
                 for j in range(len(line_x)):
                     extended_pts.append(np.array([line_x[j], line_y[j]]))
-            idxs = np.linspace(0, len(extended_pts)-1, len(self.drones)).astype(int)
-            return [extended_pts[i] for i in idxs]
+            idxs = np.linspace(0, len(extended_pts)-1, self.n).astype(int)
+            return np.array(extended_pts)[idxs]
 
         elif formation == "robot":
             pts = []
@@ -83,8 +139,8 @@ class Swarm:
             pts.append(np.array([-2, side/2 + 2]))
             pts.append(np.array([1, side/2 + 1]))
             pts.append(np.array([2, side/2 + 2]))
-            idxs = np.linspace(0, len(pts)-1, len(self.drones)).astype(int)
-            return [pts[i] for i in idxs]
+            idxs = np.linspace(0, len(pts)-1, self.n).astype(int)
+            return np.array(pts)[idxs]
 
         elif formation == "dragon":
             pts = []
@@ -107,34 +163,67 @@ class Swarm:
                 pts.append(np.array([tail_x[i], tail_y[i]]))
             head = [np.array([0, 3.5]), np.array([0.3, 3.2]), np.array([-0.3, 3.2])]
             pts.extend(head)
-            idxs = np.linspace(0, len(pts)-1, len(self.drones)).astype(int)
-            return [pts[i] for i in idxs]
+            idxs = np.linspace(0, len(pts)-1, self.n).astype(int)
+            return np.array(pts)[idxs]
         else:
             raise ValueError("Formación no reconocida")
 
     def step(self, iteration, failure_iter, failure_idx):
-        for i, drone in enumerate(self.drones):
-            if iteration == failure_iter and i == failure_idx:
-                drone.alive = False
-            if drone.alive:
-                target = self.targets[i]
-                r1, r2 = np.random.rand(), np.random.rand()
-                cognitive = C1 * r1 * (target - drone.position)
-                social = C2 * r2 * (self.gbest - drone.position)
-                drone.velocity = W*drone.velocity + cognitive + social
-                # evitar obstáculos
-                for (ox, oy, r) in OBSTACLES:
-                    diff = drone.position - np.array([ox, oy])
-                    dist = np.linalg.norm(diff)
-                    if dist < r+1.5:
-                        drone.velocity += diff * 0.3
-                drone.move()
-                # actualizar mejor personal
-                if np.linalg.norm(drone.position - target) < np.linalg.norm(self.pbest[i] - target):
-                    self.pbest[i] = drone.position.copy()
-        alive_positions = [d.position for d in self.drones if d.alive]
-        if alive_positions:
-            self.gbest = np.mean(alive_positions, axis=0)
+        if iteration == failure_iter and 0 <= failure_idx < self.n:
+            self.alive[failure_idx] = False
+        idx = np.flatnonzero(self.alive)
+        if len(idx) == 0:
+            return
+        all_alive = len(idx) == self.n
+
+        # Se trabaja por columnas (x, y) de los drones activos: en NumPy las
+        # operaciones sobre columnas 1D son bastante más rápidas que sobre
+        # filas de 2 elementos. Si están todos activos, son vistas sin copia.
+        def cols(a):
+            return [a[:, c] if all_alive else a[:, c].take(idx) for c in range(2)]
+
+        def put_cols(a, values):
+            for c, v in enumerate(values):
+                if all_alive:
+                    a[:, c] = v
+                else:
+                    a[:, c][idx] = v
+
+        pos, vel, target = cols(self.positions), cols(self.velocities), cols(self.targets)
+        # r1, r2 por dron activo, en el mismo orden que el bucle dron a dron
+        r = np.random.rand(len(idx), 2)
+        r1, r2 = r[:, 0], r[:, 1]
+        vel = [W*vel[c] + C1 * r1 * (target[c] - pos[c]) + C2 * r2 * (self.gbest[c] - pos[c]) for c in range(2)]
+        # evitar obstáculos
+        for (ox, oy, rad) in OBSTACLES:
+            diff = [pos[0] - ox, pos[1] - oy]
+            near = np.sqrt(diff[0]**2 + diff[1]**2) < rad+1.5
+            for c in range(2):
+                vel[c] += np.where(near, diff[c] * 0.3, 0.0)
+        pos = [pos[c] + vel[c] * 0.1 for c in range(2)]
+        # actualizar mejor personal
+        pb = cols(self.pbest)
+        d_new = np.sqrt((pos[0] - target[0])**2 + (pos[1] - target[1])**2)
+        d_best = np.sqrt((pb[0] - target[0])**2 + (pb[1] - target[1])**2)
+        better = d_new < d_best
+        put_cols(self.pbest, [np.where(better, pos[c], pb[c]) for c in range(2)])
+        put_cols(self.velocities, vel)
+        put_cols(self.positions, pos)
+        self.gbest = np.array([pos[0].mean(), pos[1].mean()])
+
+def benchmark_step(sizes=(60, 1_000, 100_000), steps=20, formation="estrella", seed=0):
+    """Milisegundos por step (mediana de 'steps') para enjambres de cada tamaño."""
+    rows = []
+    for n in sizes:
+        np.random.seed(seed)
+        swarm = Swarm(n, formation)
+        times = []
+        for it in range(steps):
+            t0 = time.perf_counter()
+            swarm.step(it, FAILURE_ITER, FAILURE_INDEX)
+            times.append(time.perf_counter() - t0)
+        rows.append({"drones": n, "ms_por_step": 1e3 * float(np.median(times))})
+    return rows
 
 # ------------------------------
 # Animación
@@ -153,13 +242,13 @@ def animate_swarm(swarm, iterations, failure_iter, failure_idx, filename):
     def init():
         alive_sc.set_offsets(np.empty((0, 2)))
         dead_sc.set_offsets(np.empty((0, 2)))
-        target_sc.set_offsets(np.array(swarm.targets))
+        target_sc.set_offsets(swarm.targets)
         return alive_sc, dead_sc, target_sc
 
     def update(frame):
         swarm.step(frame, failure_iter, failure_idx)
-        alive_pos = np.array([d.position for d in swarm.drones if d.alive])
-        dead_pos = np.array([d.position for d in swarm.drones if not d.alive])
+        alive_pos = swarm.positions[swarm.alive]
+        dead_pos = swarm.positions[~swarm.alive]
         if len(alive_pos) > 0:
             alive_sc.set_offsets(alive_pos)
         else:
@@ -180,6 +269,15 @@ def animate_swarm(swarm, iterations, failure_iter, failure_idx, filename):
 # Main
 # ------------------------------
 def main():
+    ap = argparse.ArgumentParser(description="PSO de drones en formación")
+    ap.add_argument("--bench", type=int, nargs="*", metavar="N",
+                    help="Solo mide ms por step con N drones (por defecto 60 1000 100000)")
+    args = ap.parse_args()
+    if args.bench is not None:
+        for r in benchmark_step(tuple(args.bench) or (60, 1_000, 100_000)):
+            print(f"{r['drones']:>7} drones | {r['ms_por_step']:.3f} ms/step")
+        return
+
     formations = ["estrella", "robot", "dragon"]
     for kind in formations:
         print(f"=== Simulación figura: {kind} ===")
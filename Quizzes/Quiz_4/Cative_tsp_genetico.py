@@ -3,6 +3,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import FancyArrowPatch
 
+from tsp_local import dos_opt_or_opt
+
 # ============================
 # Definición de ciudades
 # ============================
@@ -36,6 +38,14 @@ def distancia_total(ruta):
 def fitness(ruta):
     return 1 / (distancia_total(ruta) + 1e-9)
 
+# Matriz de distancias por índice, para evaluar movimientos locales en O(1)
+indice = {nombre: i for i, nombre in enumerate(nombres)}
+D = [[distancia(a, b) for b in coords] for a in coords]
+
+def busqueda_local(ruta, eps=1e-9):
+    """Pule una ruta con 2-opt + Or-opt (ver tsp_local.dos_opt_or_opt) usando D."""
+    return [nombres[i] for i in dos_opt_or_opt([indice[c] for c in ruta], D, eps)]
+
 # ============================
 # Operadores genéticos
 # ============================
@@ -68,7 +78,7 @@ def mutacion(ruta, tasa=0.2):
 # ============================
 # Algoritmo Genético
 # ============================
-def algoritmo_genetico(generaciones=200, poblacion_size=50, tasa_mutacion=0.2):
+def algoritmo_genetico(generaciones=200, poblacion_size=50, tasa_mutacion=0.2, memetico=False):
     poblacion = [random.sample(nombres, len(nombres)) for _ in range(poblacion_size)]
     mejor_ruta = None
     mejor_distancia = float("inf")
@@ -88,6 +98,8 @@ def algoritmo_genetico(generaciones=200, poblacion_size=50, tasa_mutacion=0.2):
             padre2 = seleccion(poblacion, distancias)
             hijo = cruce_ordenado(padre1, padre2)
             hijo = mutacion(hijo, tasa_mutacion)
+            if memetico:
+                hijo = busqueda_local(hijo)
             nueva_poblacion.append(hijo)
         poblacion = nueva_poblacion
 
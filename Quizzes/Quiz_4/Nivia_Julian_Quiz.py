@@ -2,6 +2,8 @@ import math
 import random
 from typing import Dict, List, Tuple
 
+from tsp_local import dos_opt_or_opt
+
 # ================== Datos del problema ==================
 ciudades: Dict[str, Tuple[int, int]] = {
     'A': (0, 0),
@@ -94,6 +96,17 @@ def mutacion(ruta: List[str], tasa_mutacion: float) -> None:
         ruta[i], ruta[j] = ruta[j], ruta[i]
 
 
+# ================== Búsqueda local (modo memético) ==================
+_nombres: List[str] = list(ciudades.keys())
+_indice: Dict[str, int] = {c: i for i, c in enumerate(_nombres)}
+_D: List[List[float]] = [[distancia_euclidiana(ciudades[a], ciudades[b]) for b in _nombres] for a in _nombres]
+
+
+def busqueda_local(ruta: List[str], eps: float = 1e-9) -> List[str]:
+    """Pule una ruta con 2-opt + Or-opt (ver tsp_local.dos_opt_or_opt) usando _D."""
+    return [_nombres[i] for i in dos_opt_or_opt([_indice[c] for c in ruta], _D, eps)]
+
+
 # ================== GA principal ==================
 def ga_tsp(
     tam_poblacion: int = 100,
@@ -103,9 +116,11 @@ def ga_tsp(
     k_torneo: int = 3,
     elitismo: int = 2,
     semilla: int = 42,
+    memetico: bool = False,
 ) -> Tuple[List[str], float]:
     """
     Ejecuta el algoritmo genético y retorna (mejor_ruta, distancia).
+    Con memetico=True cada hijo se pule con busqueda_local (2-opt + Or-opt).
     """
     random.seed(semilla)
 
@@ -129,11 +144,15 @@ def ga_tsp(
                 h1, h2 = p1[:], p2[:]
 
             mutacion(h1, tasa_mutacion)
+            if memetico:
+                h1 = busqueda_local(h1)
             if len(nueva_poblacion) < tam_poblacion:
                 nueva_poblacion.append(h1)
 
             if len(nueva_poblacion) < tam_poblacion:
                 mutacion(h2, tasa_mutacion)
+                if memetico:
+                    h2 = busqueda_local(h2)
                 nueva_poblacion.append(h2)
 
         poblacion = nueva_poblacion
@@ -0,0 +1,51 @@
+# tsp_local.py — Búsqueda local 2-opt + Or-opt compartida por los quices del TSP
+# -----------------------------------------------------------------------------
+# Trabaja sobre una ruta de índices y una matriz de distancias D (lista de
+# listas o arreglo); cada quiz traduce sus nombres de ciudad a índices.
+# -----------------------------------------------------------------------------
+
+def dos_opt_or_opt(t, D, eps=1e-9):
+    """
+    Pule la ruta cerrada t (lista de índices) con 2-opt y Or-opt (mover 1 a 3
+    ciudades seguidas a otro lugar, en cualquier sentido) hasta que ningún
+    movimiento mejore. Cada movimiento se evalúa en O(1) solo con las aristas
+    que cambian, leídas de D; con pocas ciudades todas son vecinas de todas.
+    Retorna una lista nueva.
+    """
+    t = list(t)
+    n = len(t)
+    mejora = True
+    while mejora:
+        mejora = False
+        # 2-opt: cambia (a,b),(c,d) por (a,c),(b,d) invirtiendo el tramo b..c
+        for i in range(n - 1):
+            for j in range(i + 2, n if i > 0 else n - 1):
+                a, b, c, d = t[i], t[i + 1], t[j], t[(j + 1) % n]
+                if D[a][c] + D[b][d] < D[a][b] + D[c][d] - eps:
+                    t[i + 1:j + 1] = t[i + 1:j + 1][::-1]
+                    mejora = True
+        if mejora:
+            continue
+        # Or-opt: saca el tramo t[i:i+L] y lo inserta entre otras dos ciudades consecutivas
+        for L in (1, 2, 3):
+            if L >= n - 1:
+                break
+            for i in range(n):
+                r = t[i:] + t[:i]
+                tramo, resto = r[:L], r[L:]
+                s1, sL, p, nx = tramo[0], tramo[-1], resto[-1], resto[0]
+                ganancia = D[p][s1] + D[sL][nx] - D[p][nx]
+                for k in range(len(resto) - 1):
+                    c, e = resto[k], resto[k + 1]
+                    directo = D[c][s1] + D[sL][e] - D[c][e]
+                    invertido = D[c][sL] + D[s1][e] - D[c][e]
+                    if min(directo, invertido) < ganancia - eps:
+                        nuevo = tramo if directo <= invertido else tramo[::-1]
+                        t = resto[:k + 1] + nuevo + resto[k + 1:]
+                        mejora = True
+                        break
+                if mejora:
+                    break
+            if mejora:
+                break
+    return t